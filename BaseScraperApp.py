@@ -1,16 +1,22 @@
 import time
+import queue
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 
 from log.scraper_log import LoggerSetup
 from scheduler.sheduler import ScraperScheduler
-from config.dbConfig import DatabaseManager
-from config.envConfig import EnvConfig
 from config.dbEdit import ConfigEditorWindow
+from context.app_context import AppContext
+
+# Progress is redrawn at this interval (10 frames per second)
+PROGRESS_POLL_MS = 100
+
+# Runs requested by the scheduler thread are started at this interval
+SCHEDULE_POLL_MS = 1000
 
 
 class BaseScraperApp:
-    def __init__(self, parent, title="Scraper Module", engine_class=None, module_name="main"):
+    def __init__(self, parent, title="Scraper Module", engine_class=None, module_name="main", context=None):
         self.parent = parent
         self.title = title
         self.engine_class = engine_class 
@@ -19,19 +25,24 @@ class BaseScraperApp:
         # Initialize module-specific logger
         self.logger = LoggerSetup.setup_file_logger(self.module_name)
         
-        # Initialize common managers
-        self.env_manager = EnvConfig(self.logger)
-        self.db_manager = DatabaseManager(self.logger)
+        # Config, storage and connections are shared with the other tabs
+        self.context = context or AppContext.default()
+        self.env_manager = self.context.env_config
+        self.db_manager = self.context.db_manager(self.logger)
+        self.http_client = self.context.scraper_http_client()
         
         # Initialize UI variables
         self.status_var = tk.StringVar(value="Ready")
         self.progress_var = tk.DoubleVar(value=0.0)
-        self.progress_text = tk.StringVar(value="0/0 sectors processed")
+        self.progress_text = tk.StringVar(value="0/0 processed")
         self.elapsed_time_var = tk.StringVar(value="Elapsed Time: 0:00:00")
         self.log_text = None
         self.manual_scrape_button = None
+        self.stop_button = None
         self.schedule_button = None
         self.schedule_time = None
+        self.run_mode_var = tk.StringVar(value="full")
+        self.profile_var = tk.BooleanVar(value=False)
         
         # Initialize state variables
         self.start_time = None
@@ -40,6 +51,8 @@ class BaseScraperApp:
         self.scraper = None
         self.scraper_engine = None
         self.scheduler = None
+        # Deadlines of the runs the scheduler thread requested, started on the Tk thread
+        self.scheduled_runs = queue.SimpleQueue()
         
         # DO NOT call initialize_ui() here - it will be called after setup_scraper()
         
@@ -47,7 +60,7 @@ class BaseScraperApp:
         """Set up the scraper components"""
         if self.engine_class:
             self.scraper = self.create_scraper()
-            self.scraper_engine = self.engine_class(self.logger, self.db_manager, self.scraper)
+            self.scraper_engine = self.engine_class(self.logger, self.db_manager, self.scraper, context=self.context)
     
     def create_scraper(self):
         """Create and return appropriate scraper instance - can be overridden by subclasses"""
@@ -55,10 +68,11 @@ class BaseScraperApp:
         
     def complete_initialization(self):
         """Complete initialization after scraper is set up"""
-        self.scheduler = ScraperScheduler(self.logger, self.start_scraping)
+        self.scheduler = ScraperScheduler(self.logger, self.request_scheduled_run)
         self.initialize_ui()  # Now it's safe to call this
         # Add GUI handler to the module-specific logger
         self.logger = LoggerSetup.setup_gui_logger(self.logger, self.log_text)
+        self.parent.after(SCHEDULE_POLL_MS, self.poll_scheduled_runs)
         
     def initialize_ui(self):
         # Make sure scraper_engine exists before trying to use it
@@ -100,6 +114,21 @@ class BaseScraperApp:
         )
         self.manual_scrape_button.pack(side=tk.LEFT, padx=5)
         
+        # Stop button, enabled only while a run is in progress
+        self.stop_button = tk.Button(
+            control_frame,
+            text="Stop",
+            command=self.stop_scraping,
+            bg="#E74C3C",
+            fg="white",
+            cursor="hand2",
+            padx=20,
+            pady=5,
+            font=("Segoe UI", 10, "bold"),
+            state="disabled"
+        )
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        
         self.schedule_button = tk.Button(
             control_frame,
             text="Start Scheduler",
@@ -122,6 +151,27 @@ class BaseScraperApp:
         self.schedule_time.pack(side=tk.LEFT, padx=5, ipady=4)
         self.schedule_time.insert(0, "15:00")
         
+        # Run mode selector, only shown for engines that support checkpointed runs
+        if len(self.scraper_engine.RUN_MODES) > 1:
+            mode_frame = ttk.Frame(control_frame)
+            mode_frame.pack(side=tk.LEFT, padx=5)
+            
+            ttk.Label(mode_frame, text="Mode:", font=("Segoe UI", 10, "bold")).pack(side=tk.LEFT)
+            mode_box = ttk.Combobox(
+                mode_frame,
+                textvariable=self.run_mode_var,
+                values=self.scraper_engine.RUN_MODES,
+                state="readonly",
+                width=12
+            )
+            mode_box.pack(side=tk.LEFT, padx=5, ipady=2)
+        
+        # Profile the next manual run (cProfile + tracemalloc, written to log/logs)
+        ttk.Checkbutton(control_frame, text="Profile", variable=self.profile_var).pack(side=tk.LEFT, padx=5)
+        
+        # Module-specific controls
+        self.add_controls(control_frame)
+        
         # DB Config button
         self.config_button = tk.Button(
             control_frame, 
@@ -153,36 +203,61 @@ class BaseScraperApp:
         self.log_text = scrolledtext.ScrolledText(log_frame, state='disabled', height=20)
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
-        # Set callbacks for the scraper engine
-        self.scraper_engine.set_callbacks(
-            progress_callback=self.update_progress,
-            completion_callback=self.finish_scraping
-        )
+        # Progress and completion are polled on the Tk thread (see poll_progress),
+        # so the engine's worker threads never touch widgets
+        self.scraper_engine.set_callbacks(progress_callback=None, completion_callback=None)
 
+    def add_controls(self, control_frame):
+        """Add module-specific widgets to the control row - can be overridden by subclasses"""
+        pass
+    
     def start_manual_fetch(self):
         """Start manual scraping"""
         if not self.scraper_engine.is_scraping():
-            self.start_scraping()
+            profile = "cprofile" if self.profile_var.get() else None
+            self.start_scraping(run_mode=self.run_mode_var.get(), profile=profile)
     
-    def start_scraping(self):
-        """Start the scraping process"""
+    def start_scraping(self, run_mode="full", deadline_seconds=None, profile=None):
+        """Start the scraping process; scheduled runs always use the full mode"""
         if self.scraper_engine.is_scraping():
             return
         
         self.manual_scrape_button.config(state="disabled")
+        self.stop_button.config(state="normal")
         self.status_var.set("Scraping in progress...")
         self.progress_var.set(0)
         self.start_time = time.time()
+        self._progress_version = -1
         
-        # Start the elapsed time updater
+        # Start the scraping process and the progress poller
+        if self.scraper_engine.start_scraping(run_mode=run_mode, deadline_seconds=deadline_seconds, profile=profile):
+            self.parent.after(PROGRESS_POLL_MS, self.poll_progress)
+        else:
+            self.finish_scraping()
+    
+    def stop_scraping(self):
+        """Request the running scrape to stop"""
+        if self.scraper_engine.stop_scraping():
+            self.stop_button.config(state="disabled")
+            self.status_var.set("Stopping...")
+    
+    def poll_progress(self):
+        """Redraw progress from the engine's tracker; runs on the Tk thread"""
+        snapshot = self.scraper_engine.progress.snapshot()
+        if snapshot["version"] != self._progress_version:
+            self._progress_version = snapshot["version"]
+            self.update_progress(snapshot)
         self.update_elapsed_time()
         
-        # Start the scraping process
-        self.scraper_engine.start_scraping()
+        if self.scraper_engine.is_scraping():
+            self.parent.after(PROGRESS_POLL_MS, self.poll_progress)
+        else:
+            self.update_progress(self.scraper_engine.progress.snapshot())
+            self.finish_scraping()
     
     def update_elapsed_time(self):
         """Update the elapsed time display"""
-        if not self.start_time or not self.scraper_engine.is_scraping():
+        if not self.start_time:
             return
             
         elapsed = time.time() - self.start_time
@@ -190,24 +265,28 @@ class BaseScraperApp:
         minutes, seconds = divmod(remainder, 60)
         time_str = f"Elapsed Time: {hours}:{minutes:02d}:{seconds:02d}"
         self.elapsed_time_var.set(time_str)
-        
-        # Schedule the next update
-        if self.scraper_engine.is_scraping():
-            self.parent.after(1000, self.update_elapsed_time)
     
-    def update_progress(self, completed, total):
-        """Update the progress bar and text"""
+    def update_progress(self, snapshot):
+        """Update the progress bar and text from a ProgressTracker snapshot"""
+        completed, total = snapshot["completed"], snapshot["total"]
         if total > 0:
             progress_pct = (completed / total) * 100
             self.progress_var.set(progress_pct)
-            self.progress_text.set(f"{completed}/{total} sectors processed")
+            text = f"{completed}/{total} processed  |  {snapshot['rate']:.1f} pages/s"
+            if snapshot["eta"] is not None:
+                minutes, seconds = divmod(int(snapshot["eta"]), 60)
+                text += f"  |  ETA {minutes}:{seconds:02d}"
+            if snapshot["failed"]:
+                text += f"  |  {snapshot['failed']} failed"
+            self.progress_text.set(text)
         else:
             self.progress_var.set(0)
-            self.progress_text.set("No sectors to process")
+            self.progress_text.set("Nothing processed yet")
     
     def finish_scraping(self):
         """Reset the UI after scraping is complete"""
         self.manual_scrape_button.config(state="normal")
+        self.stop_button.config(state="disabled")
         
         elapsed = time.time() - self.start_time if self.start_time else 0
         hours, remainder = divmod(int(elapsed), 3600)
@@ -217,6 +296,20 @@ class BaseScraperApp:
         self.status_var.set("Ready")
         self.elapsed_time_var.set(time_str)
     
+    def request_scheduled_run(self, deadline_seconds=None):
+        """Queue a run for the Tk thread; called on the scheduler thread, which must not touch widgets"""
+        self.scheduled_runs.put(deadline_seconds)
+    
+    def poll_scheduled_runs(self):
+        """Start the runs the scheduler requested; runs on the Tk thread"""
+        while True:
+            try:
+                deadline_seconds = self.scheduled_runs.get_nowait()
+            except queue.Empty:
+                break
+            self.start_scraping(deadline_seconds=deadline_seconds)
+        self.parent.after(SCHEDULE_POLL_MS, self.poll_scheduled_runs)
+    
     def toggle_scheduler(self):
         """Toggle the scheduler on/off"""
         if not self.scheduler.is_active:
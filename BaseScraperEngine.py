@@ -1,16 +1,61 @@
+import os
+import time
 import threading
+import concurrent.futures
+from contextlib import contextmanager
+
+import pandas as pd
+
+from metrics.instruments import ENGINE_QUEUE_DEPTH, ENGINE_IN_FLIGHT, ENGINE_RUN_SECONDS, ENGINE_RUNS, PARSE_SECONDS
+from ledger.run_stats import RunStats
+from log.run_profiler import RunProfiler
+from handler.progress_tracker import ProgressTracker
+from snapshot.snapshot_store import DATASETS
+from snapshot.change_log import diff_tables, build_events
+from context.app_context import AppContext
+from validation.batch_validator import validate_batch
+from validation.layout_check import LayoutCheck, DEFAULT_PROBE_PAGES
+from records.record_batch import RecordBatch
+from snapshot.sector_summary import SECTOR_SUMMARY_INPUTS, INSERT_QUERY as SECTOR_SUMMARY_INSERT, sector_summary_rows
 
 class BaseScraperEngine:
     """Base class for scraper engines with common functionality"""
     
-    def __init__(self, logger, db_manager, scraper):
+    # Run modes supported by the engine; subclasses with checkpoints add more
+    RUN_MODES = ("full",)
+    
+    # What to do with results gathered before a stop or deadline: "commit" or "discard"
+    PARTIAL_POLICIES = ("commit", "discard")
+    
+    def __init__(self, logger, db_manager, scraper, context=None):
         self.logger = logger
         self.db_manager = db_manager
         self.scraper = scraper
+        # Snapshots and change log shared with the other engines
+        self.context = context or AppContext.default()
+        self.module_name = getattr(logger, 'name', 'engine')
         self.scraping_in_progress = False
+        self.run_mode = "full"
+        self.partial_policy = "discard"
         self.progress_callback = None
         self.completion_callback = None
+        self.progress = ProgressTracker()
+        self._stop_event = threading.Event()
+        self._deadline_timer = None
+        self.run_stats = RunStats(self.module_name)
+        self.profile_mode = None
+        self._profiler = None
+        self.write_rejected = False
+        # Set when the run could not do its work (no items to fetch, a write that failed)
+        # although nothing raised; the run is recorded as an error
+        self.run_failed = False
+        # Diagnostic of a layout change that aborted the current run
+        self.layout_drift = None
         
+        # Let the scraper abort its in-flight downloads when a stop is requested
+        if self.scraper is not None:
+            self.scraper.cancel_event = self._stop_event
+    
     def set_callbacks(self, progress_callback, completion_callback):
         """Set callbacks for progress updates and completion"""
         self.progress_callback = progress_callback
@@ -20,48 +65,351 @@ class BaseScraperEngine:
         """Check if scraping is in progress"""
         return self.scraping_in_progress
     
-    def start_scraping(self):
-        """Start the scraping process"""
+    def start_scraping(self, run_mode="full", deadline_seconds=None, profile=None):
+        """Start the scraping process
+        
+        Args:
+            run_mode (str): One of RUN_MODES
+            deadline_seconds (float): Optional wall-clock budget after which the run is stopped
+            profile (str): Optional RunProfiler mode ("cprofile" or "sampling") for this run only
+        """
         if self.scraping_in_progress:
             self.logger.warning("Scraping already in progress")
             return False
-            
+        
+        if run_mode not in self.RUN_MODES:
+            self.logger.error(f"Unsupported run mode '{run_mode}', expected one of {', '.join(self.RUN_MODES)}")
+            return False
+        
+        self.run_mode = run_mode
+        self.profile_mode = profile
+        self._stop_event.clear()
+        if deadline_seconds:
+            self._deadline_timer = threading.Timer(deadline_seconds, self._deadline_reached)
+            self._deadline_timer.daemon = True
+            self._deadline_timer.start()
+            self.logger.info(f"Run deadline set to {int(deadline_seconds)} seconds")
+        
         self.scraping_in_progress = True
         threading.Thread(target=self.scrape_data, daemon=True).start()
         return True
     
     def scrape_data(self):
         """Template method to be overridden by subclasses"""
+        http_client = getattr(self.scraper, 'http_client', None)
+        if http_client:
+            http_client.latency.reset_run()
+        self.run_stats = RunStats(self.module_name, self.run_mode)
+        self.write_rejected = False
+        self.run_failed = False
+        self.layout_drift = None
+        if hasattr(self.scraper, 'layout_check'):
+            self.scraper.layout_check = None
+        self.progress.start()
+        parse_child = PARSE_SECONDS.labels(self.module_name)
+        parse_seconds_before = parse_child.sum
+        if self.profile_mode:
+            self._profiler = RunProfiler(self.logger, self.module_name, self.profile_mode)
+            self._profiler.start()
+        started = time.perf_counter()
+        outcome = "error"
         try:
             self.logger.info("Starting scraping process")
             self._execute_scraping()
-            self.logger.info("Scraping process completed successfully")
+            if self.layout_drift:
+                outcome = "layout_changed"
+                self.logger.error("Scraping process aborted: the page layout changed")
+            elif self.run_failed:
+                self.logger.error("Scraping process failed; see the errors above")
+            elif self.stop_requested():
+                outcome = "stopped"
+                self.logger.warning("Scraping process stopped before completion")
+            elif self.write_rejected:
+                outcome = "rejected"
+                self.logger.warning("Scraping process finished but validation rejected a write")
+            else:
+                outcome = "completed"
+                self.logger.info("Scraping process completed successfully")
         except Exception as e:
             self.logger.error(f"Error during scraping: {str(e)}", exc_info=True)
         finally:
+            if self._profiler:
+                try:
+                    self._profiler.stop()
+                except Exception as e:
+                    self.logger.error(f"Error writing profile: {str(e)}")
+                self._profiler = None
+            ENGINE_RUN_SECONDS.labels(self.module_name).observe(time.perf_counter() - started)
+            ENGINE_RUNS.labels(self.module_name, outcome).inc()
+            if http_client:
+                self.log_fetch_latency(http_client.latency.run_report())
+            self.run_stats.add_stage_time("parse", parse_child.sum - parse_seconds_before)
+            self.record_run(outcome)
             self.finish_scraping()
     
+    def record_run(self, outcome):
+        """Write the statistics of the finished run to the scrape_runs ledger"""
+        self.run_stats.finish(outcome)
+        self.logger.info(self.run_stats.summary())
+        self.db_manager.record_run(self.run_stats)
+    
+    @contextmanager
+    def stage(self, name):
+        """Add the wall-clock duration of the enclosed block to a run stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.run_stats.add_stage_time(name, time.perf_counter() - started)
+    
+    def write_rows(self, rows, insert_query, table_name=None, replace_range=None, connection=None, part=None):
+        """Store rows through the database manager as the run's write stage
+        
+        Committed rows also replace the table's entry in the in-memory snapshot store.
+        Engines writing many batches per run pass their open connection, and a part
+        number so each batch gets its own Parquet export.
+        """
+        target = table_name or self.db_manager._table_from_query(insert_query)
+        rows = self.validate_rows(target, rows, replace_range)
+        if rows is None:
+            return 0
+        with self.stage("write"):
+            written = self.db_manager.store_data(rows, insert_query, table_name=table_name,
+                                                 replace_range=replace_range, connection=connection)
+        self.run_stats.rows_written += written or 0
+        if rows and not written:
+            # store_data found no connection
+            self.run_failed = True
+        if written:
+            self.publish_snapshot(target, rows)
+            self.export_parquet(target, rows, part)
+        return written
+    
+    def write_spec_rows(self, spec, rows):
+        """Write rows to the table of a ScraperSpec, creating the table first if the spec says how
+        
+        Tables with replace set are replaced as a whole, the others appended to.
+        """
+        if spec.ensure_table and not self.db_manager.prepare_table(getattr(self.db_manager, spec.ensure_table)):
+            self.logger.error(f"Could not prepare the {spec.table} table")
+            return 0
+        return self.write_rows(rows, spec.insert_query, table_name=spec.table if spec.replace else None)
+    
+    def validate_rows(self, table_name, rows, replace_range=None):
+        """Validate rows before they replace a table, quarantining the rows that fail
+        
+        Returns:
+            list: The rows to write, or None if the write must be aborted
+        """
+        # Stopped runs with partial results and range loads are not compared to the previous row count
+        previous_count = None
+        if table_name in DATASETS and not replace_range and not self.stop_requested():
+            previous = self.context.snapshots.table(DATASETS[table_name][0])
+            previous_count = len(previous) if previous is not None else None
+        with self.stage("validate"):
+            report = validate_batch(table_name, rows, previous_count=previous_count)
+        if report.rejected:
+            self.run_stats.failures += len(report.rejected)
+            self.logger.warning(f"Validation: {report.summary()}; rejected rows moved to quarantine_rows")
+            self.db_manager.record_quarantine(self.run_stats, table_name, report.rejected)
+        if report.abort:
+            self.write_rejected = True
+            self.logger.error(f"Write to {table_name} aborted, the stored table is unchanged: {report.summary()}")
+            return None
+        return report.valid_rows
+    
+    def export_parquet(self, table_name, rows, part=None):
+        """Write committed rows to PARQUET_EXPORT_DIR/<table>/<run id>.parquet when that directory is set
+        
+        With a part number the file is <run id>-<part>.parquet, one per batch of the run.
+        Needs pyarrow (or fastparquet). Export errors are logged and never fail the run.
+        """
+        directory = os.getenv("PARQUET_EXPORT_DIR")
+        if not directory:
+            return None
+        try:
+            if isinstance(rows, RecordBatch):
+                frame = rows.to_frame()
+            elif table_name in DATASETS:
+                frame = pd.DataFrame.from_records(rows, columns=[name for name, _ in DATASETS[table_name][2]])
+            else:
+                return None
+            table_directory = os.path.join(directory, table_name)
+            os.makedirs(table_directory, exist_ok=True)
+            name = self.run_stats.run_id if part is None else f"{self.run_stats.run_id}-{part:05d}"
+            path = os.path.join(table_directory, f"{name}.parquet")
+            frame.to_parquet(path, index=False)
+            return path
+        except Exception as e:
+            self.logger.error(f"Error exporting {table_name} to Parquet: {str(e)}")
+            return None
+    
+    def publish_snapshot(self, table_name, rows):
+        """Refresh the snapshot store and log the changes since the previous snapshot
+        
+        Changes go to the change_log table and the JSON Lines change log file.
+        """
+        try:
+            refreshed = self.context.snapshots.refresh(table_name, rows)
+            if refreshed is None:
+                return
+            dataset, previous, current = refreshed
+            if dataset in SECTOR_SUMMARY_INPUTS:
+                self.refresh_sector_summary()
+            if previous is None:
+                self.logger.info(f"No previous snapshot of {dataset}; changes are tracked from the next run")
+                return
+            events = build_events(self.run_stats, dataset, diff_tables(dataset, previous, current))
+            if events:
+                self.context.change_log.append(events)
+                self.db_manager.record_changes(events)
+            self.logger.info(f"{len(events)} changes in {dataset} since the previous snapshot")
+        except Exception as e:
+            # The snapshot is a read cache; the database stays the source of truth
+            self.logger.error(f"Error refreshing snapshot: {str(e)}")
+    
+    def refresh_sector_summary(self):
+        """Recompute the Sector_Summary table from the snapshot after one of its inputs was committed"""
+        with self.stage("aggregate"):
+            rows = sector_summary_rows(self.context.snapshots)
+            if not rows:
+                self.logger.info("No sector membership yet; sector summary not computed")
+                return
+            if not self.db_manager.prepare_table(self.db_manager.ensure_sector_summary_table):
+                self.logger.error("Could not prepare the Sector_Summary table")
+                return
+            self.db_manager.store_data(rows, SECTOR_SUMMARY_INSERT, table_name="Sector_Summary")
+            self.context.snapshots.refresh("Sector_Summary", rows)
+        self.logger.info(f"Sector summary refreshed for {len(rows)} sectors")
+    
+    def log_fetch_latency(self, report):
+        """Log the per-run fetch latency percentiles and hedging counts"""
+        if not report["requests"]:
+            return
+        self.logger.info(
+            f"Fetch latency over {report['requests']} requests: "
+            f"p50={report['p50']:.2f}s p95={report['p95']:.2f}s p99={report['p99']:.2f}s, "
+            f"{report['hedges']} hedged ({report['hedge_wins']} won by the hedge)"
+        )
+    
     def _execute_scraping(self):
         """Abstract method that must be implemented by subclasses to perform actual scraping"""
         raise NotImplementedError("Subclasses must implement _execute_scraping method")
     
+    def run_tasks(self, func, items, on_result, max_workers=10, poll_interval=0.5):
+        """Run func over items in a thread pool, stopping promptly on cancellation
+        
+        on_result(item, result) is called on the engine thread for every task that
+        finishes before a stop is requested. On stop, queued tasks are cancelled and
+        in-flight ones are abandoned; their downloads abort via the scraper's cancel event.
+        
+        Returns:
+            bool: True if every task finished, False if the run was stopped
+        """
+        queue_depth = ENGINE_QUEUE_DEPTH.labels(self.module_name)
+        in_flight = ENGINE_IN_FLIGHT.labels(self.module_name)
+        
+        if self._profiler:
+            func = self._profiler.wrap(func)
+        
+        def instrumented(item):
+            queue_depth.dec()
+            with in_flight.track_inprogress():
+                return func(item)
+        
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        queue_depth.inc(len(items))
+        future_to_item = {executor.submit(instrumented, item): item for item in items}
+        pending = set(future_to_item)
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=poll_interval, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    # Results that arrive after a stop may be aborted downloads; ignore them
+                    if self.stop_requested():
+                        break
+                    on_result(future_to_item[future], future.result())
+                if self.stop_requested():
+                    cancelled = sum(1 for future in pending if future.cancel())
+                    queue_depth.dec(cancelled)
+                    self.logger.warning(
+                        f"Run stopped: {cancelled} queued tasks cancelled, "
+                        f"{len(pending) - cancelled} in-flight tasks aborted"
+                    )
+                    return False
+            return True
+        finally:
+            executor.shutdown(wait=False)
+    
+    def begin_layout_check(self, page_count):
+        """Check the layout of the first pages of the run before the rest of the fan-out
+        
+        The first LAYOUT_PROBE_PAGES pages (default 3, 0 turns the check off) are
+        compared with the stored layout signature of the spec; on a mismatch the
+        run is aborted and nothing is written. Needs a SpecScraper.
+        """
+        if not hasattr(self.scraper, 'layout_check'):
+            return
+        probe_pages = min(int(os.getenv("LAYOUT_PROBE_PAGES", DEFAULT_PROBE_PAGES)), page_count)
+        if probe_pages <= 0:
+            return
+        self.scraper.layout_check = LayoutCheck(self.logger, self.scraper.spec, self._layout_changed, probe_pages)
+    
+    def _layout_changed(self, diagnostic):
+        """Abort the run: the remaining pages would be parsed with a spec that no longer fits"""
+        self.layout_drift = diagnostic
+        self.logger.error(diagnostic)
+        self._stop_event.set()
+    
     def update_progress(self, completed, total):
-        """Update progress through the callback if available"""
+        """Publish progress for the UI to poll, and notify the callback if one is set
+        
+        The callback runs on the engine thread; GUI code must poll self.progress instead.
+        """
+        self.progress.publish(completed, total, self.run_stats.failures)
         if self.progress_callback:
             self.progress_callback(completed, total)
     
+    def should_store_results(self):
+        """Decide whether results gathered so far may be written to the database"""
+        if self.layout_drift:
+            self.logger.warning("Run was aborted by a layout change; discarding its results")
+            return False
+        if not self.stop_requested():
+            return True
+        if self.partial_policy == "commit":
+            self.logger.warning("Run was stopped early; committing partial results")
+            return True
+        self.logger.warning("Run was stopped early; discarding partial results")
+        return False
+    
     def finish_scraping(self):
         """Reset state after scraping is complete"""
+        if self._deadline_timer:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
         self.scraping_in_progress = False
         if self.completion_callback:
             self.completion_callback()
     
+    def stop_requested(self):
+        """Check whether a stop was requested or the run deadline has passed"""
+        return self._stop_event.is_set()
+    
+    def _deadline_reached(self):
+        """Stop the run when its wall-clock deadline expires"""
+        if self.scraping_in_progress:
+            self.logger.warning("Run deadline reached, stopping scraping process")
+            self._stop_event.set()
+    
     def stop_scraping(self):
         """Request to stop the scraping process"""
         if self.scraping_in_progress:
             self.logger.info("Stop requested for scraping process")
-            # Implementing classes should check this flag periodically
-            self.scraping_in_progress = False
+            # Engines check this event between tasks; scrapers abort in-flight downloads
+            self._stop_event.set()
             return True
         return False
     
@@ -82,4 +430,4 @@ class BaseScraperEngine:
         except (ValueError, TypeError):
             # Log the problematic value
             self.logger.warning(f"Could not convert '{value}' to float")
-            return None
\ No newline at end of file
+            return None
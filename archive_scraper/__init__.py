@@ -0,0 +1,7 @@
+# This file makes the archive_scraper directory a Python package
+# It also provides a convenient way to import from the module
+
+from .archive_scraper import ArchiveScraper, ArchiveBackfillEngine, ScraperApp
+
+# Define what gets imported when using "from archive_scraper import *"
+__all__ = ['ArchiveScraper', 'ArchiveBackfillEngine', 'ScraperApp']
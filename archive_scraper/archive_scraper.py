@@ -0,0 +1,221 @@
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+# Import from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from BaseScraperApp import BaseScraperApp
+from BaseScraperEngine import BaseScraperEngine
+from checkpoint.shard_checkpoint import ShardCheckpoint
+from spec import SpecScraper
+from spec.specs import ARCHIVE_SPEC
+
+# Module name for logging
+MODULE_NAME = ARCHIVE_SPEC.name
+
+
+class ArchiveScraper(SpecScraper):
+    """Handles scraping the DSE day-end archive for a date range"""
+    
+    def __init__(self, logger, http_client=None):
+        super().__init__(logger, ARCHIVE_SPEC, http_client)
+    
+    def scrape_shard(self, shard):
+        """Scrape the day-end prices of every instrument from shard[0] to shard[1]
+        
+        Returns:
+            RecordBatch: ArchiveRecords of the shard, or None if the page could not
+                be fetched or has no archive table
+        """
+        rows = self.scrape(shard)
+        if rows is None:
+            return None
+        # Only keep rows of the requested range, so a re-load replaces exactly this shard
+        return self.in_range(rows, *shard)
+
+
+class ArchiveBackfillEngine(BaseScraperEngine):
+    """Backfills day-end price history from the DSE archive in parallel date shards
+    
+    The date range is split into shards of SHARD_DAYS days that are fetched
+    concurrently. Each shard is committed on its own (replacing any rows of its
+    dates) and then checkpointed, so a stopped or failed backfill keeps its
+    finished shards and re-running a range only fetches the missing days.
+    """
+    
+    # Calendar days per archive request
+    SHARD_DAYS = 7
+    
+    # Concurrent archive requests; the shared DSE rate limit applies on top
+    MAX_WORKERS = 4
+    
+    # Range of scheduled runs, which have no explicit range: the last N days
+    DEFAULT_BACKFILL_DAYS = 30
+    
+    # DSE trades Sunday to Thursday (date.weekday(): Monday is 0)
+    TRADING_WEEKDAYS = (6, 0, 1, 2, 3)
+    
+    # Empty responses for a shard with trading days before its days are taken for holidays;
+    # until then an empty page may be a transient error and the shard is retried by later runs
+    EMPTY_SHARD_ATTEMPTS = 3
+    
+    def __init__(self, logger, db_manager, scraper, state_dir=None, context=None):
+        super().__init__(logger, db_manager, scraper, context=context)
+        self.checkpoint = ShardCheckpoint(logger, MODULE_NAME, state_dir=state_dir)
+        self.start_date = None
+        self.end_date = None
+    
+    def set_range(self, start_date, end_date):
+        """Set the date range of the next run"""
+        self.start_date = start_date
+        self.end_date = end_date
+    
+    def _take_range(self):
+        """Return the range of this run and reset it so scheduled runs use the default window"""
+        end = self.end_date or date.today() - timedelta(days=1)
+        start = self.start_date or end - timedelta(days=self.DEFAULT_BACKFILL_DAYS - 1)
+        self.start_date = self.end_date = None
+        return start, end
+    
+    def _has_trading_days(self, start, end):
+        """Return True if a DSE trading weekday lies from start to end"""
+        return any((start + timedelta(days=offset)).weekday() in self.TRADING_WEEKDAYS
+                   for offset in range(min((end - start).days + 1, 7)))
+    
+    def _execute_scraping(self):
+        """Fetch, store and checkpoint every missing shard of the date range"""
+        start, end = self._take_range()
+        self.logger.info(f"Starting archive backfill from {start} to {end}")
+        
+        if start > end:
+            self.logger.error(f"Invalid date range: {start} is after {end}")
+            self.run_failed = True
+            return
+        if not self.db_manager.prepare_table(self.db_manager.ensure_day_end_archive_table):
+            self.logger.error("Could not prepare the day_end_archive table")
+            self.run_failed = True
+            return
+        
+        missing = self.checkpoint.missing_days(start, end)
+        if not missing:
+            self.logger.info(f"Archive from {start} to {end} is already loaded")
+            self.update_progress(1, 1)
+            return
+        
+        shards = ShardCheckpoint.shards(missing, self.SHARD_DAYS)
+        self.logger.info(f"{len(missing)} missing days in {len(shards)} shards")
+        
+        completed = 0
+        
+        def store_shard(shard, rows):
+            nonlocal completed
+            shard_start, shard_end = shard
+            if rows is None:
+                self.run_stats.failures += 1
+                self.logger.warning(f"Shard {shard_start} to {shard_end} failed; the next run retries it")
+            else:
+                self.run_stats.rows_fetched += len(rows)
+                self.run_stats.rows_parsed += len(rows)
+                try:
+                    written = 0
+                    if rows:
+                        written = self.write_rows(
+                            rows, ARCHIVE_SPEC.insert_query, table_name=ARCHIVE_SPEC.table,
+                            replace_range=(ARCHIVE_SPEC.replace_column, shard_start, shard_end)
+                        )
+                    if not rows and self._has_trading_days(shard_start, shard_end):
+                        attempts = self.checkpoint.mark_empty(shard_start, shard_end)
+                        if attempts >= self.EMPTY_SHARD_ATTEMPTS:
+                            self.logger.info(
+                                f"Shard {shard_start} to {shard_end} was empty {attempts} times; taken for holidays"
+                            )
+                            self.checkpoint.mark_completed(shard_start, shard_end, Counter())
+                        else:
+                            self.logger.warning(
+                                f"Shard {shard_start} to {shard_end} has trading days but no rows "
+                                f"(empty response {attempts} of {self.EMPTY_SHARD_ATTEMPTS}); the next run retries it"
+                            )
+                    elif written == len(rows):
+                        # Days without rows (weekends, holidays within a shard with data) are complete too
+                        self.checkpoint.mark_completed(shard_start, shard_end, Counter(row[0] for row in rows))
+                    else:
+                        # No connection, or validation left rows out: keep the shard open for the next run
+                        self.run_stats.failures += 1
+                        self.logger.error(
+                            f"Stored {written or 0} of {len(rows)} rows of shard {shard_start} to {shard_end}; "
+                            f"the next run retries it"
+                        )
+                except Exception as e:
+                    # The shard is retried by the next run, but this run did not load the whole range
+                    self.run_failed = True
+                    self.run_stats.failures += 1
+                    self.logger.error(f"Error storing shard {shard_start} to {shard_end}: {str(e)}")
+            
+            completed += 1
+            self.update_progress(completed, len(shards))
+        
+        with self.stage("fetch"):
+            finished = self.run_tasks(self.scraper.scrape_shard, shards, store_shard, max_workers=self.MAX_WORKERS)
+        if not finished:
+            self.logger.warning(f"Backfill stopped after {completed} of {len(shards)} shards; committed shards are kept")
+            return
+        
+        self.logger.info("Archive backfill completed successfully")
+
+
+class ScraperApp(BaseScraperApp):
+    """Main application class with the UI"""
+    
+    def __init__(self, parent, context=None):
+        # Call the parent constructor
+        super().__init__(parent, title="Archive Backfill Module", module_name=MODULE_NAME, context=context)
+        self.start_date_entry = None
+        self.end_date_entry = None
+        
+        # Set up the scraper components
+        self.setup_scraper()
+        
+        # Complete initialization
+        self.complete_initialization()
+    
+    def setup_scraper(self):
+        """Set up specific scraper components"""
+        self.scraper = self.create_scraper()
+        self.scraper_engine = ArchiveBackfillEngine(self.logger, self.db_manager, self.scraper, context=self.context)
+    
+    def create_scraper(self):
+        """Create and return the scraper instance"""
+        return ArchiveScraper(self.logger, self.http_client)
+    
+    def add_controls(self, control_frame):
+        """Add the backfill date range entries"""
+        range_frame = ttk.Frame(control_frame)
+        range_frame.pack(side=tk.LEFT, padx=5)
+        
+        yesterday = date.today() - timedelta(days=1)
+        ttk.Label(range_frame, text="From:", font=("Segoe UI", 10, "bold")).pack(side=tk.LEFT)
+        self.start_date_entry = ttk.Entry(range_frame, width=11)
+        self.start_date_entry.pack(side=tk.LEFT, padx=5, ipady=4)
+        self.start_date_entry.insert(0, (yesterday - timedelta(days=ArchiveBackfillEngine.DEFAULT_BACKFILL_DAYS - 1)).isoformat())
+        
+        ttk.Label(range_frame, text="To:", font=("Segoe UI", 10, "bold")).pack(side=tk.LEFT)
+        self.end_date_entry = ttk.Entry(range_frame, width=11)
+        self.end_date_entry.pack(side=tk.LEFT, padx=5, ipady=4)
+        self.end_date_entry.insert(0, yesterday.isoformat())
+    
+    def start_manual_fetch(self):
+        """Start a backfill of the entered date range"""
+        try:
+            start = datetime.strptime(self.start_date_entry.get().strip(), "%Y-%m-%d").date()
+            end = datetime.strptime(self.end_date_entry.get().strip(), "%Y-%m-%d").date()
+        except ValueError:
+            self.status_var.set("Invalid date (use YYYY-MM-DD)")
+            return
+        if start > end:
+            self.status_var.set("Invalid date range")
+            return
+        self.scraper_engine.set_range(start, end)
+        super().start_manual_fetch()
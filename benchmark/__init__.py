@@ -0,0 +1,4 @@
+# Make this directory a Python package
+from .mock_dse_server import MockDSEServer
+
+__all__ = ["MockDSEServer"]
@@ -0,0 +1,295 @@
+import os
+import random
+import threading
+import time
+import zlib
+from string import Template
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name):
+    """Return the string.Template of a page fixture"""
+    with open(os.path.join(FIXTURE_DIR, f'{name}.html'), encoding='utf-8') as f:
+        return Template(f.read())
+
+
+class MockDSEServer:
+    """Local stand-in for dsebd.org serving synthetic pages from the fixtures
+    
+    Symbols are named SYM00001, SYM00002, ... and spread round-robin over the
+    sectors. Page values are derived from the symbol name, so every run serves
+    the same content. Each request waits latency plus a uniform random jitter,
+    and fails with HTTP 503 with probability error_rate. The market depth of
+    every other symbol changes on each request; the rest never change.
+    
+    Args:
+        symbols (int): Number of synthetic listed companies
+        sectors (int): Number of synthetic industry sectors
+        latency (float): Base response delay in seconds
+        jitter (float): Maximum extra random delay in seconds
+        error_rate (float): Fraction of requests answered with HTTP 503
+        page_kb (int): Padding added to each page to mimic the real page size
+        seed (int): Seed of the jitter and error random generator
+    """
+    
+    PAGES = ("displayCompany.php", "latest_PE.php", "company_listing.php",
+             "by_industrylisting.php", "companylistbyindustry.php", "day_end_archive.php",
+             "load-instrument.php")
+    
+    def __init__(self, symbols=500, sectors=20, latency=0.0, jitter=0.0, error_rate=0.0,
+                 page_kb=0, seed=0, host="127.0.0.1", port=0):
+        self.symbols = [f"SYM{i:05d}" for i in range(1, symbols + 1)]
+        self.sectors = [str(10000 + i) for i in range(1, sectors + 1)]
+        # Lookups must stay O(1) with thousands of symbols
+        self._symbol_set = set(self.symbols)
+        self._sector_index = {code: index for index, code in enumerate(self.sectors)}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.padding = "x" * (page_kb * 1024)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.requests = {page: 0 for page in self.PAGES}
+        self.errors = 0
+        self._templates = {name: load_fixture(name) for name in (
+            "company_listing", "company_link", "by_industrylisting", "sector_row",
+            "companylistbyindustry", "displayCompany", "latest_PE", "pe_row",
+            "day_end_archive", "archive_row", "market_depth", "depth_row"
+        )}
+        # Market depth requests per symbol, which move the changing ladders
+        self._depth_ticks = {}
+        # The list pages do not depend on the request; render them once
+        self._company_listing = self._render_company_listing()
+        self._industry_listing = self._render_industry_listing()
+        self._latest_pe = self._render_latest_pe()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Serve in a background thread and return the base URL"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+    
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    @staticmethod
+    def _seed(symbol):
+        """Return a stable per-symbol integer used to derive page values"""
+        return zlib.crc32(symbol.encode('ascii'))
+    
+    def _sector_symbols(self, sector_code):
+        return self.symbols[self._sector_index[sector_code]::len(self.sectors)]
+    
+    def _render_company_listing(self):
+        link = self._templates["company_link"]
+        links = "\n".join(link.substitute(symbol=symbol) for symbol in self.symbols)
+        return self._templates["company_listing"].substitute(links=links, padding=self.padding)
+    
+    def _render_industry_listing(self):
+        row = self._templates["sector_row"]
+        rows = "\n".join(
+            row.substitute(sector_code=code, sector_name=f"Sector {code}", count=len(self._sector_symbols(code)))
+            for code in self.sectors
+        )
+        return self._templates["by_industrylisting"].substitute(rows=rows, padding=self.padding)
+    
+    def _render_sector(self, sector_code):
+        link = self._templates["company_link"]
+        links = "\n".join(link.substitute(symbol=symbol) for symbol in self._sector_symbols(sector_code))
+        return self._templates["companylistbyindustry"].substitute(
+            sector_name=f"Sector {sector_code}", links=links, padding=self.padding
+        )
+    
+    def _render_company(self, symbol):
+        seed = self._seed(symbol)
+        sponsor = 20 + seed % 4000 / 100
+        govt = seed % 7 / 2
+        institute = seed % 2500 / 100
+        foreign = seed % 900 / 100
+        public = round(100 - sponsor - govt - institute - foreign, 2)
+        total_share = 1_000_000 + seed % 900_000_000
+        close = 10 + seed % 50000 / 100
+        return self._templates["displayCompany"].substitute(
+            symbol=symbol,
+            authorized=f"{1000 + seed % 9000:,}",
+            paid_up=f"{total_share * 10 / 1_000_000:,.2f}",
+            sector=f"Sector {self.sectors[(int(symbol[3:]) - 1) % len(self.sectors)]}",
+            close=f"{close:.2f}",
+            market_cap=f"{total_share * close / 1_000_000:,.3f}",
+            listing_year=1990 + seed % 34,
+            category="AB"[seed % 2],
+            last_agm=f"2025-12-{1 + seed % 28:02d}",
+            cash_dividend=f"{seed % 30}%, 2025" if seed % 4 else "-",
+            stock_dividend=f"{seed % 10}%, 2025" if seed % 3 == 0 else "-",
+            eps=f"{(seed % 2000 - 500) / 100:.2f}",
+            nav=f"{5 + seed % 9000 / 100:.2f}",
+            total_share=f"{total_share:,}",
+            sponsor=f"{sponsor:.2f}", govt=f"{govt:.2f}", institute=f"{institute:.2f}",
+            foreign=f"{foreign:.2f}", public=f"{public:.2f}",
+            padding=self.padding
+        )
+    
+    def _render_latest_pe(self):
+        row = self._templates["pe_row"]
+        rows = []
+        for sl, symbol in enumerate(self.symbols, start=1):
+            seed = self._seed(symbol)
+            close = 10 + seed % 50000 / 100
+            ratios = [f"{5 + (seed >> shift) % 4000 / 100:.2f}" for shift in (0, 3, 6, 9)]
+            rows.append(row.substitute(
+                sl=sl, symbol=symbol, close=f"{close:.2f}", ycp=f"{close * 0.99:.2f}",
+                pe1=ratios[0], pe2=ratios[1], pe3=ratios[2], pe4=ratios[3],
+                # Like the real page, some ratios are unavailable
+                pe5="N/A" if seed % 5 == 0 else ratios[0], pe6="-" if seed % 3 == 0 else ratios[1]
+            ))
+        return self._templates["latest_PE"].substitute(rows="\n".join(rows), padding=self.padding)
+    
+    def _render_archive(self, start, end):
+        """Render day-end prices of every symbol for the trading days (Sunday to Thursday) in a range"""
+        row = self._templates["archive_row"]
+        rows = []
+        day = start
+        while day <= end:
+            if day.weekday() not in (4, 5):
+                for symbol in self.symbols:
+                    seed = self._seed(f"{symbol}{day.isoformat()}")
+                    close = 10 + seed % 50000 / 100
+                    rows.append(row.substitute(
+                        sl=len(rows) + 1, date=day.isoformat(), symbol=symbol,
+                        ltp=f"{close:.2f}", high=f"{close * 1.02:.2f}", low=f"{close * 0.98:.2f}",
+                        openp=f"{close * 0.995:.2f}", closep=f"{close:.2f}", ycp=f"{close * 0.99:.2f}",
+                        trade=f"{seed % 5000:,}", value=f"{seed % 100000 / 100:.3f}", volume=f"{seed % 10_000_000:,}"
+                    ))
+            day += timedelta(days=1)
+        return self._templates["day_end_archive"].substitute(rows="\n".join(rows), padding=self.padding)
+    
+    def _render_depth(self, symbol):
+        """Render five bid and five ask levels around a per-symbol mid price"""
+        seed = self._seed(symbol)
+        with self._random_lock:
+            tick = self._depth_ticks[symbol] = self._depth_ticks.get(symbol, -1) + 1
+        mid = 10 + seed % 50000 / 100 + (tick % 10 / 10 if seed % 2 == 0 else 0)
+        row = self._templates["depth_row"]
+        bids = "\n".join(row.substitute(price=f"{mid - level / 10:.2f}", volume=f"{(seed >> level) % 50000:,}")
+                         for level in range(1, 6))
+        asks = "\n".join(row.substitute(price=f"{mid + level / 10:.2f}", volume=f"{(seed >> (level + 5)) % 50000:,}")
+                         for level in range(1, 6))
+        return self._templates["market_depth"].substitute(bids=bids, asks=asks, padding=self.padding)
+    
+    def render(self, path, query):
+        """Return (status, body) for a request path and its parsed query string"""
+        page = path.rsplit('/', 1)[-1]
+        if page == "company_listing.php":
+            return 200, self._company_listing
+        if page == "by_industrylisting.php":
+            return 200, self._industry_listing
+        if page == "latest_PE.php":
+            return 200, self._latest_pe
+        if page == "companylistbyindustry.php":
+            sector_code = query.get("industryno", [""])[0]
+            if sector_code in self._sector_index:
+                return 200, self._render_sector(sector_code)
+        if page == "displayCompany.php":
+            symbol = query.get("name", [""])[0]
+            if symbol in self._symbol_set:
+                return 200, self._render_company(symbol)
+        if page == "day_end_archive.php":
+            try:
+                start = date.fromisoformat(query.get("startDate", [""])[0])
+                end = date.fromisoformat(query.get("endDate", [""])[0])
+            except ValueError:
+                return 400, "<html><body>Bad Request</body></html>"
+            return 200, self._render_archive(start, end)
+        if page == "load-instrument.php":
+            symbol = query.get("inst", [""])[0]
+            if symbol in self._symbol_set:
+                return 200, self._render_depth(symbol)
+        return 404, "<html><body>Not Found</body></html>"
+    
+    def _delay_and_fault(self, page):
+        """Count the request and return its response delay and whether to inject an error"""
+        with self._random_lock:
+            if page in self.requests:
+                self.requests[page] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return delay, fail
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                self.respond(parts.path, parse_qs(parts.query))
+            
+            def do_POST(self):
+                # Form fields are served like query parameters
+                length = int(self.headers.get("Content-Length") or 0)
+                form = self.rfile.read(length).decode('utf-8')
+                self.respond(urlsplit(self.path).path, parse_qs(form))
+            
+            def respond(self, path, query):
+                delay, fail = server._delay_and_fault(path.rsplit('/', 1)[-1])
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    status, body = 503, "<html><body>Service Unavailable</body></html>"
+                else:
+                    status, body = server.render(path, query)
+                
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+        
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Serve synthetic DSE pages for local benchmarking")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--sectors", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-kb", type=int, default=0)
+    args = parser.parse_args()
+    
+    mock = MockDSEServer(args.symbols, args.sectors, args.latency, args.jitter, args.error_rate,
+                         args.page_kb, port=args.port)
+    print(f"Serving {args.symbols} symbols at {mock.base_url}; set DSE_BASE_URL to use it")
+    mock.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
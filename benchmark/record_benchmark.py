@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tracemalloc
+from datetime import datetime
+
+# Import from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from records import CompanyRecord, RecordBatch
+from snapshot.snapshot_store import DATASETS, ColumnarTable
+from validation.batch_validator import validate_batch
+
+INSERT_QUERY = "INSERT INTO Company_Information (company_symbol, company_name, isActive, last_updated) VALUES (?, ?, ?, ?)"
+
+
+def synthetic_links(rows):
+    """Return (symbol, name) pairs like the ones parsed from company_listing.php"""
+    return [(f"SYM{index:06d}", f"Synthetic Company {index} Limited") for index in range(rows)]
+
+
+def build_dict_rows(links):
+    """Previous layout: one dict and one datetime.now() per row, converted to tuples by the engine"""
+    companies = []
+    for symbol, name in links:
+        companies.append({
+            'company_symbol': symbol,
+            'company_name': name,
+            'isActive': 1,
+            'last_updated': datetime.now()
+        })
+    return [
+        (company.get("company_symbol"), company.get("company_name"), company.get("isActive"), company.get("last_updated"))
+        for company in companies
+    ]
+
+
+def build_record_batch(links):
+    """Current layout: columns appended to a RecordBatch with one run timestamp"""
+    batch = RecordBatch(CompanyRecord)
+    for symbol, name in links:
+        batch.append(symbol, name, 1)
+    return batch
+
+
+def insert_rows(rows):
+    """Bulk insert into an in-memory SQLite table, as store_data does"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Company_Information (company_symbol TEXT, company_name TEXT, isActive INTEGER, last_updated TEXT)")
+    conn.executemany(INSERT_QUERY, rows)
+    conn.commit()
+    conn.close()
+
+
+def build_snapshot(rows):
+    dataset, key, columns = DATASETS["Company_Information"]
+    return ColumnarTable(columns, key, rows)
+
+
+def measure(function, *args):
+    """Run function and return (result, seconds, peak bytes, bytes still allocated, blocks allocated)"""
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    started = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - started
+    blocks = sys.getallocatedblocks() - blocks_before
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {
+        "seconds": round(seconds, 4),
+        "peak_kb": round(peak / 1024, 1),
+        "retained_kb": round(current / 1024, 1),
+        "retained_blocks": blocks,
+    }
+
+
+def run_layout(build, links):
+    """Measure building a batch and handing it to validation, bulk insert and the snapshot store"""
+    rows, stages = None, {}
+    rows, stages["build"] = measure(build, links)
+    report, stages["validate"] = measure(validate_batch, "Company_Information", rows)
+    _, stages["insert"] = measure(insert_rows, report.valid_rows)
+    _, stages["snapshot"] = measure(build_snapshot, report.valid_rows)
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the allocations of per-row dicts and column-oriented record batches")
+    parser.add_argument("--rows", type=int, default=100000, help="number of synthetic rows")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    links = synthetic_links(args.rows)
+    report = {
+        "benchmark": {"rows": args.rows, "started_at": datetime.now().isoformat(timespec="seconds")},
+        "layouts": {
+            "dict_rows": run_layout(build_dict_rows, links),
+            "record_batch": run_layout(build_record_batch, links),
+        },
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    print(f"{'stage':<10} {'dict rows':>24} {'record batch':>24}", file=sys.stderr)
+    for stage in ("build", "validate", "insert", "snapshot"):
+        old = report["layouts"]["dict_rows"][stage]
+        new = report["layouts"]["record_batch"][stage]
+        print(
+            f"{stage:<10} {old['seconds']:>8.3f}s {old['retained_kb']:>10.0f} KiB"
+            f" {new['seconds']:>8.3f}s {new['retained_kb']:>10.0f} KiB",
+            file=sys.stderr
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+# Import from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark.mock_dse_server import MockDSEServer
+from config.sqliteConfig import SQLiteDatabaseManager
+from fetcher.single_flight import DSE_SINGLE_FLIGHT
+from company_scraper import company_scraper
+from sector_scraper import sector_scraper
+from Sector_wise_company import sector_wise_company
+from share_ratio_scraper import share_ratio_scraper
+from PE_scraper import PE_scraper
+from market_depth import market_depth
+
+
+def engine_factories(state_dir):
+    """Return (module, build) pairs in run order; later engines read what earlier ones stored"""
+    return [
+        (company_scraper, lambda logger, db: company_scraper.CompanyScraperEngine(
+            logger, db, company_scraper.CompanyScraper(logger))),
+        (sector_scraper, lambda logger, db: sector_scraper.SectorCodeScraperEngine(
+            logger, db, sector_scraper.ShareScraper(logger))),
+        (sector_wise_company, lambda logger, db: sector_wise_company.SectorCompanyScraperEngine(
+            logger, db, sector_wise_company.ShareScraper(logger))),
+        (share_ratio_scraper, lambda logger, db: share_ratio_scraper.ShareRatioScraperEngine(
+            logger, db, share_ratio_scraper.ShareScraper(logger), state_dir=state_dir)),
+        (PE_scraper, lambda logger, db: PE_scraper.PEScraperEngine(
+            logger, db, PE_scraper.ShareScraper(logger))),
+        # Three back-to-back polls of the whole universe, whatever the time of day
+        (market_depth, lambda logger, db: market_depth.MarketDepthEngine(
+            logger, db, market_depth.MarketDepthScraper(logger), poll_seconds=0, max_cycles=3)),
+    ]
+
+
+def run_engine(engine):
+    """Run an engine synchronously and return its measurements"""
+    coalesced_before = DSE_SINGLE_FLIGHT.coalesced
+    started = time.perf_counter()
+    engine.scrape_data()
+    wall_seconds = time.perf_counter() - started
+
+    stats = engine.run_stats
+    latency = engine.scraper.http_client.latency.run_report()
+    return {
+        "outcome": stats.outcome,
+        "wall_seconds": round(wall_seconds, 4),
+        "rows_fetched": stats.rows_fetched,
+        "rows_parsed": stats.rows_parsed,
+        "rows_written": stats.rows_written,
+        "failures": stats.failures,
+        "rows_per_second": round(stats.rows_parsed / wall_seconds, 2) if wall_seconds else 0.0,
+        "pages": latency["requests"],
+        "coalesced_requests": DSE_SINGLE_FLIGHT.coalesced - coalesced_before,
+        "pages_per_second": round(latency["requests"] / wall_seconds, 2) if wall_seconds else 0.0,
+        "stages": {stage: round(seconds, 4) for stage, seconds in stats.stage_seconds.items()},
+        "latency": {
+            # Percentiles are None when the engine made no requests
+            "p50": latency["p50"] and round(latency["p50"], 4),
+            "p95": latency["p95"] and round(latency["p95"], 4),
+            "p99": latency["p99"] and round(latency["p99"], 4),
+            "hedges": latency["hedges"],
+            "hedge_wins": latency["hedge_wins"],
+        },
+    }
+
+
+def run_benchmark(args):
+    """Start the mock server, run every engine against it and SQLite, and return the report"""
+    server = MockDSEServer(
+        symbols=args.symbols, sectors=args.sectors, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, page_kb=args.page_kb, seed=args.seed
+    )
+    base_url = server.start()
+    previous_base_url = os.environ.get("DSE_BASE_URL")
+    os.environ["DSE_BASE_URL"] = base_url
+
+    report = {
+        "benchmark": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "symbols": args.symbols,
+            "sectors": args.sectors,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "page_kb": args.page_kb,
+            "seed": args.seed,
+        },
+        "engines": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="dse_benchmark_") as work_dir:
+            # Keep benchmark data out of the application's snapshot, change log and layout signatures
+            os.environ.setdefault("SNAPSHOT_PATH", os.path.join(work_dir, "latest.snapshot"))
+            os.environ.setdefault("CHANGE_LOG_PATH", os.path.join(work_dir, "change_log.jsonl"))
+            os.environ.setdefault("LAYOUT_SIGNATURE_DIR", os.path.join(work_dir, "layouts"))
+            db_manager = SQLiteDatabaseManager(logging.getLogger("benchmark"), os.path.join(work_dir, "benchmark.sqlite"))
+            for module, build in engine_factories(os.path.join(work_dir, "state")):
+                logger = logging.getLogger(module.MODULE_NAME)
+                result = run_engine(build(logger, db_manager))
+                # Unselected engines still run: later engines read the tables they fill
+                if args.engines and module.MODULE_NAME not in args.engines:
+                    continue
+                report["engines"][module.MODULE_NAME] = result
+                print(
+                    f"{module.MODULE_NAME:<28} {result['outcome']:<10} {result['wall_seconds']:>8.2f}s "
+                    f"{result['rows_written']:>7} rows {result['pages_per_second']:>8.1f} pages/s "
+                    f"p95 {result['latency']['p95'] or 0:.3f}s",
+                    file=sys.stderr
+                )
+    finally:
+        server.stop()
+        if previous_base_url is None:
+            os.environ.pop("DSE_BASE_URL", None)
+        else:
+            os.environ["DSE_BASE_URL"] = previous_base_url
+
+    report["server"] = {"requests": dict(server.requests), "injected_errors": server.errors}
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Compare engine wall times with a baseline report
+
+    Returns:
+        list: Descriptions of the engines that are slower than the baseline by more than tolerance
+    """
+    regressions = []
+    for module, result in report["engines"].items():
+        previous = baseline.get("engines", {}).get(module)
+        if not previous or not previous["wall_seconds"]:
+            continue
+        ratio = result["wall_seconds"] / previous["wall_seconds"]
+        result["baseline_wall_seconds"] = previous["wall_seconds"]
+        result["change"] = round(ratio - 1, 4)
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{module}: {result['wall_seconds']:.2f}s vs {previous['wall_seconds']:.2f}s baseline "
+                f"(+{(ratio - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper engines against a local mock DSE server")
+    parser.add_argument("--symbols", type=int, default=500, help="number of synthetic companies")
+    parser.add_argument("--sectors", type=int, default=20, help="number of synthetic sectors")
+    parser.add_argument("--latency", type=float, default=0.02, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="maximum extra random delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--page-kb", type=int, default=0, help="padding added to every page, in KiB")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the latency and error generator")
+    parser.add_argument("--engine", dest="engines", action="append",
+                        help="report only this engine (module name); may be repeated")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed wall-time increase over the baseline before failing")
+    parser.add_argument("--verbose", action="store_true", help="show engine log output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    report = run_benchmark(args)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        settings = {key: value for key, value in report["benchmark"].items() if key != "started_at"}
+        if any(baseline.get("benchmark", {}).get(key) != value for key, value in settings.items()):
+            print("WARNING baseline was recorded with different settings; timings may not be comparable",
+                  file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# Make this directory a Python package
+from .run_checkpoint import RunCheckpoint
+from .refresh_planner import RefreshPlanner
+from .shard_checkpoint import ShardCheckpoint
+from .page_checkpoint import PageCheckpoint
+
+__all__ = ['RunCheckpoint', 'RefreshPlanner', 'ShardCheckpoint', 'PageCheckpoint']
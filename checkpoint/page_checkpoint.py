@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .run_checkpoint import application_path
+
+
+class PageCheckpoint:
+    """Records which archived pages a re-parse job has written, so a stopped job resumes
+    
+    Pages are marked done only after their rows were written, in the same
+    flush, so a resumed job re-parses at most the pages of one unfinished flush.
+    """
+    
+    def __init__(self, logger, job_name, state_dir=None):
+        self.logger = logger
+        self.state_dir = state_dir or os.path.join(application_path, 'state')
+        if not os.path.exists(self.state_dir):
+            os.makedirs(self.state_dir)
+        self.db_path = os.path.join(self.state_dir, f'{job_name}.sqlite')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS done_pages (
+                    page TEXT PRIMARY KEY,
+                    rows INTEGER NOT NULL,
+                    done_at TEXT NOT NULL
+                )
+            """)
+    
+    def done_pages(self):
+        """Return the set of pages written by earlier runs of the job"""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT page FROM done_pages")}
+    
+    def mark_done(self, rows_by_page):
+        """Mark the pages of a written flush done, given {page: rows written}"""
+        done_at = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO done_pages (page, rows, done_at) VALUES (?, ?, ?)",
+                [(page, rows, done_at) for page, rows in rows_by_page.items()]
+            )
+        return len(rows_by_page)
+    
+    def reset(self):
+        """Forget every page, so the next run re-parses the whole archive"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM done_pages")
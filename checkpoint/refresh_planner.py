@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from .run_checkpoint import RunCheckpoint, application_path
+
+# Weight of the latest observation in the exponentially weighted change rate
+CHANGE_RATE_ALPHA = 0.3
+# Stable symbols are still refreshed at least this often
+MAX_REFRESH_INTERVAL_DAYS = 7
+# A symbol becomes due slightly early so daily runs do not drift past it
+DUE_SLACK = timedelta(hours=2)
+
+
+class RefreshPlanner:
+    """Plans which symbols to refresh from their observed change frequency
+    
+    Each symbol keeps an exponentially weighted rate of how often its values
+    changed between fetches. Frequently changing symbols are due every run,
+    stable ones up to every MAX_REFRESH_INTERVAL_DAYS days. Symbols that are not
+    refreshed keep their last scraped row so the stored table stays complete.
+    """
+    
+    def __init__(self, logger, module_name, state_dir=None):
+        self.logger = logger
+        self.state_dir = state_dir or os.path.join(application_path, 'state')
+        if not os.path.exists(self.state_dir):
+            os.makedirs(self.state_dir)
+        self.db_path = os.path.join(self.state_dir, f'{module_name}_refresh.sqlite')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS symbol_refresh (
+                    symbol TEXT PRIMARY KEY,
+                    observations INTEGER NOT NULL,
+                    change_rate REAL NOT NULL,
+                    last_fetched TEXT NOT NULL,
+                    last_values TEXT NOT NULL,
+                    last_row TEXT NOT NULL
+                )
+            """)
+    
+    @staticmethod
+    def refresh_interval(change_rate):
+        """Return the refresh interval for a symbol with the given change rate"""
+        if change_rate <= 1.0 / MAX_REFRESH_INTERVAL_DAYS:
+            return timedelta(days=MAX_REFRESH_INTERVAL_DAYS)
+        return timedelta(days=max(1, round(1.0 / change_rate)))
+    
+    def _states(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT symbol, change_rate, last_fetched FROM symbol_refresh"
+            ).fetchall()
+        return {symbol: (rate, datetime.fromisoformat(fetched)) for symbol, rate, fetched in rows}
+    
+    def plan(self, symbols, budget=None):
+        """Return the symbols due for a refresh, most urgent first
+        
+        The budget caps only the symbols seen before. Symbols without a stored
+        row are always fetched on top of it, since nothing could stand in for them.
+        """
+        now = datetime.now()
+        states = self._states()
+        unseen = []
+        scored = []
+        for symbol in symbols:
+            if symbol not in states:
+                unseen.append(symbol)
+                continue
+            rate, last_fetched = states[symbol]
+            interval = self.refresh_interval(rate)
+            age = now - last_fetched
+            if age + DUE_SLACK >= interval:
+                # Overdue symbols and frequent changers rise to the top
+                scored.append((rate * (age / interval), symbol))
+        
+        scored.sort(key=lambda item: item[0], reverse=True)
+        due = [symbol for _, symbol in scored]
+        planned = unseen + (due[:budget] if budget else due)
+        self.logger.info(
+            f"Refresh plan: {len(planned)} of {len(symbols)} symbols due"
+            + (f" ({len(unseen)} never fetched)" if unseen else "")
+            + (f", {len(unseen) + len(due) - len(planned)} deferred by the request budget"
+               if len(unseen) + len(due) > len(planned) else "")
+        )
+        return planned
+    
+    def observe(self, symbol, row, values):
+        """Record a fresh row for a symbol and update its change rate
+        
+        Args:
+            symbol (str): Symbol the row belongs to
+            row (tuple): Complete row as it is written to the database
+            values (tuple): Subset of the row compared between fetches
+        """
+        values_payload = RunCheckpoint._encode(values)
+        row_payload = RunCheckpoint._encode(row)
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT observations, change_rate, last_values FROM symbol_refresh WHERE symbol = ?", (symbol,)
+            ).fetchone()
+            if existing is None:
+                self._conn.execute(
+                    "INSERT INTO symbol_refresh VALUES (?, ?, ?, ?, ?, ?)",
+                    (symbol, 1, 1.0, now, values_payload, row_payload)
+                )
+                return
+            observations, rate, last_values = existing
+            changed = 1.0 if last_values != values_payload else 0.0
+            rate = CHANGE_RATE_ALPHA * changed + (1 - CHANGE_RATE_ALPHA) * rate
+            self._conn.execute(
+                """UPDATE symbol_refresh SET observations = ?, change_rate = ?, last_fetched = ?,
+                   last_values = ?, last_row = ? WHERE symbol = ?""",
+                (observations + 1, rate, now, values_payload, row_payload, symbol)
+            )
+    
+    def last_rows(self, symbols):
+        """Return the last known rows of the given symbols"""
+        wanted = set(symbols)
+        with self._lock:
+            rows = self._conn.execute("SELECT symbol, last_row FROM symbol_refresh").fetchall()
+        return [RunCheckpoint._decode(row) for symbol, row in rows if symbol in wanted]
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+# Get application path for executable support
+if getattr(sys, 'frozen', False):
+    # If the application is run as a bundle
+    application_path = os.path.dirname(sys.executable)
+else:
+    # If run as a normal Python script
+    application_path = os.path.dirname(os.path.abspath(__file__))
+
+
+class RunCheckpoint:
+    """Tracks per-symbol progress of an engine run in a local SQLite state store
+
+    Every symbol of a run is recorded as pending, succeeded or failed. Succeeded
+    symbols keep their scraped row so a resumed or retried run can merge new
+    results into the same logical run before writing to the database.
+    """
+
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, logger, module_name, state_dir=None):
+        self.logger = logger
+        self.module_name = module_name
+        self.state_dir = state_dir or os.path.join(application_path, 'state')
+        if not os.path.exists(self.state_dir):
+            os.makedirs(self.state_dir)
+        self.db_path = os.path.join(self.state_dir, f'{module_name}.sqlite')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the state tables if they do not exist yet"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    started_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    mode TEXT NOT NULL DEFAULT 'full'
+                )
+            """)
+            # State stores created before run modes were recorded lack the column
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(runs)")]
+            if 'mode' not in columns:
+                self._conn.execute("ALTER TABLE runs ADD COLUMN mode TEXT NOT NULL DEFAULT 'full'")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_items (
+                    run_id TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (run_id, symbol)
+                )
+            """)
+
+    def start_run(self, symbols, mode="full"):
+        """Register a new run with every symbol pending and return its run id"""
+        run_id = datetime.now().strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, updated_at, status, mode) VALUES (?, ?, ?, ?, ?)",
+                (run_id, now, now, "running", mode)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO run_items (run_id, symbol, status, updated_at) VALUES (?, ?, ?, ?)",
+                [(run_id, symbol, self.PENDING, now) for symbol in symbols]
+            )
+        self.logger.info(f"Checkpoint run {run_id} started with {len(symbols)} symbols")
+        return run_id
+
+    def latest_run(self):
+        """Return the id of the most recently started run, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def run_mode(self, run_id):
+        """Return the mode a run was started in"""
+        with self._lock:
+            row = self._conn.execute("SELECT mode FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def symbols_with_status(self, run_id, *statuses):
+        """Return the symbols of a run that currently have one of the given statuses"""
+        placeholders = ', '.join('?' for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT symbol FROM run_items WHERE run_id = ? AND status IN ({placeholders}) ORDER BY symbol",
+                (run_id, *statuses)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_succeeded(self, run_id, symbol, result):
+        """Record a successfully scraped symbol together with its result row"""
+        self._update_item(run_id, symbol, self.SUCCEEDED, result=self._encode(result))
+
+    def mark_failed(self, run_id, symbol, error=None):
+        """Record a symbol whose scrape failed"""
+        self._update_item(run_id, symbol, self.FAILED, error=error)
+
+    def _update_item(self, run_id, symbol, status, result=None, error=None):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """UPDATE run_items SET status = ?, attempts = attempts + 1, result = ?, error = ?, updated_at = ?
+                   WHERE run_id = ? AND symbol = ?""",
+                (status, result, error, now, run_id, symbol)
+            )
+            self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def results(self, run_id):
+        """Return the result rows of every succeeded symbol of a run"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM run_items WHERE run_id = ? AND status = ? ORDER BY symbol",
+                (run_id, self.SUCCEEDED)
+            ).fetchall()
+        return [self._decode(row[0]) for row in rows]
+
+    def counts(self, run_id):
+        """Return a dict of symbol counts per status for a run"""
+        counts = {self.PENDING: 0, self.SUCCEEDED: 0, self.FAILED: 0}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM run_items WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        counts.update(dict(rows))
+        return counts
+
+    def finish_run(self, run_id):
+        """Mark a run complete, or incomplete if symbols are still pending or failed"""
+        counts = self.counts(run_id)
+        status = "complete" if counts[self.PENDING] == 0 and counts[self.FAILED] == 0 else "incomplete"
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, datetime.now().isoformat(), run_id)
+            )
+        self.logger.info(
+            f"Checkpoint run {run_id} {status}: {counts[self.SUCCEEDED]} succeeded, "
+            f"{counts[self.FAILED]} failed, {counts[self.PENDING]} pending"
+        )
+        return status
+
+    @staticmethod
+    def _encode(result):
+        """Serialise a result tuple to JSON, keeping datetimes intact"""
+        return json.dumps([
+            {"__datetime__": value.isoformat()} if isinstance(value, datetime) else value
+            for value in result
+        ])
+
+    @staticmethod
+    def _decode(payload):
+        """Rebuild a result tuple serialised by _encode"""
+        return tuple(
+            datetime.fromisoformat(value["__datetime__"]) if isinstance(value, dict) and "__datetime__" in value else value
+            for value in json.loads(payload)
+        )
@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from .run_checkpoint import application_path
+
+
+class ShardCheckpoint:
+    """Records which calendar days of a date-ranged backfill are already loaded
+    
+    A day is marked complete only after the rows of its shard were committed,
+    including days without data (weekends, holidays), so re-running a range
+    fetches only the gaps. Shards that came back empty although they have
+    trading days are counted in empty_days until the engine trusts them.
+    """
+    
+    def __init__(self, logger, module_name, state_dir=None):
+        self.logger = logger
+        self.state_dir = state_dir or os.path.join(application_path, 'state')
+        if not os.path.exists(self.state_dir):
+            os.makedirs(self.state_dir)
+        self.db_path = os.path.join(self.state_dir, f'{module_name}_shards.sqlite')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS completed_days (
+                    day TEXT PRIMARY KEY,
+                    rows INTEGER NOT NULL,
+                    completed_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS empty_days (
+                    day TEXT PRIMARY KEY,
+                    attempts INTEGER NOT NULL,
+                    last_attempt_at TEXT NOT NULL
+                )
+            """)
+    
+    def missing_days(self, start, end):
+        """Return the days from start to end (inclusive) that are not complete yet"""
+        with self._lock:
+            done = {
+                row[0] for row in self._conn.execute(
+                    "SELECT day FROM completed_days WHERE day BETWEEN ? AND ?",
+                    (start.isoformat(), end.isoformat())
+                )
+            }
+        days = []
+        day = start
+        while day <= end:
+            if day.isoformat() not in done:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+    
+    def mark_completed(self, start, end, rows_by_day):
+        """Mark the days of a committed shard complete; days from today on stay open"""
+        today = date.today()
+        completed_at = datetime.now().isoformat()
+        records = []
+        day = start
+        while day <= end and day < today:
+            records.append((day.isoformat(), rows_by_day.get(day, 0), completed_at))
+            day += timedelta(days=1)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO completed_days (day, rows, completed_at) VALUES (?, ?, ?)", records
+            )
+        return len(records)
+    
+    def mark_empty(self, start, end):
+        """Count one more empty response for the days of a shard; returns the fewest attempts of its days"""
+        attempted_at = datetime.now().isoformat()
+        days = []
+        day = start
+        while day <= end:
+            days.append(day.isoformat())
+            day += timedelta(days=1)
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO empty_days (day, attempts, last_attempt_at) VALUES (?, 1, ?)
+                ON CONFLICT(day) DO UPDATE SET attempts = attempts + 1, last_attempt_at = excluded.last_attempt_at
+            """, [(day, attempted_at) for day in days])
+            return self._conn.execute(
+                f"SELECT MIN(attempts) FROM empty_days WHERE day IN ({', '.join('?' * len(days))})", days
+            ).fetchone()[0]
+    
+    @staticmethod
+    def shards(days, shard_days):
+        """Group days into (start, end) shards of at most shard_days consecutive calendar days"""
+        shards = []
+        for day in sorted(days):
+            if shards:
+                start, end = shards[-1]
+                if day == end + timedelta(days=1) and (day - start).days < shard_days:
+                    shards[-1] = (start, day)
+                    continue
+            shards.append((day, day))
+        return shards
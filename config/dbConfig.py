@@ -1,9 +1,15 @@
 import pyodbc
 import os
+import re
+import json
+import time
+from datetime import datetime
 from tkinter import messagebox
 import pyodbc
 from bs4 import BeautifulSoup
 
+from metrics.instruments import DB_CONNECT_SECONDS, DB_INSERT_SECONDS, DB_COMMIT_SECONDS, DB_ROWS_WRITTEN
+
 
 class DatabaseManager:
     """Handles database connections and operations"""
@@ -45,10 +51,12 @@ class DatabaseManager:
             conn = None
             conn_err = None
             
+            connect_started = time.perf_counter()
             for driver in drivers:
                 try:
                     conn_str = f"DRIVER={driver};SERVER={db_server};DATABASE={db_name};UID={db_username};PWD={db_password}"
                     conn = pyodbc.connect(conn_str)
+                    DB_CONNECT_SECONDS.observe(time.perf_counter() - connect_started)
                     self.logger.info(f"Connected using {driver}")
                     break
                 except pyodbc.Error as e:
@@ -147,30 +155,58 @@ class DatabaseManager:
             self.logger.error(f"Error fetching company list: {str(e)}")
             return []
         
-    def store_data(self, company_shares, insert_query, table_name=None):
+    def begin_transaction(self, conn):
+        """Switch a connection to manual commit for a delete-and-insert transaction"""
+        conn.autocommit = False
+    
+    def prepare_bulk_cursor(self, cursor):
+        """Send executemany parameters to SQL Server in bulk instead of one round trip per row"""
+        cursor.fast_executemany = True
+    
+    @staticmethod
+    def _table_from_query(query):
+        """Return the target table of an INSERT statement, for labelling metrics"""
+        match = re.search(r"INSERT\s+INTO\s+([\w.\[\]]+)", query or "", re.IGNORECASE)
+        return match.group(1) if match else "unknown"
+    
+    def store_data(self, company_shares, insert_query, table_name=None, replace_range=None, connection=None):
         """Store scraped data in the database with proper transaction management
         
         This function implements proper ACID transaction handling:
-        1. Deletes all existing records from the target table
+        1. Deletes all existing records from the target table, or only those
+           whose replace_range=(column, first, last) column lies in that range
         2. Inserts new data
         3. Ensures both operations succeed or fail together (atomicity)
+        
+        A connection from prepare_connection is used and left open, for callers
+        writing many batches; otherwise one is opened and closed for the call.
+        Returns the number of rows committed.
         """
         if not company_shares:
             self.logger.warning("No data to store")
-            return
+            return 0
         
         conn = None
+        cursor = None
+        table_label = table_name or self._table_from_query(insert_query)
         try:
-            conn = self.get_connection()
+            conn = connection or self.get_connection()
             if not conn:
-                return
+                return 0
                 
             # Disable auto-commit to manage our own transaction
-            conn.autocommit = False
+            self.begin_transaction(conn)
             cursor = conn.cursor()
+            self.prepare_bulk_cursor(cursor)
             
             # Start transaction
-            if table_name:
+            write_started = time.perf_counter()
+            if table_name and replace_range:
+                # Delete only the records the new data replaces
+                column, first, last = replace_range
+                self.logger.info(f"Deleting existing records from {table_name} with {column} from {first} to {last}")
+                cursor.execute(f"DELETE FROM {table_name} WHERE {column} BETWEEN ? AND ?", (first, last))
+            elif table_name:
                 # Delete existing records first
                 delete_query = f"DELETE FROM {table_name}"
                 self.logger.info(f"Deleting existing records from {table_name}")
@@ -179,10 +215,15 @@ class DatabaseManager:
             # Insert new data
             self.logger.info(f"Inserting {len(company_shares)} new records")
             cursor.executemany(insert_query, company_shares)
+            DB_INSERT_SECONDS.labels(table_label).observe(time.perf_counter() - write_started)
             
             # Commit the transaction (both delete and insert)
+            commit_started = time.perf_counter()
             conn.commit()
+            DB_COMMIT_SECONDS.labels(table_label).observe(time.perf_counter() - commit_started)
+            DB_ROWS_WRITTEN.labels(table_label).inc(len(company_shares))
             self.logger.info(f"Transaction committed successfully: {len(company_shares)} records stored")
+            return len(company_shares)
             
         except Exception as e:
             # Rollback transaction on error
@@ -191,33 +232,292 @@ class DatabaseManager:
             self.logger.error(f"Transaction failed and rolled back: {str(e)}")
             raise
         finally:
-            # Ensure resources are closed properly
+            # Ensure resources are closed properly; a caller's connection stays open
             if conn:
                 try:
                     if cursor:
                         cursor.close()
-                    conn.close()
+                    if conn is not connection:
+                        conn.close()
                 except Exception as close_error:
                     self.logger.error(f"Error closing database connection: {str(close_error)}")
 
-    def store_mds_data(self,insert_query):
-        """Store scraped data in the database"""
+    def ensure_run_ledger_table(self, cursor):
+        """Create the scrape_runs ledger table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('scrape_runs', 'U') IS NULL
+            CREATE TABLE scrape_runs (
+                run_id VARCHAR(64) NOT NULL PRIMARY KEY,
+                module VARCHAR(64) NOT NULL,
+                run_mode VARCHAR(32) NULL,
+                outcome VARCHAR(16) NULL,
+                started_at DATETIME2 NOT NULL,
+                finished_at DATETIME2 NOT NULL,
+                rows_fetched INT NOT NULL,
+                rows_parsed INT NOT NULL,
+                rows_written INT NOT NULL,
+                failures INT NOT NULL,
+                skipped_unchanged INT NOT NULL,
+                fetch_seconds FLOAT NOT NULL,
+                parse_seconds FLOAT NOT NULL,
+                write_seconds FLOAT NOT NULL
+            )
+        """)
+    
+    def record_run(self, run_stats):
+        """Append one row describing a finished engine run to the scrape_runs ledger"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            if not conn:
+                return
+            cursor = conn.cursor()
+            self.ensure_run_ledger_table(cursor)
+            cursor.execute("""
+                INSERT INTO scrape_runs
+                (run_id, module, run_mode, outcome, started_at, finished_at, rows_fetched, rows_parsed,
+                 rows_written, failures, skipped_unchanged, fetch_seconds, parse_seconds, write_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, run_stats.as_row())
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            # The ledger is diagnostic; never fail a run because of it
+            self.logger.error(f"Error recording run in scrape_runs: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+    
+    def ensure_day_end_archive_table(self, cursor):
+        """Create the day_end_archive table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('day_end_archive', 'U') IS NULL
+            CREATE TABLE day_end_archive (
+                trade_date DATE NOT NULL,
+                trading_code VARCHAR(32) NOT NULL,
+                ltp FLOAT NULL,
+                high FLOAT NULL,
+                low FLOAT NULL,
+                openp FLOAT NULL,
+                closep FLOAT NULL,
+                ycp FLOAT NULL,
+                trade INT NULL,
+                value_mn FLOAT NULL,
+                volume BIGINT NULL,
+                scraped_at DATETIME2 NOT NULL,
+                CONSTRAINT PK_day_end_archive PRIMARY KEY (trade_date, trading_code)
+            )
+        """)
+    
+    def ensure_company_fundamentals_table(self, cursor):
+        """Create the Company_Fundamentals table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('Company_Fundamentals', 'U') IS NULL
+            CREATE TABLE Company_Fundamentals (
+                company VARCHAR(32) NOT NULL PRIMARY KEY,
+                authorized_capital FLOAT NULL,
+                paid_up_capital FLOAT NULL,
+                face_value FLOAT NULL,
+                market_lot INT NULL,
+                market_cap FLOAT NULL,
+                listing_year INT NULL,
+                market_category VARCHAR(8) NULL,
+                sector NVARCHAR(255) NULL,
+                scraped_at DATETIME2 NOT NULL
+            )
+        """)
+    
+    def ensure_company_financials_table(self, cursor):
+        """Create the Company_Financials table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('Company_Financials', 'U') IS NULL
+            CREATE TABLE Company_Financials (
+                company VARCHAR(32) NOT NULL PRIMARY KEY,
+                year_end VARCHAR(32) NULL,
+                eps FLOAT NULL,
+                nav_per_share FLOAT NULL,
+                cash_dividend NVARCHAR(255) NULL,
+                stock_dividend NVARCHAR(255) NULL,
+                last_agm VARCHAR(32) NULL,
+                scraped_at DATETIME2 NOT NULL
+            )
+        """)
+    
+    def ensure_sector_summary_table(self, cursor):
+        """Create the Sector_Summary table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('Sector_Summary', 'U') IS NULL
+            CREATE TABLE Sector_Summary (
+                sector_code VARCHAR(32) NOT NULL PRIMARY KEY,
+                sector_name NVARCHAR(255) NULL,
+                company_count INT NOT NULL,
+                priced_count INT NOT NULL,
+                market_cap FLOAT NULL,
+                pe_median FLOAT NULL,
+                pe_weighted FLOAT NULL,
+                sponsor FLOAT NULL,
+                govt FLOAT NULL,
+                institute FLOAT NULL,
+                foreign_share FLOAT NULL,
+                public_share FLOAT NULL,
+                computed_at DATETIME2 NOT NULL
+            )
+        """)
+    
+    def prepare_table(self, ensure_table):
+        """Run one of the ensure_*_table methods in its own transaction
         
+        Returns:
+            bool: True if the table exists afterwards
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            if not conn:
+                return False
+            cursor = conn.cursor()
+            ensure_table(cursor)
+            conn.commit()
+            cursor.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error creating table: {str(e)}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+    
+    def prepare_connection(self, ensure_table):
+        """Open a connection for repeated writes, running one of the ensure_*_table methods on it first
+        
+        Returns:
+            The connection, or None if it could not be opened or the table not created;
+            the caller closes it
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            if not conn:
+                return None
+            cursor = conn.cursor()
+            ensure_table(cursor)
+            conn.commit()
+            cursor.close()
+            return conn
+        except Exception as e:
+            self.logger.error(f"Error creating table: {str(e)}")
+            if conn:
+                conn.close()
+            return None
+    
+    def ensure_change_log_table(self, cursor):
+        """Create the change_log table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('change_log', 'U') IS NULL
+            CREATE TABLE change_log (
+                seq BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+                run_id VARCHAR(64) NOT NULL,
+                module VARCHAR(64) NOT NULL,
+                dataset VARCHAR(32) NOT NULL,
+                change_type VARCHAR(32) NOT NULL,
+                change_key VARCHAR(64) NOT NULL,
+                field VARCHAR(64) NULL,
+                old_value NVARCHAR(255) NULL,
+                new_value NVARCHAR(255) NULL,
+                detected_at DATETIME2 NOT NULL
+            )
+        """)
+    
+    def record_changes(self, events):
+        """Append change events to the change_log table; consumers read rows with seq above their last one"""
+        conn = None
         try:
             conn = self.get_connection()
             if not conn:
                 return
-                
             cursor = conn.cursor()
-            
-            # Insert data into Symbol_Share table
-           
-            cursor.executemany(insert_query)
+            self.ensure_change_log_table(cursor)
+            cursor.executemany("""
+                INSERT INTO change_log
+                (run_id, module, dataset, change_type, change_key, field, old_value, new_value, detected_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    event["run_id"], event["module"], event["dataset"], event["change"], event["key"],
+                    event["field"],
+                    None if event["old"] is None else str(event["old"]),
+                    None if event["new"] is None else str(event["new"]),
+                    event["detected_at"]
+                )
+                for event in events
+            ])
             conn.commit()
-            
-            self.logger.info(f"Successfully stored mds data")
-            
             cursor.close()
-            conn.close()
         except Exception as e:
-            self.logger.error(f"Error storing data: {str(e)}")
+            # The JSON Lines change log still has the events
+            self.logger.error(f"Error recording changes in change_log: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+    
+    def ensure_quarantine_table(self, cursor):
+        """Create the quarantine_rows table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('quarantine_rows', 'U') IS NULL
+            CREATE TABLE quarantine_rows (
+                id BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+                run_id VARCHAR(64) NOT NULL,
+                module VARCHAR(64) NOT NULL,
+                table_name VARCHAR(64) NOT NULL,
+                reason NVARCHAR(255) NOT NULL,
+                row_data NVARCHAR(MAX) NOT NULL,
+                quarantined_at DATETIME2 NOT NULL
+            )
+        """)
+    
+    def record_quarantine(self, run_stats, table_name, rejected):
+        """Store rows that failed validation with the reasons, as JSON arrays in INSERT column order"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            if not conn:
+                return
+            cursor = conn.cursor()
+            self.ensure_quarantine_table(cursor)
+            quarantined_at = datetime.now()
+            cursor.executemany("""
+                INSERT INTO quarantine_rows (run_id, module, table_name, reason, row_data, quarantined_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (run_stats.run_id, run_stats.module, table_name, reason, json.dumps(list(row), default=str), quarantined_at)
+                for row, reason in rejected
+            ])
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            self.logger.error(f"Error recording rejected rows in quarantine_rows: {str(e)}")
+        finally:
+            if conn:
+                conn.close()
+    
+    def ensure_market_depth_table(self, cursor):
+        """Create the market_depth table if it does not exist yet"""
+        cursor.execute("""
+            IF OBJECT_ID('market_depth', 'U') IS NULL
+            CREATE TABLE market_depth (
+                trading_code VARCHAR(32) NOT NULL,
+                side CHAR(1) NOT NULL,
+                level SMALLINT NOT NULL,
+                price FLOAT NOT NULL,
+                volume BIGINT NOT NULL,
+                tick_time DATETIME2 NOT NULL,
+                CONSTRAINT PK_market_depth PRIMARY KEY (trading_code, tick_time, side, level)
+            )
+        """)
+    
+    def store_mds_data(self, rows, insert_query):
+        """Append market depth rows in one transaction; earlier ticks are kept
+        
+        Returns the number of rows committed.
+        """
+        return self.store_data(rows, insert_query)
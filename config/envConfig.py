@@ -11,9 +11,6 @@ else:
     # If run as a normal Python script
     application_path = os.path.dirname(os.path.abspath(__file__))
 
-# Set the working directory to the application path
-os.chdir(application_path)
-
 
 class EnvConfig:
     """Handles environment configuration"""
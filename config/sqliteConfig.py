@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import time
+from datetime import date, datetime
+
+from config.dbConfig import DatabaseManager
+from metrics.instruments import DB_CONNECT_SECONDS
+
+# Store dates and datetimes as ISO text; the implicit adapter is deprecated since Python 3.12
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+# Tables written by the engines, with the columns their INSERT statements use
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS Company_Information (
+        company_symbol TEXT, company_name TEXT, isActive INTEGER, last_updated TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS Sector_Information (
+        sector_code TEXT, sector_name TEXT, isActive INTEGER, last_updated TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS Sector_Symbol (
+        sector_code TEXT, company TEXT, last_updated TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS Symbol_Share (
+        company TEXT, total_share INTEGER, Sponsor REAL, Govt REAL, Institute REAL,
+        Foreign_share REAL, public_share REAL, scraping_date TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS pe_data (
+        SL TEXT, Trade_Price TEXT, Close_Price REAL, YCP REAL, PE_1_Basic REAL, PE_2_Diluted REAL,
+        PE_3_Basic REAL, PE_4_Diluted REAL, PE_5 REAL, PE_6 REAL, DateTime TEXT
+    )""",
+)
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """DatabaseManager backed by a local SQLite file
+    
+    Used by the benchmark suite and for offline runs; it creates the engine
+    tables on first connection and needs no ODBC driver or .env settings.
+    """
+    
+    def __init__(self, logger, db_path):
+        super().__init__(logger)
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        conn = self.get_connection()
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+    
+    def get_connection(self):
+        """Open a connection to the SQLite file"""
+        try:
+            started = time.perf_counter()
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            DB_CONNECT_SECONDS.observe(time.perf_counter() - started)
+            return conn
+        except sqlite3.Error as e:
+            self.logger.error(f"Database connection error: {str(e)}")
+            return None
+    
+    def begin_transaction(self, conn):
+        # sqlite3 opens a transaction implicitly before the first write
+        pass
+    
+    def prepare_bulk_cursor(self, cursor):
+        # sqlite3 cursors have no bulk parameter mode
+        pass
+    
+    def ensure_run_ledger_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_runs (
+                run_id TEXT PRIMARY KEY, module TEXT NOT NULL, run_mode TEXT, outcome TEXT,
+                started_at TEXT NOT NULL, finished_at TEXT NOT NULL,
+                rows_fetched INTEGER NOT NULL, rows_parsed INTEGER NOT NULL, rows_written INTEGER NOT NULL,
+                failures INTEGER NOT NULL, skipped_unchanged INTEGER NOT NULL,
+                fetch_seconds REAL NOT NULL, parse_seconds REAL NOT NULL, write_seconds REAL NOT NULL
+            )
+        """)
+    
+    def ensure_change_log_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, module TEXT NOT NULL,
+                dataset TEXT NOT NULL, change_type TEXT NOT NULL, change_key TEXT NOT NULL, field TEXT,
+                old_value TEXT, new_value TEXT, detected_at TEXT NOT NULL
+            )
+        """)
+    
+    def ensure_day_end_archive_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS day_end_archive (
+                trade_date TEXT NOT NULL, trading_code TEXT NOT NULL, ltp REAL, high REAL, low REAL,
+                openp REAL, closep REAL, ycp REAL, trade INTEGER, value_mn REAL, volume INTEGER,
+                scraped_at TEXT NOT NULL, PRIMARY KEY (trade_date, trading_code)
+            )
+        """)
+    
+    def ensure_company_fundamentals_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Company_Fundamentals (
+                company TEXT PRIMARY KEY, authorized_capital REAL, paid_up_capital REAL, face_value REAL,
+                market_lot INTEGER, market_cap REAL, listing_year INTEGER, market_category TEXT, sector TEXT,
+                scraped_at TEXT NOT NULL
+            )
+        """)
+    
+    def ensure_company_financials_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Company_Financials (
+                company TEXT PRIMARY KEY, year_end TEXT, eps REAL, nav_per_share REAL, cash_dividend TEXT,
+                stock_dividend TEXT, last_agm TEXT, scraped_at TEXT NOT NULL
+            )
+        """)
+    
+    def ensure_sector_summary_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Sector_Summary (
+                sector_code TEXT PRIMARY KEY, sector_name TEXT, company_count INTEGER NOT NULL,
+                priced_count INTEGER NOT NULL, market_cap REAL, pe_median REAL, pe_weighted REAL,
+                sponsor REAL, govt REAL, institute REAL, foreign_share REAL, public_share REAL,
+                computed_at TEXT NOT NULL
+            )
+        """)
+    
+    def ensure_quarantine_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quarantine_rows (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, module TEXT NOT NULL,
+                table_name TEXT NOT NULL, reason TEXT NOT NULL, row_data TEXT NOT NULL, quarantined_at TEXT NOT NULL
+            )
+        """)
+    
+    def ensure_market_depth_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS market_depth (
+                trading_code TEXT NOT NULL, side TEXT NOT NULL, level INTEGER NOT NULL, price REAL NOT NULL,
+                volume INTEGER NOT NULL, tick_time TEXT NOT NULL, PRIMARY KEY (trading_code, tick_time, side, level)
+            )
+        """)
@@ -0,0 +1,4 @@
+# Make this directory a Python package
+from .app_context import AppContext
+
+__all__ = ['AppContext']
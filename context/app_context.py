@@ -0,0 +1,71 @@
+import threading
+
+from config.dbConfig import DatabaseManager
+from fetcher.http_client import HttpClient
+from fetcher.rate_limiter import DSE_RATE_LIMITER
+from fetcher.single_flight import DSE_SINGLE_FLIGHT
+from metrics.registry import REGISTRY
+from snapshot.snapshot_store import SNAPSHOTS
+from snapshot.change_log import CHANGE_LOG
+
+
+class AppContext:
+    """Resources shared by every tab and engine of the application
+    
+    The application creates one context and hands it to each tab, which passes
+    it on to its engine. The .env file is loaded once, all engines download
+    through one set of keep-alive connections, and they share the rate limiter,
+    request coalescing, snapshot store, change log and metrics registry.
+    """
+    
+    _default = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, db_manager_class=DatabaseManager, http_client=None):
+        """
+        Args:
+            db_manager_class: Storage backend class, created with a module's logger
+            http_client (HttpClient): Client whose connections all engines share
+        """
+        self.db_manager_class = db_manager_class
+        self.http_client = http_client or HttpClient()
+        self.rate_limiter = DSE_RATE_LIMITER
+        self.single_flight = DSE_SINGLE_FLIGHT
+        self.snapshots = SNAPSHOTS
+        self.change_log = CHANGE_LOG
+        self.metrics = REGISTRY
+        self._lock = threading.Lock()
+        self._env_config = None
+        self._db_managers = {}
+    
+    @classmethod
+    def default(cls):
+        """Return the process-wide context used by engines created without one"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+    
+    @property
+    def env_config(self):
+        """EnvConfig of the application; .env is read on first use only"""
+        with self._lock:
+            if self._env_config is None:
+                # Imported here so engines that never touch .env do not set up the main logger
+                from config.envConfig import EnvConfig
+                from log.scraper_log import LoggerSetup
+                self._env_config = EnvConfig(LoggerSetup.setup_file_logger("main"))
+            return self._env_config
+    
+    def db_manager(self, logger):
+        """Return the storage backend bound to a module's logger, creating it once per module"""
+        name = getattr(logger, 'name', 'main')
+        with self._lock:
+            manager = self._db_managers.get(name)
+            if manager is None:
+                manager = self._db_managers[name] = self.db_manager_class(logger)
+            return manager
+    
+    def scraper_http_client(self):
+        """Return an HTTP client for one engine: shared connections, separate latency record"""
+        return self.http_client.scoped()
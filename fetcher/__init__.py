@@ -0,0 +1,7 @@
+# Make this directory a Python package
+from .http_client import HttpClient, HttpResponse, RequestCancelled, dse_url
+from .rate_limiter import RateLimiter, DSE_RATE_LIMITER
+from .single_flight import SingleFlight, DSE_SINGLE_FLIGHT
+from .page_archive import PageArchive
+
+__all__ = ['HttpClient', 'HttpResponse', 'RequestCancelled', 'dse_url', 'RateLimiter', 'DSE_RATE_LIMITER', 'SingleFlight', 'DSE_SINGLE_FLIGHT', 'PageArchive']
@@ -0,0 +1,2 @@
+class RequestCancelled(Exception):
+    """Raised when an in-flight request is aborted by a cancellation event"""
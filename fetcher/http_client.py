@@ -0,0 +1,262 @@
+import os
+import threading
+import time
+import concurrent.futures
+import requests
+
+from .errors import RequestCancelled
+from .latency import LatencyTracker
+from .rate_limiter import DSE_RATE_LIMITER
+from .single_flight import DSE_SINGLE_FLIGHT
+from metrics.instruments import (
+    HTTP_REQUEST_SECONDS, HTTP_RESPONSE_BYTES, HTTP_REQUEST_ERRORS, HTTP_IN_FLIGHT, HTTP_HEDGES, page_label
+)
+
+# Browser user agent sent with every request to dsebd.org
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Site root; DSE_BASE_URL points the scrapers at a mirror or the local benchmark server
+DEFAULT_BASE_URL = "https://www.dsebd.org"
+
+# Size of the chunks a body is read in; cancellation is checked between chunks
+CHUNK_SIZE = 16 * 1024
+
+
+# Hedging defaults: threshold percentile, fraction of requests that may be hedged,
+# and the number of samples needed before the threshold is trusted
+HEDGE_PERCENTILE = 95
+HEDGE_BUDGET = 0.05
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.5
+
+
+def dse_url(path):
+    """Return the absolute URL of a DSE page, e.g. dse_url("latest_PE.php")"""
+    return os.getenv("DSE_BASE_URL", DEFAULT_BASE_URL).rstrip('/') + '/' + path.lstrip('/')
+
+
+class HttpResponse:
+    """Fully downloaded response returned by HttpClient"""
+    
+    def __init__(self, url, status_code, content, encoding):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+    
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+    
+    def raise_for_status(self):
+        """Raise requests.HTTPError for 4xx/5xx responses, like requests does"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code} for url: {self.url}")
+
+
+class _AnyEvent:
+    """Event-like view that is set when any of the wrapped events is set"""
+    
+    def __init__(self, *events):
+        self.events = [event for event in events if event is not None]
+    
+    def is_set(self):
+        return any(event.is_set() for event in self.events)
+
+
+class HttpClient:
+    """Thread-safe HTTP client with keep-alive sessions and cancellable downloads"""
+    
+    def __init__(self, headers=None, hedge_budget=HEDGE_BUDGET, hedge_percentile=HEDGE_PERCENTILE, coalesce=True):
+        self.headers = headers or DEFAULT_HEADERS
+        # Share in-flight downloads and recent responses with other clients (see SingleFlight)
+        self.coalesce = coalesce
+        self.hedge_budget = hedge_budget
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker()
+        self._local = threading.local()
+        self._hedge_pool = None
+        self._hedge_pool_lock = threading.Lock()
+        # Client that owns the sessions and hedge pool; see scoped()
+        self._transport = self
+    
+    def scoped(self):
+        """Return a client that shares this client's sessions and hedge pool but records its own latency
+        
+        Every engine gets a scoped client of the application's client, so the
+        engines reuse one set of keep-alive connections while their latency
+        reports and hedging thresholds stay per engine.
+        """
+        client = HttpClient(self.headers, self.hedge_budget, self.hedge_percentile, self.coalesce)
+        client._transport = self._transport
+        return client
+    
+    def _session(self):
+        """Return the keep-alive session owned by the calling thread"""
+        local = self._transport._local
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            local.session = session
+        return session
+    
+    def _coalesce(self, url, fetch, cancel_event, kwargs):
+        """Run fetch through the process-wide single-flight layer unless the request has extra arguments"""
+        if kwargs or not self.coalesce:
+            return fetch()
+        led = []
+        
+        def lead():
+            led.append(True)
+            return fetch()
+        
+        started = time.perf_counter()
+        response = DSE_SINGLE_FLIGHT.fetch(url, lead, cancel_event)
+        if not led:
+            # Served by another caller's fetch or the memo; fetch() recorded nothing for this client
+            self.latency.record_request(time.perf_counter() - started)
+        return response
+    
+    def get(self, url, timeout=60, cancel_event=None, **kwargs):
+        """Download a URL and record its latency; concurrent requests for the same URL share one download"""
+        return self._coalesce(url, lambda: self._get(url, timeout, cancel_event, **kwargs), cancel_event, kwargs)
+    
+    def _get(self, url, timeout=60, cancel_event=None, **kwargs):
+        started = time.perf_counter()
+        response = self._fetch(url, timeout, cancel_event, **kwargs)
+        self.latency.record_request(time.perf_counter() - started)
+        return response
+    
+    def post(self, url, data=None, timeout=60, cancel_event=None):
+        """Send a form POST and download the response; POSTs are never shared with other callers"""
+        started = time.perf_counter()
+        response = self._fetch(url, timeout, cancel_event, method="POST", data=data)
+        self.latency.record_request(time.perf_counter() - started)
+        return response
+    
+    def _fetch(self, url, timeout=60, cancel_event=None, method="GET", **kwargs):
+        """Download a URL, aborting as soon as cancel_event is set
+        
+        Args:
+            url (str): URL to fetch
+            timeout: requests timeout (seconds or a (connect, read) tuple)
+            cancel_event (threading.Event): Optional event that aborts the download
+            method (str): HTTP method of the request
+            
+        Returns:
+            HttpResponse: Response with the complete body
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled(f"Request to {url} cancelled before it started")
+        if not DSE_RATE_LIMITER.acquire(cancel_event):
+            raise RequestCancelled(f"Request to {url} cancelled while waiting for the rate limit")
+        
+        page = page_label(url)
+        started = time.perf_counter()
+        with HTTP_IN_FLIGHT.labels().track_inprogress():
+            try:
+                response = self._session().request(method, url, timeout=timeout, stream=True, **kwargs)
+                try:
+                    chunks = []
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise RequestCancelled(f"Request to {url} cancelled")
+                        chunks.append(chunk)
+                finally:
+                    response.close()
+            except Exception:
+                HTTP_REQUEST_ERRORS.labels(page).inc()
+                raise
+        
+        elapsed = time.perf_counter() - started
+        content = b''.join(chunks)
+        self.latency.record_attempt(elapsed)
+        HTTP_REQUEST_SECONDS.labels(page).observe(elapsed)
+        HTTP_RESPONSE_BYTES.labels(page).inc(len(content))
+        return HttpResponse(response.url, response.status_code, content, response.encoding)
+    
+    def hedge_delay(self):
+        """Return how long to wait before hedging, or None if hedging is not allowed now
+        
+        The budget is only peeked at here; the hedge itself is reserved with
+        LatencyTracker.try_reserve_hedge when it is about to be sent.
+        """
+        if self.latency.window_size() < HEDGE_MIN_SAMPLES:
+            return None
+        report = self.latency.run_report()
+        if report["hedges"] >= max(1, self.hedge_budget * report["requests"]):
+            return None
+        return max(HEDGE_MIN_DELAY, self.latency.window_percentile(self.hedge_percentile))
+    
+    def _pool(self):
+        transport = self._transport
+        with transport._hedge_pool_lock:
+            if transport._hedge_pool is None:
+                transport._hedge_pool = concurrent.futures.ThreadPoolExecutor(max_workers=32)
+            return transport._hedge_pool
+    
+    def get_hedged(self, url, timeout=60, cancel_event=None, **kwargs):
+        """Download a URL, sending a duplicate request if the first one is unusually slow
+        
+        When the primary request outlives the recent latency percentile and the
+        hedge budget allows, a second identical request is sent and the first
+        200 response wins; the other request is aborted. An error response is
+        returned only when neither attempt gets a 200. Like get(), concurrent
+        callers of the same URL share one (possibly hedged) download.
+        """
+        return self._coalesce(url, lambda: self._get_hedged(url, timeout, cancel_event, **kwargs), cancel_event, kwargs)
+    
+    def _get_hedged(self, url, timeout=60, cancel_event=None, **kwargs):
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._get(url, timeout=timeout, cancel_event=cancel_event, **kwargs)
+        
+        started = time.perf_counter()
+        primary_abort = threading.Event()
+        primary = self._pool().submit(
+            self._fetch, url, timeout, _AnyEvent(cancel_event, primary_abort), **kwargs
+        )
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        if done or not self.latency.try_reserve_hedge(self.hedge_budget):
+            response = primary.result()
+            self.latency.record_request(time.perf_counter() - started)
+            return response
+        
+        hedge_abort = threading.Event()
+        HTTP_HEDGES.inc()
+        hedge_started = time.perf_counter()
+        hedge = self._pool().submit(
+            self._fetch, url, timeout, _AnyEvent(cancel_event, hedge_abort), **kwargs
+        )
+        aborts = {primary: primary_abort, hedge: hedge_abort}
+        starts = {primary: started, hedge: hedge_started}
+        pending = {primary, hedge}
+        fallback = None
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                elif future.result().status_code != 200:
+                    # A fast error page must not beat a slower good response
+                    fallback = future.result()
+                else:
+                    # Abort the slower request and hand back the winner; the abandoned
+                    # attempt took at least this long, which keeps the threshold honest
+                    finished = time.perf_counter()
+                    for other in pending:
+                        aborts[other].set()
+                        self.latency.record_censored(finished - starts[other])
+                    if future is hedge:
+                        self.latency.record_hedge_win()
+                    self.latency.record_request(finished - started)
+                    return future.result()
+        # Both attempts failed: an error response is still better than an exception
+        if fallback is None:
+            raise error
+        self.latency.record_request(time.perf_counter() - started)
+        return fallback
@@ -0,0 +1,87 @@
+import threading
+from collections import deque
+
+
+def percentile(samples, pct):
+    """Return the nearest-rank percentile of a list of samples, or None if it is empty"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class LatencyTracker:
+    """Thread-safe record of request latencies
+
+    A sliding window of recent samples drives the hedging threshold, while the
+    per-run samples are reset at the start of every engine run for reporting.
+    """
+    
+    def __init__(self, window_size=500):
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=window_size)
+        self._run_samples = []
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+    
+    def record_attempt(self, seconds):
+        """Record the latency of a single HTTP attempt"""
+        with self._lock:
+            self._window.append(seconds)
+    
+    def record_request(self, seconds):
+        """Record the effective latency seen by the caller of a request"""
+        with self._lock:
+            self._run_samples.append(seconds)
+            self.requests += 1
+    
+    def record_censored(self, seconds):
+        """Record an attempt abandoned after the given time; its latency was at least that long"""
+        with self._lock:
+            self._window.append(seconds)
+    
+    def try_reserve_hedge(self, budget):
+        """Count a hedge if fewer than budget (a fraction of the requests) were sent; False if over budget
+        
+        Checking and counting under one lock keeps concurrent workers from
+        all passing the check and overshooting the budget together.
+        """
+        with self._lock:
+            if self.hedges >= max(1, budget * self.requests):
+                return False
+            self.hedges += 1
+            return True
+    
+    def record_hedge_win(self):
+        """Record that a reserved hedge beat the primary"""
+        with self._lock:
+            self.hedge_wins += 1
+    
+    def window_percentile(self, pct):
+        """Percentile of the recent attempt latencies"""
+        with self._lock:
+            samples = list(self._window)
+        return percentile(samples, pct)
+    
+    def window_size(self):
+        with self._lock:
+            return len(self._window)
+    
+    def reset_run(self):
+        """Start a new reporting period"""
+        with self._lock:
+            self._run_samples = []
+            self.requests = 0
+            self.hedges = 0
+            self.hedge_wins = 0
+    
+    def run_report(self):
+        """Return request count, hedge counts and p50/p95/p99 latency of the current run"""
+        with self._lock:
+            samples = list(self._run_samples)
+            report = {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+        for pct in (50, 95, 99):
+            report[f"p{pct}"] = percentile(samples, pct)
+        return report
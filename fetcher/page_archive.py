@@ -0,0 +1,96 @@
+import os
+import gzip
+import tarfile
+from datetime import datetime
+from typing import NamedTuple
+from urllib.parse import quote, unquote
+
+# Archived pages are named <spec>/<YYYY-MM-DD>/<HHMMSSffffff>_<item>.html.gz
+PAGE_SUFFIX = ".html.gz"
+
+
+class ArchivedPage(NamedTuple):
+    """Where an archived page came from, decoded from its name"""
+    spec_name: str
+    item: str
+    fetched_at: datetime
+
+
+class PageArchive:
+    """Keeps the raw HTML of downloaded pages so they can be re-parsed without the network
+    
+    Every page fetched through a SpecScraper is written gzip-compressed to
+    <root>/<spec>/<YYYY-MM-DD>/<HHMMSSffffff>_<item>.html.gz when
+    RAW_PAGE_ARCHIVE_DIR is set. The name records the fan-out item and the
+    download time, so the re-parse pipeline (reparse/pipeline.py) rebuilds the
+    same records from the page alone, from the directory or from a tarball of it.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+    
+    @classmethod
+    def from_env(cls):
+        """Return the archive configured in RAW_PAGE_ARCHIVE_DIR, or None when archiving is off"""
+        directory = os.getenv("RAW_PAGE_ARCHIVE_DIR")
+        return cls(directory) if directory else None
+    
+    def save(self, spec_name, item, html, fetched_at=None):
+        """Store the HTML of one page and return its path"""
+        key = page_key(spec_name, item, fetched_at or datetime.now())
+        path = os.path.join(self.root, *key.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written under a temporary name so a concurrent re-parse never reads half a page
+        temporary = f"{path}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=5) as page_file:
+            page_file.write(html)
+        os.replace(temporary, path)
+        return path
+
+
+def page_key(spec_name, item, fetched_at):
+    """Return the archive name of a page, relative to the archive root"""
+    if isinstance(item, (tuple, list)):
+        # Date-range shards of the archive scraper
+        item = ",".join(str(part) for part in item)
+    label = quote(str(item), safe="-.,") if item is not None else ""
+    return f"{spec_name}/{fetched_at:%Y-%m-%d}/{fetched_at:%H%M%S%f}_{label}{PAGE_SUFFIX}"
+
+
+def parse_key(key):
+    """Decode the spec, item and download time from an archive name
+    
+    Leading directories (for example the top directory of a tarball) are ignored.
+    """
+    spec_name, day, name = key.replace("\\", "/").split("/")[-3:]
+    stamp, _, label = name[:-len(PAGE_SUFFIX)].partition("_")
+    fetched_at = datetime.strptime(f"{day} {stamp}", "%Y-%m-%d %H%M%S%f")
+    return ArchivedPage(spec_name, unquote(label) if label else None, fetched_at)
+
+
+def read_archive(source):
+    """Yield (key, payload) for every archived page of a directory or tarball
+    
+    The payload is the file path for a directory and the compressed page bytes
+    for a tarball, which is read as a stream in a single pass.
+    """
+    if os.path.isdir(source):
+        for directory, subdirectories, files in os.walk(source):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.endswith(PAGE_SUFFIX):
+                    path = os.path.join(directory, name)
+                    yield os.path.relpath(path, source).replace(os.sep, "/"), path
+        return
+    with tarfile.open(source, "r|*") as tar:
+        for member in tar:
+            if member.isfile() and member.name.endswith(PAGE_SUFFIX):
+                yield member.name, tar.extractfile(member).read()
+
+
+def load_page(payload):
+    """Return the HTML of a page payload yielded by read_archive"""
+    if not isinstance(payload, bytes):
+        with open(payload, "rb") as page_file:
+            payload = page_file.read()
+    return gzip.decompress(payload).decode("utf-8")
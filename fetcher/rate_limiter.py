@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+
+
+class RateLimiter:
+    """Process-wide request rate limit shared by every HttpClient
+    
+    A generic cell rate algorithm: requests are spaced 1/rate seconds apart,
+    with up to burst requests allowed back to back. A rate of 0 disables the
+    limit. Until configure() is called, the rate and burst are read from
+    DSE_MAX_REQUESTS_PER_SECOND and DSE_REQUEST_BURST on first use.
+    """
+    
+    def __init__(self, rate=None, burst=None):
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._burst = burst
+        self._tat = 0.0
+    
+    def configure(self, rate, burst=None):
+        """Set the limit in requests per second; 0 or None removes it"""
+        with self._lock:
+            self._rate = float(rate or 0)
+            self._burst = int(burst or 1)
+    
+    def _settings(self):
+        if self._rate is None:
+            self._rate = float(os.getenv("DSE_MAX_REQUESTS_PER_SECOND", "0") or 0)
+        if self._burst is None:
+            self._burst = int(os.getenv("DSE_REQUEST_BURST", "1") or 1)
+        return self._rate, max(1, self._burst)
+    
+    def acquire(self, cancel_event=None):
+        """Wait for a request slot
+        
+        Returns:
+            bool: False if cancel_event was set while waiting
+        """
+        with self._lock:
+            rate, burst = self._settings()
+            if rate <= 0:
+                return True
+            interval = 1.0 / rate
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait = tat - (burst - 1) * interval - now
+            self._tat = tat + interval
+        
+        deadline = time.monotonic() + wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            time.sleep(min(remaining, 0.05))
+
+
+# Shared by all scrapers so concurrent engines stay within one polite request rate
+DSE_RATE_LIMITER = RateLimiter()
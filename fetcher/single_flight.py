@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .errors import RequestCancelled
+from metrics.instruments import HTTP_COALESCED_REQUESTS, page_label
+
+# Successful responses are handed to later callers of the same URL for this many seconds
+DEFAULT_MEMO_SECONDS = 1.0
+
+
+def normalise_url(url):
+    """Return a canonical form of a URL: lower-case scheme and host, sorted query, no fragment"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class _Call:
+    """One in-flight fetch and the callers waiting for it"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        # Set when the fetch ended for a reason of the leader's own (its stop request,
+        # an aborted attempt, an interrupt); the followers then fetch again
+        self.cancelled = False
+
+
+class SingleFlight:
+    """Process-wide coalescing of concurrent requests for the same page
+    
+    The first caller of a URL fetches it; callers arriving while that fetch is
+    in flight wait for it and share its response. Successful responses are
+    also memoised for a short window (DSE_SINGLE_FLIGHT_MEMO_SECONDS, 0 turns
+    the memo off), so back-to-back runs of different tabs fetch a page once.
+    """
+    
+    def __init__(self, memo_seconds=None):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._memo = {}
+        self._memo_seconds = memo_seconds
+        self.coalesced = 0
+    
+    def _window(self):
+        if self._memo_seconds is None:
+            self._memo_seconds = float(os.getenv("DSE_SINGLE_FLIGHT_MEMO_SECONDS", DEFAULT_MEMO_SECONDS) or 0)
+        return self._memo_seconds
+    
+    def configure(self, memo_seconds):
+        """Set the memo window in seconds; 0 keeps only in-flight coalescing"""
+        with self._lock:
+            self._memo_seconds = float(memo_seconds or 0)
+            self._memo.clear()
+    
+    def _expire(self, now):
+        """Drop memoised responses older than the window; called with the lock held"""
+        while self._memo:
+            key = next(iter(self._memo))
+            if self._memo[key][0] > now:
+                break
+            del self._memo[key]
+    
+    def fetch(self, url, fetch, cancel_event=None):
+        """Return fetch() for a URL, sharing the result with concurrent callers
+        
+        Args:
+            url (str): URL of the request, used as the key after normalisation
+            fetch (callable): Performs the request and returns an HttpResponse
+            cancel_event (threading.Event): Optional event that stops the wait
+        
+        Returns:
+            HttpResponse: The response, possibly fetched for another caller
+        """
+        key = normalise_url(url)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                memo = self._memo.get(key)
+                if memo is not None:
+                    self.coalesced += 1
+                    HTTP_COALESCED_REQUESTS.labels(page_label(url), "memo").inc()
+                    return memo[1]
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    self.coalesced += 1
+                    HTTP_COALESCED_REQUESTS.labels(page_label(url), "in_flight").inc()
+            
+            if leader:
+                return self._lead(key, call, fetch, cancel_event)
+            
+            while not call.done.wait(0.05):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RequestCancelled(f"Request to {url} cancelled while waiting for a shared fetch")
+            if call.cancelled:
+                # The leader was stopped, not this caller: fetch again
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.response
+    
+    def _lead(self, key, call, fetch, cancel_event):
+        try:
+            call.response = fetch()
+            return call.response
+        except BaseException as e:
+            call.error = e
+            call.cancelled = (not isinstance(e, Exception) or isinstance(e, RequestCancelled)
+                              or (cancel_event is not None and cancel_event.is_set()))
+            raise
+        finally:
+            # The slot is released and the followers woken whatever happened to the leader
+            try:
+                with self._lock:
+                    del self._calls[key]
+                    window = self._window()
+                    if call.response is not None and call.response.status_code == 200 and window > 0:
+                        self._memo.pop(key, None)
+                        self._memo[key] = (time.monotonic() + window, call.response)
+            finally:
+                call.done.set()
+
+
+# Shared by all scrapers so concurrent engines fetch a page once
+DSE_SINGLE_FLIGHT = SingleFlight()
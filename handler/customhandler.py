@@ -1,18 +1,87 @@
 import logging
+import queue
 import tkinter as tk
 
 class CustomHandler(logging.Handler):
-    """Custom logging handler for tkinter text widget"""
+    """Custom logging handler for tkinter text widget
     
-    def __init__(self, text_widget):
+    Records from any thread are queued and written to the widget by the Tk
+    main loop in one batch every flush_interval_ms. The widget keeps at most
+    max_lines lines. When more than max_records_per_flush records arrive
+    between two flushes, the surplus INFO/DEBUG records are dropped (warnings
+    and errors are kept up to twice the cap) and replaced by a summary line.
+    The queue holds at most max_queued_records; records arriving while it is
+    full (e.g. while the main loop is blocked) are dropped and counted in the
+    same summary line.
+    """
+    
+    def __init__(self, text_widget, flush_interval_ms=200, max_lines=2000, max_records_per_flush=200,
+                 max_queued_records=2000):
         logging.Handler.__init__(self)
         self.text_widget = text_widget
-        
+        self.flush_interval_ms = flush_interval_ms
+        self.max_lines = max_lines
+        self.max_records_per_flush = max_records_per_flush
+        self.records = queue.Queue(maxsize=max_queued_records)
+        # Records dropped because the queue was full, since the last flush
+        self.overflow = 0
+        self._closed = False
+        self.text_widget.after(self.flush_interval_ms, self._flush)
+    
     def emit(self, record):
-        msg = self.format(record)
-        def append():
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert(tk.END, msg + '\n')
-            self.text_widget.see(tk.END)
-            self.text_widget.configure(state='disabled')
-        self.text_widget.after(0, append)
\ No newline at end of file
+        # handle() holds the handler lock here, so the overflow count needs no lock of its own
+        try:
+            self.records.put_nowait((record.levelno, self.format(record)))
+        except queue.Full:
+            self.overflow += 1
+        except Exception:
+            self.handleError(record)
+    
+    def _drain(self):
+        """Take every queued record, applying the per-flush rate cap"""
+        lines = []
+        self.acquire()
+        try:
+            suppressed, self.overflow = self.overflow, 0
+        finally:
+            self.release()
+        while True:
+            try:
+                levelno, msg = self.records.get_nowait()
+            except queue.Empty:
+                break
+            if len(lines) < self.max_records_per_flush:
+                lines.append(msg)
+            elif levelno >= logging.WARNING and len(lines) < 2 * self.max_records_per_flush:
+                lines.append(msg)
+            else:
+                suppressed += 1
+        if suppressed:
+            lines.append(f"... {suppressed} log records suppressed (log rate too high, see the log file)")
+        return lines
+    
+    def _flush(self):
+        """Write the queued records to the widget and schedule the next flush"""
+        if self._closed:
+            return
+        lines = self._drain()
+        try:
+            if lines:
+                self.text_widget.configure(state='normal')
+                self.text_widget.insert(tk.END, '\n'.join(lines) + '\n')
+                
+                # Keep only the newest max_lines lines
+                line_count = int(self.text_widget.index('end-1c').split('.')[0])
+                if line_count > self.max_lines:
+                    self.text_widget.delete('1.0', f'{line_count - self.max_lines + 1}.0')
+                
+                self.text_widget.see(tk.END)
+                self.text_widget.configure(state='disabled')
+            self.text_widget.after(self.flush_interval_ms, self._flush)
+        except tk.TclError:
+            # The widget was destroyed; stop polling
+            self._closed = True
+    
+    def close(self):
+        self._closed = True
+        logging.Handler.close(self)
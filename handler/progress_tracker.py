@@ -0,0 +1,60 @@
+import time
+import threading
+
+
+class ProgressTracker:
+    """Latest progress of an engine run, published by worker threads and polled by the UI
+    
+    Publishing only overwrites a few numbers under a lock, so worker threads
+    never wait on Tk. The UI reads a snapshot at its own frame rate; any
+    number of updates between two frames coalesce into one redraw.
+    """
+    
+    # Weight of the newest sample in the smoothed throughput
+    RATE_SMOOTHING = 0.3
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start()
+    
+    def start(self):
+        """Reset for a new run"""
+        with self._lock:
+            self.completed = 0
+            self.total = 0
+            self.failed = 0
+            self.version = 0
+            self.started_at = time.monotonic()
+            self._rate = None
+            self._last_sample = (self.started_at, 0)
+    
+    def publish(self, completed, total, failed=0):
+        """Record the current progress; safe to call from any thread"""
+        with self._lock:
+            self.completed = completed
+            self.total = total
+            self.failed = failed
+            self.version += 1
+    
+    def snapshot(self):
+        """Return progress, throughput (items/s) and ETA (seconds) for display"""
+        now = time.monotonic()
+        with self._lock:
+            completed, total, failed, version = self.completed, self.total, self.failed, self.version
+            last_time, last_completed = self._last_sample
+            if now - last_time >= 1.0:
+                rate = (completed - last_completed) / (now - last_time)
+                self._rate = rate if self._rate is None else \
+                    self.RATE_SMOOTHING * rate + (1 - self.RATE_SMOOTHING) * self._rate
+                self._last_sample = (now, completed)
+            elapsed = now - self.started_at
+            rate = self._rate if self._rate is not None else (completed / elapsed if elapsed > 0 else 0.0)
+        eta = (total - completed) / rate if rate > 0 and total > completed else None
+        return {
+            "completed": completed,
+            "total": total,
+            "failed": failed,
+            "rate": rate,
+            "eta": eta,
+            "version": version,
+        }
@@ -0,0 +1,4 @@
+# Make this directory a Python package
+from .run_stats import RunStats
+
+__all__ = ['RunStats']
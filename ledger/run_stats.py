@@ -0,0 +1,52 @@
+import uuid
+from datetime import datetime
+
+
+class RunStats:
+    """Counters and stage timings of one engine run, persisted to the scrape_runs ledger
+    
+    Stage durations: fetch is the wall-clock time of the download stage (pages
+    are parsed inside it by the worker threads), parse is the summed parse
+    time of all pages, and write is the wall-clock time of the database write.
+    """
+    
+    STAGES = ("fetch", "parse", "write")
+    
+    def __init__(self, module, run_mode="full"):
+        self.started_at = datetime.now()
+        self.run_id = f"{self.started_at.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.module = module
+        self.run_mode = run_mode
+        self.finished_at = None
+        self.outcome = None
+        self.rows_fetched = 0
+        self.rows_parsed = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.skipped_unchanged = 0
+        self.stage_seconds = {stage: 0.0 for stage in self.STAGES}
+    
+    def add_stage_time(self, stage, seconds):
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+    
+    def finish(self, outcome):
+        self.finished_at = datetime.now()
+        self.outcome = outcome
+    
+    def as_row(self):
+        """Return the values in scrape_runs column order"""
+        return (
+            self.run_id, self.module, self.run_mode, self.outcome,
+            self.started_at, self.finished_at,
+            self.rows_fetched, self.rows_parsed, self.rows_written,
+            self.failures, self.skipped_unchanged,
+            self.stage_seconds["fetch"], self.stage_seconds["parse"], self.stage_seconds["write"]
+        )
+    
+    def summary(self):
+        return (
+            f"Run {self.run_id}: {self.rows_fetched} fetched, {self.rows_parsed} parsed, "
+            f"{self.rows_written} written, {self.failures} failures, {self.skipped_unchanged} unchanged; "
+            f"fetch {self.stage_seconds['fetch']:.2f}s, parse {self.stage_seconds['parse']:.2f}s, "
+            f"write {self.stage_seconds['write']:.2f}s"
+        )
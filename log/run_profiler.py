@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+import cProfile
+import pstats
+import threading
+import tracemalloc
+import io
+from collections import Counter
+from datetime import datetime
+
+from log.scraper_log import application_path
+
+# tracemalloc is process-wide: profiled runs share it. The first run to start
+# tracing resets the peak, and tracing stops when the last of them ends.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_runs = 0
+_tracemalloc_started = False
+
+
+class RunProfiler:
+    """Profiles a single engine run and writes the results to log/logs
+    
+    Modes:
+        cprofile: deterministic cProfile of the engine thread, plus stack
+                  sampling of it and every pool worker thread for a flame graph
+        sampling: stack sampling only, for minimal overhead on long runs
+    
+    Only one cProfile can be active per process on Python 3.12+, so the pool
+    threads are covered by the sampler alone. If cProfile cannot be enabled
+    (another profiler is active), the run goes on with sampling only.
+    
+    Both modes record the tracemalloc peak and top allocation sites. Nothing
+    is installed unless a profiler is started, so runs without one pay nothing.
+    tracemalloc is shared by the runs profiled at the same time, so the peak of
+    such a run covers the others' allocations too; its report says so.
+    """
+    
+    MODES = ("cprofile", "sampling")
+    
+    def __init__(self, logger, module_name, mode="cprofile", sample_interval=0.005, traceback_frames=10):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'")
+        self.logger = logger
+        self.module_name = module_name
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.traceback_frames = traceback_frames
+        self._profile = None
+        self._threads = set()
+        self._threads_lock = threading.Lock()
+        self._stacks = Counter()
+        self._sampling = threading.Event()
+        self._sampler = None
+        # Set when another profiled run (or other code) traced memory during this run
+        self._shared_tracemalloc = False
+        self._started = None
+    
+    def start(self):
+        """Start profiling the calling thread"""
+        global _tracemalloc_runs, _tracemalloc_started
+        self._started = time.perf_counter()
+        with _tracemalloc_lock:
+            if _tracemalloc_runs == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(self.traceback_frames)
+                _tracemalloc_started = True
+                if hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+            # Tracing started elsewhere keeps its peak; another run's peak is not reset either
+            self._shared_tracemalloc = _tracemalloc_runs > 0 or not _tracemalloc_started
+            _tracemalloc_runs += 1
+        self._register_thread()
+        self._sampling.set()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._profile = profile
+            except ValueError as e:
+                self.logger.warning(f"cProfile unavailable ({str(e)}); profiling by stack sampling only")
+    
+    def _register_thread(self):
+        """Include the calling thread in stack sampling"""
+        with self._threads_lock:
+            self._threads.add(threading.get_ident())
+    
+    def wrap(self, func):
+        """Return func with whichever pool thread runs it included in stack sampling"""
+        def profiled(*args, **kwargs):
+            self._register_thread()
+            return func(*args, **kwargs)
+        
+        return profiled
+    
+    def _sample_loop(self):
+        """Record the stacks of the profiled threads at a fixed interval"""
+        while self._sampling.is_set():
+            with self._threads_lock:
+                threads = set(self._threads)
+            for ident, frame in sys._current_frames().items():
+                if ident not in threads:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.sample_interval)
+    
+    def stop(self):
+        """Stop profiling and write the output files; returns their paths"""
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampling.clear()
+        self._sampler.join(timeout=1)
+        elapsed = time.perf_counter() - self._started
+        
+        global _tracemalloc_runs, _tracemalloc_started
+        with _tracemalloc_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            top_allocations = tracemalloc.take_snapshot().statistics('lineno')[:25]
+            self._shared_tracemalloc = self._shared_tracemalloc or _tracemalloc_runs > 1
+            _tracemalloc_runs -= 1
+            if _tracemalloc_runs == 0 and _tracemalloc_started:
+                tracemalloc.stop()
+                _tracemalloc_started = False
+        
+        logs_dir = os.path.join(application_path, 'logs')
+        if not os.path.exists(logs_dir):
+            os.makedirs(logs_dir)
+        base = os.path.join(logs_dir, f"{self.module_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        paths = []
+        
+        report = io.StringIO()
+        report.write(f"Profile of {self.module_name} ({self.mode}), {elapsed:.2f}s wall clock\n\n")
+        report.write(f"tracemalloc: peak {peak / 1024 / 1024:.2f} MiB, current {current / 1024 / 1024:.2f} MiB\n")
+        if self._shared_tracemalloc:
+            report.write("  (memory was traced for concurrent profiled runs or other code too; the figures include theirs)\n")
+        report.write("Top allocation sites:\n")
+        for stat in top_allocations:
+            report.write(f"  {stat}\n")
+        
+        if self._profile is not None and self._profile.getstats():
+            stats = pstats.Stats(self._profile, stream=report)
+            stats.dump_stats(base + ".prof")
+            paths.append(base + ".prof")
+            report.write("\ncProfile of the engine thread, top functions by cumulative time:\n")
+            stats.sort_stats("cumulative").print_stats(40)
+        
+        with open(base + "_profile.txt", "w") as f:
+            f.write(report.getvalue())
+        paths.append(base + "_profile.txt")
+        
+        # One "frame;frame;frame count" line per stack, the input format of flamegraph.pl and speedscope
+        with open(base + ".collapsed", "w") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        paths.append(base + ".collapsed")
+        
+        self.logger.info(f"Profile written to {', '.join(paths)}")
+        return paths
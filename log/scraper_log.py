@@ -1,6 +1,15 @@
 import logging
+import logging.handlers
 import os
 import sys
+import gzip
+import json
+import queue
+import shutil
+import copy
+import atexit
+import threading
+from datetime import datetime
 from handler.customhandler import CustomHandler
 
 # Get application path for executable support
@@ -11,18 +20,117 @@ else:
     # If run as a normal Python script
     application_path = os.path.dirname(os.path.abspath(__file__))
 
-# Set the working directory to the application path
-os.chdir(application_path)
+# Rotation defaults, overridable with the LOG_MAX_BYTES, LOG_BACKUP_COUNT and
+# LOG_ROTATE_WHEN (time-based rotation, e.g. "midnight") environment variables;
+# LOG_FORMAT selects "text" or "json" (one JSON object per line)
+DEFAULT_LOG_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 10
+DEFAULT_LOG_FORMAT = "text"
+
+# Formats tracebacks before records are enqueued (see RecordQueueHandler)
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line for machine parsing"""
+    
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        # Records from a RecordQueueHandler carry the formatted traceback in exc_text
+        exception = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exception:
+            entry["exception"] = exception
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps a record's traceback apart from its message
+    
+    The stock handler folds the traceback into msg and clears exc_text, so the
+    file formatter could not tell them apart. Here the message is merged with
+    its arguments and the traceback is kept, formatted, in exc_text; the live
+    traceback is dropped so its frames are not kept alive by the queue.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACK_FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+
+def _gzip_rotator(source, dest):
+    """Compress a rotated log file and remove the uncompressed original"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
 
 class LoggerSetup:
     """Handles setting up and configuring loggers for different modules"""
     
+    # One background listener per module writes that module's file
+    _listeners = {}
+    _listeners_lock = threading.Lock()
+    
+    @staticmethod
+    def _create_file_handler(logs_dir, module_name, log_format):
+        """Create the rotating, compressing file handler used by a module's listener"""
+        extension = "jsonl" if log_format == "json" else "log"
+        path = os.path.join(logs_dir, f'{module_name}.{extension}')
+        backup_count = int(os.getenv("LOG_BACKUP_COUNT", DEFAULT_LOG_BACKUP_COUNT))
+        rotate_when = os.getenv("LOG_ROTATE_WHEN")
+        if rotate_when:
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                path, when=rotate_when, backupCount=backup_count, encoding='utf-8'
+            )
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=int(os.getenv("LOG_MAX_BYTES", DEFAULT_LOG_MAX_BYTES)),
+                backupCount=backup_count, encoding='utf-8'
+            )
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setLevel(logging.INFO)
+        if log_format == "json":
+            file_handler.setFormatter(JsonLinesFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        return file_handler
+    
     @staticmethod
-    def setup_file_logger(module_name="main"):
-        """Configure logging to a module-specific file
+    def shutdown():
+        """Flush and stop every file listener"""
+        with LoggerSetup._listeners_lock:
+            listeners = list(LoggerSetup._listeners.values())
+            LoggerSetup._listeners.clear()
+        for listener in listeners:
+            listener.stop()
+    
+    @staticmethod
+    def setup_file_logger(module_name="main", log_format=None):
+        """Configure non-blocking logging to a module-specific file
+        
+        Records are put on an in-memory queue and written by a background
+        QueueListener, so threads that log never wait on disk I/O. Files rotate
+        by size (or time) and rotated files are gzip-compressed.
         
         Args:
             module_name (str): Name of the module to create logger for
+            log_format (str): "text" or "json"; defaults to the LOG_FORMAT environment variable
             
         Returns:
             logging.Logger: Configured logger instance
@@ -40,19 +148,23 @@ class LoggerSetup:
         logger.propagate = False
         
         # Check if the logger already has handlers to avoid duplicates
-        has_file_handler = any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+        has_queue_handler = any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
         
-        if not has_file_handler:
-            # Create file handler for this module
-            file_handler = logging.FileHandler(
-                os.path.join(logs_dir, f'{module_name}.log')
+        if not has_queue_handler:
+            # Workers only enqueue; the listener thread owns the file
+            records = queue.SimpleQueue()
+            file_handler = LoggerSetup._create_file_handler(
+                logs_dir, module_name, log_format or os.getenv("LOG_FORMAT", DEFAULT_LOG_FORMAT)
             )
-            file_handler.setLevel(logging.INFO)
-            file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            file_handler.setFormatter(file_formatter)
+            listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+            listener.start()
+            with LoggerSetup._listeners_lock:
+                LoggerSetup._listeners[module_name] = listener
             
             # Add the handler to logger
-            logger.addHandler(file_handler)
+            queue_handler = RecordQueueHandler(records)
+            queue_handler.setLevel(logging.INFO)
+            logger.addHandler(queue_handler)
         
         return logger
     
@@ -81,4 +193,8 @@ class LoggerSetup:
             text_handler.setFormatter(text_formatter)
             logger.addHandler(text_handler)
         
-        return logger
\ No newline at end of file
+        return logger
+
+
+# Drain queued records to disk before the interpreter exits
+atexit.register(LoggerSetup.shutdown)
@@ -3,6 +3,13 @@ import sys
 import tkinter as tk
 from tkinter import ttk
 import importlib
+import multiprocessing
+
+from context.app_context import AppContext
+from metrics.server import MetricsServer
+from snapshot.api_server import SnapshotServer
+from spec.specs import SPECS
+from spec.spec_app import SpecScraperApp
 
 
 # Make sure we add the current directory to the path
@@ -18,6 +25,9 @@ class TabbedApplication(tk.Tk):
         # Set the window background to match your application
         self.configure(bg="#f0f0f0")
         
+        # Config, storage backend, HTTP connections and caches shared by every tab
+        self.context = AppContext()
+        
         style = ttk.Style()
         
         # Use the 'clam' theme which allows more customization
@@ -55,6 +65,8 @@ class TabbedApplication(tk.Tk):
         self.sector_scraper_frame = ttk.Frame(self.notebook)
         self.pe_scraper_frame = ttk.Frame(self.notebook)
         self.company_scraper_frame = ttk.Frame(self.notebook)
+        self.archive_scraper_frame = ttk.Frame(self.notebook)
+        self.market_depth_frame = ttk.Frame(self.notebook)
         
         # Add the frames to the notebook with tab names
         self.notebook.add(self.share_scraper_frame, text="Share Scraper")
@@ -62,6 +74,8 @@ class TabbedApplication(tk.Tk):
         self.notebook.add(self.sector_scraper_frame, text="Sector Scraper")
         self.notebook.add(self.pe_scraper_frame, text="PE Ration Scraper")
         self.notebook.add(self.company_scraper_frame, text="Company Scraper")
+        self.notebook.add(self.archive_scraper_frame, text="Archive Backfill")
+        self.notebook.add(self.market_depth_frame, text="Market Depth")
         
         # Initialize each project's contents
         self.initialize_project(self.share_scraper_frame, 'share_ratio_scraper')
@@ -69,6 +83,26 @@ class TabbedApplication(tk.Tk):
         self.initialize_project(self.sector_scraper_frame, 'sector_scraper')
         self.initialize_project(self.pe_scraper_frame, 'PE_scraper')
         self.initialize_project(self.company_scraper_frame,'company_scraper')
+        self.initialize_project(self.archive_scraper_frame, 'archive_scraper')
+        self.initialize_project(self.market_depth_frame, 'market_depth')
+        
+        # Pages added only as a spec get a generic tab
+        self.spec_apps = []
+        for spec in SPECS.values():
+            if spec.tab:
+                spec_frame = ttk.Frame(self.notebook)
+                self.notebook.add(spec_frame, text=spec.tab)
+                self.spec_apps.append(SpecScraperApp(spec_frame, spec, context=self.context))
+        
+        # Serve run metrics for Prometheus on http://127.0.0.1:<METRICS_PORT>/metrics
+        self.metrics_server = MetricsServer(registry=self.context.metrics)
+        if not self.metrics_server.start():
+            print(f"Metrics endpoint disabled: port {self.metrics_server.port} is unavailable")
+        
+        # Serve the latest committed data as JSON on http://127.0.0.1:<SNAPSHOT_API_PORT>/
+        self.snapshot_server = SnapshotServer(store=self.context.snapshots)
+        if not self.snapshot_server.start():
+            print(f"Snapshot API disabled: port {self.snapshot_server.port} is unavailable")
         
         # Override the tab appearance after creation
         # This helps eliminate any extra space above tabs
@@ -91,13 +125,6 @@ class TabbedApplication(tk.Tk):
             if not os.path.exists(module_path):
                 raise ImportError(f"Module directory {module_path} does not exist")
                 
-            # Check if the module has an __init__.py file
-            init_file = os.path.join(module_path, "__init__.py")
-            if not os.path.exists(init_file):
-                # Create an empty __init__.py file
-                with open(init_file, 'w') as f:
-                    pass
-                    
             # Add the project directory to the path so we can import the module
             if module_path not in sys.path:
                 sys.path.insert(0, module_path)
@@ -122,7 +149,7 @@ class TabbedApplication(tk.Tk):
             # Get the ScraperApp class from the module
             if hasattr(scraper_module, "ScraperApp"):
                 ScraperApp = getattr(scraper_module, "ScraperApp")
-                self.scraper_app = ScraperApp(scraper_frame)
+                self.scraper_app = ScraperApp(scraper_frame, context=self.context)
             else:
                 raise ImportError(f"Module {folder_name} does not have a ScraperApp class")
                 
@@ -146,5 +173,7 @@ class TabbedApplication(tk.Tk):
             error_label.pack(pady=100)
 
 if __name__ == "__main__":
+    # Needed for work-queue worker processes in the frozen executable
+    multiprocessing.freeze_support()
     app = TabbedApplication()
     app.mainloop()
\ No newline at end of file
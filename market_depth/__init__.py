@@ -0,0 +1,7 @@
+# This file makes the market_depth directory a Python package
+# It also provides a convenient way to import from the module
+
+from .market_depth import MarketDepthScraper, MarketDepthEngine, ScraperApp
+
+# Define what gets imported when using "from market_depth import *"
+__all__ = ['MarketDepthScraper', 'MarketDepthEngine', 'ScraperApp']
@@ -0,0 +1,262 @@
+import os
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Import from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from BaseScraperApp import BaseScraperApp
+from BaseScraperEngine import BaseScraperEngine
+from fetcher.http_client import HttpClient, RequestCancelled, dse_url
+from metrics.instruments import PARSE_SECONDS
+from records import MarketDepthRecord, RecordBatch
+
+# Module name for logging
+MODULE_NAME = "market_depth_scraper"
+
+# The market depth page loads each instrument's ladder with this form POST
+DEPTH_URL = "ajax/load-instrument.php"
+
+INSERT_QUERY = """
+    INSERT INTO market_depth (trading_code, side, level, price, volume, tick_time)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# DSE trades Sunday to Thursday; Bangladesh time has no daylight saving
+DHAKA_TZ = timezone(timedelta(hours=6))
+TRADING_DAYS = (6, 0, 1, 2, 3)
+DEFAULT_SESSION = "10:00-14:30"
+
+# Only the ladder tables are built into the tree
+PARSE_ONLY = SoupStrainer("table")
+
+
+class DepthLadder(NamedTuple):
+    """Bid and ask ladders of one symbol as compact arrays, best price first"""
+    bid_prices: array
+    bid_volumes: array
+    ask_prices: array
+    ask_volumes: array
+
+
+class MarketDepthScraper:
+    """Fetches and parses the bid/ask ladder of one instrument"""
+    
+    def __init__(self, logger, http_client=None):
+        self.logger = logger
+        self.http_client = http_client or HttpClient()
+        # Set by the engine so a stop request aborts in-flight downloads
+        self.cancel_event = None
+    
+    def scrape_depth(self, symbol):
+        """Fetch the market depth of a symbol
+        
+        Returns:
+            DepthLadder: The ladders, or None if the page could not be fetched
+        """
+        try:
+            response = self.http_client.post(
+                dse_url(DEPTH_URL), data={"inst": symbol}, timeout=10, cancel_event=self.cancel_event
+            )
+            if response.status_code != 200:
+                self.logger.warning(f"Failed to fetch market depth for {symbol}: HTTP {response.status_code}")
+                return None
+            return self.parse(response.text)
+        except RequestCancelled:
+            return None
+        except Exception as e:
+            self.logger.error(f"Error scraping market depth for {symbol}: {str(e)}")
+            return None
+    
+    def parse(self, html):
+        """Parse the buy and sell tables of a market depth page into a DepthLadder"""
+        parse_started = time.perf_counter()
+        ladders = {"BUY": (array('d'), array('q')), "SELL": (array('d'), array('q'))}
+        for table in BeautifulSoup(html, 'html.parser', parse_only=PARSE_ONLY).find_all('table'):
+            headers = [th.text.strip().upper() for th in table.find_all('th')]
+            side = "BUY" if "BUY PRICE" in headers else "SELL" if "SELL PRICE" in headers else None
+            if side is None:
+                continue
+            prices, volumes = ladders[side]
+            for tr in table.find_all('tr'):
+                cells = [td.text.strip().replace(',', '') for td in tr.find_all('td')]
+                if len(cells) < 2:
+                    continue
+                try:
+                    price, volume = float(cells[0]), int(float(cells[1]))
+                except ValueError:
+                    # Placeholder rows such as "-" on instruments without orders
+                    continue
+                prices.append(price)
+                volumes.append(volume)
+        PARSE_SECONDS.labels(MODULE_NAME).observe(time.perf_counter() - parse_started)
+        return DepthLadder(*ladders["BUY"], *ladders["SELL"])
+
+
+class MarketDepthEngine(BaseScraperEngine):
+    """Polls the market depth of every listed symbol during the trading session
+    
+    Every cycle fetches the ladders of the whole symbol universe in parallel
+    and appends the levels of the symbols whose ladder changed since their
+    last tick to market_depth in one bulk insert, so an unchanged book is
+    stored once. The cycles of a run share one database connection; a cycle
+    whose write fails is logged and its ladders are written by the next one.
+    Cycles start every MDS_POLL_SECONDS (default 5) until the session
+    (MDS_SESSION, default 10:00-14:30 Dhaka time, Sunday to Thursday) ends or
+    the run is stopped. A run started outside the session polls once.
+    """
+    
+    # Concurrent depth requests; the shared DSE rate limit applies on top
+    MAX_WORKERS = 32
+    
+    DEFAULT_POLL_SECONDS = 5.0
+    
+    def __init__(self, logger, db_manager, scraper, poll_seconds=None, max_cycles=None, context=None):
+        super().__init__(logger, db_manager, scraper, context=context)
+        # Overrides for the benchmark; None reads MDS_POLL_SECONDS at run start
+        self.poll_seconds = poll_seconds
+        self.max_cycles = max_cycles
+        # Last stored ladder of each symbol, for the per-tick dedupe
+        self.last_ladders = {}
+        # Connection shared by the cycles of a run, with market_depth prepared on it
+        self.connection = None
+    
+    @staticmethod
+    def session_bounds(now=None):
+        """Return today's (open, close) in Dhaka time, or None on a non-trading day"""
+        now = now or datetime.now(DHAKA_TZ)
+        if now.weekday() not in TRADING_DAYS:
+            return None
+        opens, closes = (os.getenv("MDS_SESSION") or DEFAULT_SESSION).split("-")
+        bounds = []
+        for value in (opens, closes):
+            hour, minute = (int(part) for part in value.strip().split(":"))
+            bounds.append(now.replace(hour=hour, minute=minute, second=0, microsecond=0))
+        return tuple(bounds)
+    
+    def in_session(self):
+        bounds = self.session_bounds()
+        return bounds is not None and bounds[0] <= datetime.now(DHAKA_TZ) < bounds[1]
+    
+    def _execute_scraping(self):
+        """Poll the market depth of the symbol universe until the session ends"""
+        self.logger.info("Starting market depth polling")
+        try:
+            symbols = self.db_manager.fetch_company_list()
+            if not symbols:
+                self.logger.error("No companies found to poll")
+                self.run_failed = True
+                return
+            self.connection = self.db_manager.prepare_connection(self.db_manager.ensure_market_depth_table)
+            if self.connection is None:
+                self.logger.error("Could not prepare the market_depth table")
+                self.run_failed = True
+                return
+            
+            poll_seconds = self.poll_seconds
+            if poll_seconds is None:
+                poll_seconds = float(os.getenv("MDS_POLL_SECONDS", self.DEFAULT_POLL_SECONDS))
+            # max_cycles (benchmark) polls that many cycles whatever the time of day
+            continuous = self.max_cycles is not None or self.in_session()
+            if not continuous:
+                self.logger.info("Outside the trading session; polling once")
+            self.logger.info(f"Polling {len(symbols)} symbols every {poll_seconds:g} seconds")
+            
+            self.last_ladders = {}
+            cycles = 0
+            while not self.stop_requested():
+                cycle_started = time.monotonic()
+                cycles += 1
+                self.poll_cycle(symbols, cycles)
+                if not continuous or cycles == self.max_cycles or (self.max_cycles is None and not self.in_session()):
+                    break
+                elapsed = time.monotonic() - cycle_started
+                if elapsed > poll_seconds:
+                    self.logger.warning(f"Cycle took {elapsed:.1f}s, longer than the {poll_seconds:g}s poll interval")
+                # Wakes up early when a stop is requested
+                self._stop_event.wait(max(0.0, poll_seconds - elapsed))
+            
+            self.logger.info(f"Market depth polling finished after {cycles} cycles")
+        finally:
+            self._close_connection()
+    
+    def _close_connection(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception as e:
+                self.logger.error(f"Error closing database connection: {str(e)}")
+            self.connection = None
+    
+    def poll_cycle(self, symbols, cycle=1):
+        """Fetch one tick of every symbol and append the changed ladders"""
+        batch = RecordBatch(MarketDepthRecord, timestamp=datetime.now())
+        changed = []
+        completed = 0
+        
+        def collect(symbol, ladder):
+            nonlocal completed
+            completed += 1
+            self.update_progress(completed, len(symbols))
+            if ladder is None:
+                self.run_stats.failures += 1
+                return
+            self.run_stats.rows_fetched += 1
+            if self.last_ladders.get(symbol) == ladder:
+                self.run_stats.skipped_unchanged += 1
+                return
+            self.last_ladders[symbol] = ladder
+            changed.append(symbol)
+            for side, prices, volumes in (("B", ladder.bid_prices, ladder.bid_volumes),
+                                          ("S", ladder.ask_prices, ladder.ask_volumes)):
+                for level, (price, volume) in enumerate(zip(prices, volumes), start=1):
+                    batch.append(symbol, side, level, price, volume)
+        
+        with self.stage("fetch"):
+            self.run_tasks(self.scraper.scrape_depth, symbols, collect, max_workers=self.MAX_WORKERS)
+        self.run_stats.rows_parsed += len(batch)
+        if not batch or not self.should_store_results():
+            return
+        written = 0
+        try:
+            if self.connection is None:
+                self.connection = self.db_manager.prepare_connection(self.db_manager.ensure_market_depth_table)
+            # Ticks are history: appended, never replaced; each cycle exports its own Parquet part
+            written = self.write_rows(batch, INSERT_QUERY, connection=self.connection, part=cycle)
+        except Exception as e:
+            self.logger.error(f"Error storing market depth cycle {cycle}: {str(e)}")
+            self.run_failed = True
+            # The connection may be broken; the next cycle opens a new one
+            self._close_connection()
+        if not written:
+            self.run_stats.failures += 1
+            # Forget the unstored ladders so the next cycle writes them even if unchanged
+            for symbol in changed:
+                self.last_ladders.pop(symbol, None)
+
+
+class ScraperApp(BaseScraperApp):
+    """Main application class with the UI"""
+    
+    def __init__(self, parent, context=None):
+        # Call the parent constructor
+        super().__init__(parent, title="Market Depth Module", module_name=MODULE_NAME, context=context)
+        
+        # Set up the scraper components
+        self.setup_scraper()
+        
+        # Complete initialization
+        self.complete_initialization()
+    
+    def setup_scraper(self):
+        """Set up specific scraper components"""
+        self.scraper = self.create_scraper()
+        self.scraper_engine = MarketDepthEngine(self.logger, self.db_manager, self.scraper, context=self.context)
+    
+    def create_scraper(self):
+        """Create and return the scraper instance"""
+        return MarketDepthScraper(self.logger, self.http_client)
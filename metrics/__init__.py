@@ -0,0 +1,5 @@
+# Make this directory a Python package
+from .registry import MetricsRegistry, REGISTRY
+from .server import MetricsServer
+
+__all__ = ['MetricsRegistry', 'REGISTRY', 'MetricsServer']
@@ -0,0 +1,60 @@
+from urllib.parse import urlparse
+
+from .registry import REGISTRY
+
+# Run durations span a few seconds (single page) to most of an hour (full market)
+RUN_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "dse_http_request_seconds", "Latency of HTTP attempts to dsebd.org", ("page",)
+)
+HTTP_RESPONSE_BYTES = REGISTRY.counter(
+    "dse_http_response_bytes_total", "Bytes downloaded from dsebd.org", ("page",)
+)
+HTTP_REQUEST_ERRORS = REGISTRY.counter(
+    "dse_http_request_errors_total", "HTTP attempts that raised or were aborted", ("page",)
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "dse_http_requests_in_flight", "HTTP attempts currently downloading"
+)
+HTTP_HEDGES = REGISTRY.counter(
+    "dse_http_hedged_requests_total", "Duplicate requests sent to cut tail latency"
+)
+HTTP_COALESCED_REQUESTS = REGISTRY.counter(
+    "dse_http_coalesced_requests_total",
+    "Requests served by another caller's fetch of the same page (in_flight) or the recent-result memo (memo)",
+    ("page", "source")
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "dse_parse_seconds", "Time spent parsing one fetched page", ("module",)
+)
+DB_CONNECT_SECONDS = REGISTRY.histogram(
+    "dse_db_connect_seconds", "Time to open a database connection"
+)
+DB_INSERT_SECONDS = REGISTRY.histogram(
+    "dse_db_insert_seconds", "Time spent deleting and inserting rows of one write", ("table",)
+)
+DB_COMMIT_SECONDS = REGISTRY.histogram(
+    "dse_db_commit_seconds", "Time spent committing one write transaction", ("table",)
+)
+DB_ROWS_WRITTEN = REGISTRY.counter(
+    "dse_db_rows_written_total", "Rows committed to the database", ("table",)
+)
+ENGINE_QUEUE_DEPTH = REGISTRY.gauge(
+    "dse_engine_queue_depth", "Tasks submitted to an engine pool but not started yet", ("module",)
+)
+ENGINE_IN_FLIGHT = REGISTRY.gauge(
+    "dse_engine_tasks_in_flight", "Engine tasks currently running", ("module",)
+)
+ENGINE_RUN_SECONDS = REGISTRY.histogram(
+    "dse_engine_run_seconds", "Wall-clock duration of engine runs", ("module",), buckets=RUN_BUCKETS
+)
+ENGINE_RUNS = REGISTRY.counter(
+    "dse_engine_runs_total", "Finished engine runs by outcome", ("module", "outcome")
+)
+
+
+def page_label(url):
+    """Label a URL by its page name, e.g. displayCompany.php, to keep label cardinality low"""
+    path = urlparse(url).path
+    return path.rsplit('/', 1)[-1] or '/'
@@ -0,0 +1,53 @@
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .registry import REGISTRY
+
+DEFAULT_PORT = 9108
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+    
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stderr
+        pass
+
+
+class MetricsServer:
+    """Serves a metrics registry at /metrics from a background thread"""
+    
+    def __init__(self, registry=REGISTRY, host='127.0.0.1', port=None):
+        self.registry = registry
+        self.host = host
+        self.port = int(port if port is not None else os.getenv("METRICS_PORT", DEFAULT_PORT))
+        self._server = None
+    
+    def start(self):
+        """Start serving; returns False if the port cannot be bound"""
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': self.registry})
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError:
+            return False
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return True
+    
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
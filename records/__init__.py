@@ -0,0 +1,9 @@
+# Make this directory a Python package
+from .record_types import (
+    CompanyRecord, SectorRecord, SectorSymbolRecord, ShareRecord, CompanyFundamentalsRecord,
+    CompanyFinancialsRecord, PERecord, ArchiveRecord, MarketDepthRecord
+)
+from .record_batch import RecordBatch
+
+__all__ = ["CompanyRecord", "SectorRecord", "SectorSymbolRecord", "ShareRecord", "CompanyFundamentalsRecord",
+           "CompanyFinancialsRecord", "PERecord", "ArchiveRecord", "MarketDepthRecord", "RecordBatch"]
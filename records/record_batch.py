@@ -0,0 +1,71 @@
+from datetime import datetime
+from itertools import repeat
+
+import pandas as pd
+
+
+class RecordBatch:
+    """Column-oriented batch of records of one type sharing a single run timestamp
+    
+    Values are appended column by column and the timestamp (the last field of
+    the record type) is stored once for the whole batch. The batch is a
+    sequence of row tuples, so executemany, the validation stage and the
+    snapshot store take it as it is; to_frame() and to_parquet() hand the
+    columns to pandas without building a row first.
+    """
+    
+    __slots__ = ("record_type", "fields", "timestamp", "columns")
+    
+    def __init__(self, record_type, timestamp=None):
+        self.record_type = record_type
+        self.fields = record_type._fields
+        self.timestamp = timestamp or datetime.now()
+        self.columns = tuple([] for _ in self.fields[:-1])
+    
+    def append(self, *values):
+        """Add one record given its values without the timestamp"""
+        for column, value in zip(self.columns, values):
+            column.append(value)
+    
+    def extend(self, other):
+        """Add every record of another batch of the same type; this batch keeps its own timestamp"""
+        for column, values in zip(self.columns, other.columns):
+            column.extend(values)
+    
+    def __len__(self):
+        return len(self.columns[0])
+    
+    def __iter__(self):
+        # Rows are produced one at a time for the consumer, never stored
+        return zip(*self.columns, repeat(self.timestamp, len(self)))
+    
+    def __getitem__(self, position):
+        return self.record_type(*(column[position] for column in self.columns), self.timestamp)
+    
+    def column(self, position):
+        """Return the values of one field; the timestamp is repeated for every record"""
+        if position == len(self.columns):
+            return [self.timestamp] * len(self)
+        return self.columns[position]
+    
+    def take(self, positions):
+        """Return a new batch with the records at the given positions"""
+        batch = RecordBatch(self.record_type, self.timestamp)
+        for source, target in zip(self.columns, batch.columns):
+            target.extend(source[position] for position in positions)
+        return batch
+    
+    def records(self):
+        """Return the batch as a list of record tuples"""
+        return [self.record_type(*row) for row in self]
+    
+    def to_frame(self):
+        """Return the batch as a pandas DataFrame with one column per field"""
+        frame = pd.DataFrame(dict(zip(self.fields, self.columns)))
+        frame[self.fields[-1]] = self.timestamp
+        return frame
+    
+    def to_parquet(self, path):
+        """Write the batch to a Parquet file; needs pyarrow (or fastparquet) installed"""
+        self.to_frame().to_parquet(path, index=False)
+        return path
@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+
+# Field order is the INSERT column order of the target table, so records
+# go to executemany as they are. The run timestamp is always the last field.
+
+class CompanyRecord(NamedTuple):
+    """One row of Company_Information"""
+    company_symbol: str
+    company_name: str
+    is_active: int
+    last_updated: datetime
+
+
+class SectorRecord(NamedTuple):
+    """One row of Sector_Information"""
+    sector_code: str
+    sector_name: str
+    is_active: int
+    last_updated: datetime
+
+
+class SectorSymbolRecord(NamedTuple):
+    """One row of Sector_Symbol"""
+    sector_code: str
+    company: str
+    last_updated: datetime
+
+
+class ShareRecord(NamedTuple):
+    """One row of Symbol_Share; holdings are percentages, None when missing"""
+    company: str
+    total_share: Optional[int]
+    sponsor: Optional[float]
+    govt: Optional[float]
+    institute: Optional[float]
+    foreign: Optional[float]
+    public: Optional[float]
+    scraping_date: datetime
+
+
+class CompanyFundamentalsRecord(NamedTuple):
+    """One row of Company_Fundamentals; capital and market cap in BDT million"""
+    company: str
+    authorized_capital: Optional[float]
+    paid_up_capital: Optional[float]
+    face_value: Optional[float]
+    market_lot: Optional[int]
+    market_cap: Optional[float]
+    listing_year: Optional[int]
+    market_category: Optional[str]
+    sector: Optional[str]
+    scraped_at: datetime
+
+
+class CompanyFinancialsRecord(NamedTuple):
+    """One row of Company_Financials; dividends as shown on the page, e.g. "10%, 2023" """
+    company: str
+    year_end: Optional[str]
+    eps: Optional[float]
+    nav_per_share: Optional[float]
+    cash_dividend: Optional[str]
+    stock_dividend: Optional[str]
+    last_agm: Optional[str]
+    scraped_at: datetime
+
+
+class PERecord(NamedTuple):
+    """One row of pe_data; ratios are None when the page shows N/A"""
+    sl: str
+    trade_code: str
+    close_price: Optional[float]
+    ycp: Optional[float]
+    pe_1_basic: Optional[float]
+    pe_2_diluted: Optional[float]
+    pe_3_basic: Optional[float]
+    pe_4_diluted: Optional[float]
+    pe_5: Optional[float]
+    pe_6: Optional[float]
+    updated_at: datetime
+
+
+class ArchiveRecord(NamedTuple):
+    """One row of day_end_archive"""
+    trade_date: date
+    trading_code: str
+    ltp: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    openp: Optional[float]
+    closep: Optional[float]
+    ycp: Optional[float]
+    trade: Optional[int]
+    value_mn: Optional[float]
+    volume: Optional[int]
+    scraped_at: datetime
+
+
+class MarketDepthRecord(NamedTuple):
+    """One price level of a market depth ladder in market_depth; side is "B" (bid) or "S" (ask)"""
+    trading_code: str
+    side: str
+    level: int
+    price: float
+    volume: int
+    tick_time: datetime
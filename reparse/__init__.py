@@ -0,0 +1,4 @@
+# Make this directory a Python package
+from .pipeline import ReparsePipeline, DatabaseWriter, ParquetWriter
+
+__all__ = ["ReparsePipeline", "DatabaseWriter", "ParquetWriter"]
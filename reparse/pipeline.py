@@ -0,0 +1,309 @@
+import os
+import sys
+import time
+import logging
+import threading
+import multiprocessing
+from datetime import datetime
+
+import pandas as pd
+
+from fetcher.page_archive import read_archive, parse_key, load_page
+from spec.spec_scraper import SpecScraper
+from spec.specs import SPECS
+
+# Module name for logging
+MODULE_NAME = "reparse"
+
+# Pages handed to a worker process at a time
+DEFAULT_CHUNK_SIZE = 32
+
+# Rows (or pages) buffered before they are written and their pages checkpointed
+DEFAULT_BATCH_SIZE = 50000
+
+# Seconds between two progress lines
+PROGRESS_SECONDS = 5.0
+
+# Parsers of a worker process, one per spec, and their logger
+_scrapers = {}
+_worker_logger = None
+
+
+def _init_worker():
+    """Silence the parser log of a worker; parse errors are reported to the pipeline instead"""
+    global _worker_logger
+    _worker_logger = logging.getLogger(f"{MODULE_NAME}.worker")
+    _worker_logger.addHandler(logging.NullHandler())
+    _worker_logger.propagate = False
+
+
+def _parse_page(task):
+    """Parse one archived page in a worker process
+    
+    Returns:
+        tuple: (key, rows per spec in spec.datasets order, or None on error, error message)
+    """
+    key, payload = task
+    try:
+        page = parse_key(key)
+        scraper = _scrapers.get(page.spec_name)
+        if scraper is None:
+            scraper = _scrapers[page.spec_name] = SpecScraper(_worker_logger, SPECS[page.spec_name])
+        datasets = scraper.parse_datasets(load_page(payload), page.item, timestamp=page.fetched_at)
+        if scraper.spec.replace_column is not None and datasets[0] is not None:
+            # Like a backfill shard, a page replaces exactly the range it was fetched for
+            datasets[0] = scraper.in_range(datasets[0], *scraper.spec.item_range(page.item))
+        # None marks a dataset whose table is missing from the page
+        return key, [None if batch is None else list(batch) for batch in datasets], None
+    except Exception as e:
+        return key, None, str(e)
+
+
+class DatabaseWriter:
+    """Appends re-parsed rows to the tables of their specs through the bulk insert path
+    
+    Only history tables (spec.replace False) are accepted. The others are
+    deleted and reloaded by every engine run, so history appended to them
+    would mix with the current rows and be wiped by the next run. Rows of a
+    table loaded in ranges (spec.replace_column) replace their range instead.
+    """
+    
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._prepared = set()
+    
+    @staticmethod
+    def accepts(spec):
+        return not spec.replace
+    
+    def write(self, spec, rows, replace_range=None):
+        if not self.accepts(spec):
+            raise ValueError(f"{spec.table} is replaced by every run; re-parse it to Parquet")
+        if spec.ensure_table and spec.table not in self._prepared:
+            if not self.db_manager.prepare_table(getattr(self.db_manager, spec.ensure_table)):
+                raise RuntimeError(f"Could not prepare the {spec.table} table")
+            self._prepared.add(spec.table)
+        if replace_range is not None:
+            stored = self.db_manager.store_data(rows, spec.insert_query, table_name=spec.table,
+                                                replace_range=(spec.replace_column,) + tuple(replace_range))
+        else:
+            # History is appended: no table_name, so nothing is deleted first
+            stored = self.db_manager.store_data(rows, spec.insert_query)
+        if not stored:
+            raise RuntimeError(f"Could not write {len(rows)} rows to {spec.table}")
+        return len(rows)
+
+
+class ParquetWriter:
+    """Writes re-parsed rows to <directory>/<table>/<job start>-<part>.parquet; needs pyarrow"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        # Files of a resumed job sort after those of the run it continues
+        self.prefix = datetime.now().strftime('%Y%m%d%H%M%S')
+        self.parts = 0
+    
+    @staticmethod
+    def accepts(spec):
+        return True
+    
+    def write(self, spec, rows, replace_range=None):
+        table_directory = os.path.join(self.directory, spec.table)
+        os.makedirs(table_directory, exist_ok=True)
+        self.parts += 1
+        path = os.path.join(table_directory, f"{self.prefix}-{self.parts:05d}.parquet")
+        pd.DataFrame.from_records(rows, columns=spec.record_type._fields).to_parquet(path, index=False)
+        return len(rows)
+
+
+class ReparsePipeline:
+    """Re-parses archived pages with the current specs in a pool of worker processes
+    
+    Pages are streamed from a PageArchive directory or a tarball of one,
+    parsed by every extractor of their spec, and written in batches through a
+    DatabaseWriter or ParquetWriter. Records keep the download time of their
+    page. A page is checkpointed once its rows are written, so re-running a
+    stopped job skips the pages it finished. Pages that fail to parse, or
+    lack the table of their spec, are logged and not checkpointed, so they
+    are retried by the next run. Pages of a spec loaded in ranges are written
+    one range at a time, the latest download of a range winning.
+    """
+    
+    def __init__(self, logger, source, writer, checkpoint, spec_names=None, tables=None,
+                 workers=None, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            source (str): Archive directory or tarball
+            writer: DatabaseWriter or ParquetWriter
+            checkpoint (PageCheckpoint): Pages written by earlier runs of the job
+            spec_names (list): Re-parse only the pages of these specs (default: every spec)
+            tables (list): Write only these tables (default: every table of the specs)
+        
+        Raises:
+            ValueError: If the writer does not accept one of the tables to write
+        """
+        self.logger = logger
+        self.source = source
+        self.writer = writer
+        self.checkpoint = checkpoint
+        self.spec_names = set(spec_names or SPECS)
+        self.tables = set(tables) if tables else None
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.stats = {
+            "pages_total": None, "pages_parsed": 0, "pages_failed": 0, "pages_resumed": 0,
+            "pages_ignored": 0, "rows_written": {}, "wall_seconds": 0.0,
+        }
+        self._buffers = {}
+        # Rows of range-replaced tables by (dataset name, range): (dataset, range, download time, rows)
+        self._ranges = {}
+        self._buffered = 0
+        self._pending = {}
+        self._started = None
+        refused = sorted({dataset.table for dataset in self.datasets() if not writer.accepts(dataset)})
+        if refused:
+            raise ValueError(
+                f"{', '.join(refused)} are replaced by every engine run and cannot be appended to; "
+                f"re-parse them with --parquet, or leave them out with --spec or --table"
+            )
+    
+    def datasets(self):
+        """Return the specs and extractors whose rows the job writes"""
+        return [dataset for name in sorted(self.spec_names & set(SPECS)) for dataset in SPECS[name].datasets
+                if self.tables is None or dataset.table in self.tables]
+    
+    def _pages(self):
+        """Return the archived pages to parse: a list for a directory, a one-pass stream for a tarball"""
+        pages = read_archive(self.source)
+        if os.path.isdir(self.source):
+            pages = list(pages)
+            self.stats["pages_total"] = len(pages)
+        return pages
+    
+    def _tasks(self, pages, window, stopping):
+        """Yield the pages still to parse, at most `window` ahead of the collected results
+        
+        The pool reads this generator in its own thread; the window bounds how many
+        tarball pages are held in memory at once.
+        """
+        done = self.checkpoint.done_pages()
+        for key, payload in pages:
+            try:
+                spec_name = parse_key(key).spec_name
+            except ValueError:
+                spec_name = None
+            if spec_name not in self.spec_names or spec_name not in SPECS:
+                self.stats["pages_ignored"] += 1
+                continue
+            if key in done:
+                self.stats["pages_resumed"] += 1
+                continue
+            window.acquire()
+            if stopping.is_set():
+                return
+            yield key, payload
+    
+    def run(self):
+        """Re-parse the archive and return the run statistics"""
+        self._started = time.perf_counter()
+        window = threading.Semaphore(self.workers * self.chunk_size * 4)
+        stopping = threading.Event()
+        last_progress = self._started
+        self.logger.info(f"Re-parsing {self.source} with {self.workers} workers")
+        
+        with multiprocessing.Pool(self.workers, initializer=_init_worker) as pool:
+            try:
+                tasks = self._tasks(self._pages(), window, stopping)
+                for key, datasets, error in pool.imap_unordered(_parse_page, tasks, chunksize=self.chunk_size):
+                    window.release()
+                    if datasets is None:
+                        self.stats["pages_failed"] += 1
+                        self.logger.error(f"Error parsing archived page {key}: {error}")
+                    elif datasets[0] is None:
+                        # Without the spec's own table the page is not what it was saved as
+                        self.stats["pages_failed"] += 1
+                        self.logger.error(f"Archived page {key} lacks the table of its spec; not checkpointed")
+                    else:
+                        self._collect(key, datasets)
+                    if self._buffered >= self.batch_size or len(self._pending) >= self.batch_size:
+                        self._flush()
+                    if time.perf_counter() - last_progress >= PROGRESS_SECONDS:
+                        last_progress = time.perf_counter()
+                        self.report_progress()
+                self._flush()
+            finally:
+                # Unblock the task generator so the pool can shut down after an error
+                stopping.set()
+                for _ in range(self.workers * self.chunk_size * 4):
+                    window.release()
+        
+        self.stats["wall_seconds"] = round(time.perf_counter() - self._started, 3)
+        self.report_progress()
+        return self.summary()
+    
+    def _collect(self, key, datasets):
+        """Buffer the rows of one parsed page"""
+        spec = SPECS[parse_key(key).spec_name]
+        rows = 0
+        for dataset, records in zip(spec.datasets, datasets):
+            if not records or (self.tables is not None and dataset.table not in self.tables):
+                continue
+            if dataset.replace_column is not None:
+                page = parse_key(key)
+                replace_range = dataset.item_range(page.item)
+                buffered = self._ranges.get((dataset.name, replace_range))
+                if buffered is not None:
+                    if buffered[2] > page.fetched_at:
+                        continue
+                    self._buffered -= len(buffered[3])
+                self._ranges[(dataset.name, replace_range)] = (dataset, replace_range, page.fetched_at, list(records))
+            else:
+                self._buffers.setdefault(dataset.name, (dataset, []))[1].extend(records)
+            rows += len(records)
+        self._pending[key] = rows
+        self._buffered += rows
+        self.stats["pages_parsed"] += 1
+    
+    def _flush(self):
+        """Write the buffered rows, then checkpoint their pages"""
+        for dataset, rows in self._buffers.values():
+            if rows:
+                written = self.writer.write(dataset, rows)
+                self.stats["rows_written"][dataset.table] = self.stats["rows_written"].get(dataset.table, 0) + written
+        for dataset, replace_range, fetched_at, rows in self._ranges.values():
+            written = self.writer.write(dataset, rows, replace_range=replace_range)
+            self.stats["rows_written"][dataset.table] = self.stats["rows_written"].get(dataset.table, 0) + written
+        if self._pending:
+            self.checkpoint.mark_done(self._pending)
+        self._buffers = {}
+        self._ranges = {}
+        self._buffered = 0
+        self._pending = {}
+    
+    def report_progress(self):
+        """Log and print pages done, throughput and, for a directory, the remaining time"""
+        elapsed = time.perf_counter() - self._started
+        parsed = self.stats["pages_parsed"] + self.stats["pages_failed"]
+        rate = parsed / elapsed if elapsed else 0.0
+        total = self.stats["pages_total"]
+        line = f"{parsed} pages parsed"
+        if total is not None:
+            remaining = total - self.stats["pages_resumed"] - self.stats["pages_ignored"]
+            line = f"{parsed}/{remaining} pages parsed"
+            if rate and remaining > parsed:
+                line += f", {(remaining - parsed) / rate:.0f}s left"
+        line += f", {rate:.0f} pages/s, {sum(self.stats['rows_written'].values())} rows written"
+        if self.stats["pages_failed"]:
+            line += f", {self.stats['pages_failed']} failed"
+        self.logger.info(line)
+        print(line, file=sys.stderr, flush=True)
+    
+    def summary(self):
+        """Return the statistics of the run with the throughput"""
+        summary = dict(self.stats, workers=self.workers)
+        seconds = summary["wall_seconds"]
+        rows = sum(summary["rows_written"].values())
+        summary["pages_per_second"] = round(summary["pages_parsed"] / seconds, 2) if seconds else 0.0
+        summary["rows_per_second"] = round(rows / seconds, 2) if seconds else 0.0
+        return summary
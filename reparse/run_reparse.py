@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+# Import from parent directory so the pipeline can run as a standalone process
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from checkpoint.page_checkpoint import PageCheckpoint
+from reparse.pipeline import (
+    MODULE_NAME, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_SIZE, ReparsePipeline, DatabaseWriter, ParquetWriter
+)
+from spec.specs import SPECS
+
+
+def job_name(source, spec_names, target):
+    """Name the checkpoint of a job after its source, specs and output"""
+    signature = "|".join([os.path.abspath(source), ",".join(sorted(spec_names or [])), target])
+    return f"{MODULE_NAME}_{hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-parse archived DSE pages with the current specs")
+    parser.add_argument("source", help="page archive directory (RAW_PAGE_ARCHIVE_DIR) or a tarball of it")
+    parser.add_argument("--spec", dest="specs", action="append", choices=sorted(SPECS),
+                        help="re-parse only the pages of this spec; may be repeated")
+    parser.add_argument("--table", dest="tables", action="append",
+                        help="write only this table (e.g. Company_Fundamentals); may be repeated")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--parquet", help="write Parquet files under this directory instead of the database")
+    output.add_argument("--sqlite", help="append to this SQLite file instead of the SQL Server database in .env")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="pages per worker task")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows buffered before a write and checkpoint")
+    parser.add_argument("--state-dir", default=None, help="directory of the resume checkpoint")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and re-parse every page")
+    parser.add_argument("--report", help="write the JSON run statistics to this file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    from log.scraper_log import LoggerSetup
+    logger = LoggerSetup.setup_file_logger(MODULE_NAME)
+    
+    if args.parquet:
+        writer, target = ParquetWriter(args.parquet), f"parquet:{os.path.abspath(args.parquet)}"
+    elif args.sqlite:
+        from config.sqliteConfig import SQLiteDatabaseManager
+        writer, target = DatabaseWriter(SQLiteDatabaseManager(logger, args.sqlite)), f"sqlite:{os.path.abspath(args.sqlite)}"
+    else:
+        from config.dbConfig import DatabaseManager
+        from config.envConfig import EnvConfig
+        EnvConfig(logger)
+        writer, target = DatabaseWriter(DatabaseManager(logger)), "database"
+    
+    checkpoint = PageCheckpoint(logger, job_name(args.source, args.specs, target), state_dir=args.state_dir)
+    try:
+        pipeline = ReparsePipeline(logger, args.source, writer, checkpoint, spec_names=args.specs, tables=args.tables,
+                                   workers=args.workers, chunk_size=args.chunk_size, batch_size=args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.restart:
+        checkpoint.reset()
+    try:
+        summary = pipeline.run()
+    except KeyboardInterrupt:
+        print("Re-parse interrupted; finished pages are checkpointed", file=sys.stderr)
+        return 130
+    except Exception as e:
+        logger.error(f"Re-parse stopped: {str(e)}")
+        print(f"Re-parse stopped: {str(e)}; finished pages are checkpointed", file=sys.stderr)
+        return 1
+    
+    report = json.dumps(summary, indent=2)
+    if args.report:
+        with open(args.report, "w") as report_file:
+            report_file.write(report)
+    else:
+        print(report)
+    return 0 if not summary["pages_failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
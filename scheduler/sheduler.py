@@ -1,6 +1,10 @@
 import schedule
 import threading
 import time
+from datetime import timedelta
+
+# Scheduled runs must finish this long before the next one is due
+DEADLINE_MARGIN = timedelta(minutes=5)
 
 
 class ScraperScheduler:
@@ -23,7 +27,7 @@ class ScraperScheduler:
             
             self.is_active = True
             
-            self.job = schedule.every().day.at(scheduled_time).do(self.scrape_callback)# Clear existing schedule
+            self.job = schedule.every().day.at(scheduled_time).do(self.run_job)# Clear existing schedule
             
             
             # Start the scheduler in a background thread
@@ -44,6 +48,12 @@ class ScraperScheduler:
             schedule.cancel_job(self.job)  # Cancel only this job
         self.logger.info("Scheduler stopped")
     
+    def run_job(self):
+        """Run the scrape callback with a deadline so it cannot overlap the next run"""
+        period = self.job.period if self.job and self.job.period else timedelta(days=1)
+        deadline = period - DEADLINE_MARGIN
+        self.scrape_callback(deadline_seconds=deadline.total_seconds())
+    
     def run_scheduler(self):
         """Run the scheduler loop"""
         while self.is_active:
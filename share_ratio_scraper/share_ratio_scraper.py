@@ -4,159 +4,286 @@ import requests
 import concurrent.futures
 import threading
 import time
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-from datetime import datetime
-from bs4 import BeautifulSoup
 
 
 from log.scraper_log import LoggerSetup
 from scheduler.sheduler import ScraperScheduler
 from config.dbConfig import DatabaseManager
-from config.envConfig import EnvConfig
 from config.dbEdit import ConfigEditorWindow
+from checkpoint.run_checkpoint import RunCheckpoint
+from checkpoint.refresh_planner import RefreshPlanner
+from workqueue.broker import decode_result
+from workqueue.sqlite_broker import SQLiteTaskBroker
+from workqueue.worker import run_worker, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
 
 # Import from parent directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from BaseScraperApp import BaseScraperApp
 from BaseScraperEngine import BaseScraperEngine
+from metrics.instruments import ENGINE_QUEUE_DEPTH, ENGINE_IN_FLIGHT
+from spec import SpecScraper
+from spec.specs import SHARE_SPEC
 
 # Module name for logging
-MODULE_NAME = "share_ratio_scraper"
+MODULE_NAME = SHARE_SPEC.name
 
-class ShareScraper:
+class ShareScraper(SpecScraper):
     """Handles scraping company share data"""
     
-    def __init__(self, logger):
-        self.logger = logger
+    def __init__(self, logger, http_client=None):
+        super().__init__(logger, SHARE_SPEC, http_client)
     
     def scrape_company_data(self, company):
-        """Scrape data for a single company and return the parsed data"""
-        try:
-            url = f"https://www.dsebd.org/displayCompany.php?name={company}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=60)
-            
-            if response.status_code != 200:
-                self.logger.warning(f"Failed to fetch data for {company}: HTTP {response.status_code}")
-                return None
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract shareholding details
-            share_data = {
-                "Sponsor/Director": 0,
-                "Govt": 0,
-                "Institute": 0,
-                "Foreign_share": 0,
-                "Public": 0
-            }
-            
-            td_elements = soup.find_all('td', style="border:hidden;")
-            
-            for td in td_elements:
-                text = td.text.strip()
-                for key in share_data.keys():
-                    if f"{key}:" in text:
-                        value_text = text.split("\n")[-1].strip().replace("%", "")
-                        try:
-                            share_data[key] = float(value_text) if value_text else 0
-                        except ValueError:
-                            share_data[key] = 0
-            
-            # Extract total number of outstanding securities
-            total_share = 0
-            th_elements = soup.find_all('th')
-            
-            for th in th_elements:
-                if "Total No. of Outstanding Securities" in th.text:
-                    td = th.find_next_sibling("td")
-                    if td:
-                        total_share_text = td.text.strip().replace(",", "")
-                        try:
-                            total_share = int(total_share_text) if total_share_text.isdigit() else 0
-                        except ValueError:
-                            total_share = 0
-            
-            # Return data as a tuple
-            return (
-                company,
-                total_share,
-                share_data["Sponsor/Director"],
-                share_data["Govt"],
-                share_data["Institute"],
-                share_data["Foreign_share"],
-                share_data["Public"],
-                datetime.now()
-            )
-        except Exception as e:
-            self.logger.error(f"Error scraping data for {company}: {str(e)}")
+        """Scrape the page of a single company
+        
+        Returns:
+            tuple: The ShareRecord fields followed by the fields of each extractor's record
+                (see split_page_rows), or None if the page could not be scraped
+        """
+        datasets = self.scrape_datasets(company)
+        if not datasets or not datasets[0]:
             return None
+        # One flat row per company, so checkpoints and work-queue results carry every dataset;
+        # each company's row keeps its own timestamp and the engine merges attempts of one run
+        row = ()
+        for spec, records in zip(SHARE_SPEC.datasets, datasets):
+            row += tuple(records[0]) if records else (None,) * len(spec.record_type._fields)
+        return row
+
+
+def split_page_rows(rows):
+    """Split flat company page rows into the records of SHARE_SPEC and of each of its extractors
+    
+    Returns:
+        list: One list of records per spec in SHARE_SPEC.datasets order. Rows checkpointed
+            before an extractor existed are shorter and have no records of it.
+    """
+    datasets = [[] for _ in SHARE_SPEC.datasets]
+    for row in rows:
+        start = 0
+        for records, spec in zip(datasets, SHARE_SPEC.datasets):
+            width = len(spec.record_type._fields)
+            values = row[start:start + width]
+            start += width
+            # A missing company field means the extractor found nothing on the page
+            if len(values) == width and values[0] is not None:
+                records.append(spec.record_type(*values))
+    return datasets
 
 
 
 class ShareRatioScraperEngine(BaseScraperEngine):
     """Manages the core scraping process"""
     
+    # "resume" fetches the pending symbols of the latest run, "retry-failed" only its failures,
+    # "adaptive" only the symbols the refresh planner considers due,
+    # "distributed" shards the full run over work-queue worker processes
+    RUN_MODES = ("full", "resume", "retry-failed", "adaptive", "distributed")
+    
+    # Maximum number of company pages fetched by an adaptive run
+    REQUEST_BUDGET = 200
+    
+    # Times a distributed run restarts its local workers after they all died
+    WORKER_RESPAWNS = 2
+    # Seconds a distributed job may sit without a live worker and without progress before
+    # its queued tasks are failed; a lease period leaves remote workers time to join
+    STALL_SECONDS = DEFAULT_LEASE_SECONDS
+    
+    def __init__(self, logger, db_manager, scraper, state_dir=None, context=None):
+        super().__init__(logger, db_manager, scraper, context=context)
+        # state_dir overrides the checkpoint/state directory, e.g. for benchmark runs
+        self.checkpoint = RunCheckpoint(logger, MODULE_NAME, state_dir=state_dir)
+        self.refresh_planner = RefreshPlanner(logger, MODULE_NAME, state_dir=state_dir)
+        # Remote workers point at the same queue file through WORK_QUEUE_PATH
+        self.queue_path = os.getenv("WORK_QUEUE_PATH") or os.path.join(
+            self.checkpoint.state_dir, f"{MODULE_NAME}_queue.sqlite"
+        )
+        self.local_workers = int(os.getenv("WORK_QUEUE_LOCAL_WORKERS", "4"))
+    
+    def _prepare_run(self):
+        """Return the checkpoint run id and the companies to scrape for the current run mode"""
+        if self.run_mode in ("full", "adaptive", "distributed"):
+            companies = self.db_manager.fetch_company_list()
+            if not companies:
+                return None, []
+            if self.run_mode == "adaptive":
+                companies = self.refresh_planner.plan(companies, budget=self.REQUEST_BUDGET)
+            return self.checkpoint.start_run(companies, mode=self.run_mode), companies
+        
+        run_id = self.checkpoint.latest_run()
+        if run_id is None:
+            self.logger.error(f"No previous run to {self.run_mode}")
+            return None, []
+        
+        if self.run_mode == "resume":
+            companies = self.checkpoint.symbols_with_status(run_id, RunCheckpoint.PENDING)
+        else:
+            companies = self.checkpoint.symbols_with_status(run_id, RunCheckpoint.FAILED)
+        self.logger.info(f"Continuing run {run_id} in {self.run_mode} mode")
+        return run_id, companies
+    
+    def _record_result(self, run_id, company, result):
+        """Checkpoint the outcome of one company"""
+        self.run_stats.rows_fetched += 1
+        if result:
+            self.run_stats.rows_parsed += 1
+            self.checkpoint.mark_succeeded(run_id, company, result)
+            # Learn the change frequency from the shareholding values, not the timestamp
+            self.refresh_planner.observe(company, result, result[1:7])
+        else:
+            self.run_stats.failures += 1
+            self.checkpoint.mark_failed(run_id, company, "No data returned")
+    
+    def _run_distributed(self, run_id, companies):
+        """Enqueue companies as work-queue tasks and collect the results of the workers
+        
+        Starts local_workers worker processes on this machine; workers on other
+        nodes can join with: python -m workqueue.worker --queue <WORK_QUEUE_PATH>
+        The coordinator reclaims expired leases itself and restarts the local
+        workers if they all die. Queued tasks are failed once the job has
+        neither a live worker nor progress for STALL_SECONDS.
+        """
+        broker = SQLiteTaskBroker(self.queue_path)
+        broker.enqueue(run_id, companies)
+        self.logger.info(f"Enqueued {len(companies)} tasks for job {run_id} in {self.queue_path}")
+        
+        workers = self._start_workers(run_id)
+        respawns = 0
+        last_counts, last_change = None, time.monotonic()
+        try:
+            while broker.has_open_tasks(run_id):
+                if self.stop_requested():
+                    broker.cancel(run_id)
+                    self.logger.warning(f"Job {run_id} cancelled; open tasks withdrawn from the queue")
+                    break
+                # Workers reclaim expired leases when they lease; without live workers nobody would
+                broker.reclaim_expired(run_id, DEFAULT_MAX_ATTEMPTS)
+                counts = broker.counts(run_id)
+                ENGINE_QUEUE_DEPTH.labels(self.module_name).set(counts[broker.QUEUED])
+                ENGINE_IN_FLIGHT.labels(self.module_name).set(counts[broker.LEASED])
+                self.update_progress(counts[broker.DONE] + counts[broker.FAILED], len(companies))
+                if counts != last_counts:
+                    last_counts, last_change = counts, time.monotonic()
+                
+                if counts[broker.QUEUED] and not any(worker.is_alive() for worker in workers):
+                    if self.local_workers and respawns < self.WORKER_RESPAWNS:
+                        respawns += 1
+                        self.logger.warning(f"All local workers of job {run_id} exited; restarting them")
+                        workers = self._start_workers(run_id)
+                    elif not counts[broker.LEASED] and time.monotonic() - last_change >= self.STALL_SECONDS:
+                        failed = broker.fail_queued(run_id, "No live worker")
+                        self.logger.error(f"Job {run_id} stalled without live workers; {failed} queued tasks failed")
+                time.sleep(1)
+        finally:
+            for worker in workers:
+                if self.stop_requested():
+                    worker.terminate()
+                worker.join(timeout=10)
+        
+        # Every task is accounted for exactly once: only the final lease holder's result is stored
+        for company, result in broker.results(run_id):
+            self._record_result(run_id, company, decode_result(result))
+        for company, error in broker.failures(run_id):
+            self.run_stats.failures += 1
+            self.checkpoint.mark_failed(run_id, company, error)
+        counts = broker.counts(run_id)
+        self.logger.info(
+            f"Job {run_id}: {counts[broker.DONE]} done, {counts[broker.FAILED]} failed, "
+            f"{counts[broker.CANCELLED]} cancelled"
+        )
+    
+    def _start_workers(self, run_id):
+        """Start the local worker processes of a distributed job"""
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(self.queue_path, f"local-{i}", 5.0, run_id),
+                                    daemon=True)
+            for i in range(self.local_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        return workers
+    
+    def _carried_forward_rows(self, fresh_rows, listed):
+        """Return the last known rows of the listed companies an adaptive run did not refresh"""
+        refreshed = {row[0] for row in fresh_rows}
+        companies = [company for company in listed if company not in refreshed]
+        carried = self.refresh_planner.last_rows(companies)
+        self.run_stats.skipped_unchanged = len(carried)
+        self.logger.info(f"Carrying forward {len(carried)} unchanged companies from earlier runs")
+        return carried
+    
     def _execute_scraping(self):
         """Main function to scrape and store data for all companies"""
         self.logger.info("Starting scraping process")
         
-        try:
-            # Fetch company list
-            companies = self.db_manager.fetch_company_list()
-            if not companies:
-                self.logger.error("No companies found to scrape")
-                self.finish_scraping()
-                return
-            
-            total_companies = len(companies)
-            self.logger.info(f"Found {total_companies} companies to scrape")
-            
-            # Use ThreadPoolExecutor for parallel processing
-            company_shares = []
-            completed = 0
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                # Submit scraping tasks
-                future_to_company = {
-                    executor.submit(self.scraper.scrape_company_data, company): company 
-                    for company in companies
-                }
-                
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_company):
-                    result = future.result()
-                    if result:
-                        company_shares.append(result)
-                    
-                    completed += 1
-                    if self.progress_callback:
-                        self.progress_callback(completed, total_companies)
-            
-            # Store the scraped data
-            insert_query = """
-                INSERT INTO Symbol_Share 
-                (company, total_share, Sponsor, Govt, Institute, Foreign_share, public_share, scraping_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            self.db_manager.store_data(company_shares,insert_query,table_name="Symbol_Share")
+        run_id, companies = self._prepare_run()
+        if run_id and not companies:
+            self.logger.info(f"No companies to scrape in {self.run_mode} mode for run {run_id}")
+            return
+        if not companies:
+            self.logger.error("No companies found to scrape")
+            self.run_failed = True
+            return
+        
+        total_companies = len(companies)
+        self.logger.info(f"Found {total_companies} companies to scrape")
+        
+        # Scrape in parallel; a stop or deadline leaves unfinished companies pending
+        completed = 0
+        
+        def record_result(company, result):
+            nonlocal completed
+            self._record_result(run_id, company, result)
             
-            self.logger.info("Scraping process completed successfully")
-        except Exception as e:
-            self.logger.error(f"Error in scraping process: {str(e)}")
+            completed += 1
+            self.update_progress(completed, total_companies)
+        
+        with self.stage("fetch"):
+            if self.run_mode == "distributed":
+                self._run_distributed(run_id, companies)
+            else:
+                self.begin_layout_check(total_companies)
+                self.run_tasks(self.scraper.scrape_company_data, companies, record_result, max_workers=10)
+        if not self.should_store_results():
+            self.checkpoint.finish_run(run_id)
+            return
+        
+        # Merge the results of earlier attempts into this logical run
+        company_shares = self.checkpoint.results(run_id)
+        if self.checkpoint.run_mode(run_id) == "adaptive":
+            listed = self.db_manager.fetch_company_list()
+            company_shares += self._carried_forward_rows(company_shares, listed)
+            missing = len(set(listed) - {row[0] for row in company_shares})
+            if missing:
+                # Replacing the tables now would drop these companies; retry-failed completes the run
+                self.write_rejected = True
+                self.logger.error(
+                    f"No fresh or earlier row for {missing} of {len(listed)} companies; "
+                    f"the stored tables are unchanged until run {run_id} is completed with retry-failed"
+                )
+                return
+        
+        # Store the scraped data: share ratios, then the other datasets of the same pages
+        share_rows, *extracted = split_page_rows(company_shares)
+        self.write_rows(share_rows, SHARE_SPEC.insert_query, table_name=SHARE_SPEC.table)
+        for spec, rows in zip(SHARE_SPEC.extractors, extracted):
+            if rows:
+                self.write_spec_rows(spec, rows)
+        self.checkpoint.finish_run(run_id)
+        
+        self.logger.info("Scraping process completed successfully")
 
    
 
 class ScraperApp(BaseScraperApp):
     """Main application class with the UI"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, context=None):
         # Call the parent constructor
-        super().__init__(parent, title="Share Ratio Scraper Module",module_name=MODULE_NAME)
+        super().__init__(parent, title="Share Ratio Scraper Module",module_name=MODULE_NAME, context=context)
         
         # Set up the scraper components
         self.setup_scraper()
@@ -166,15 +293,9 @@ class ScraperApp(BaseScraperApp):
         
     def setup_scraper(self):
         """Set up specific scraper components"""
-        self.scraper = ShareScraper(self.logger)
-        self.scraper_engine = ShareRatioScraperEngine(self.logger, self.db_manager, self.scraper)
+        self.scraper = self.create_scraper()
+        self.scraper_engine = ShareRatioScraperEngine(self.logger, self.db_manager, self.scraper, context=self.context)
         
     def create_scraper(self):
         """Create and return the scraper instance"""
-        return ShareScraper(self.logger)
-
-
-# Create an initialization file for the module
-if not os.path.exists('__init__.py'):
-    with open('__init__.py', 'w') as f:
-        f.write('# Make this directory a Python package\n')
\ No newline at end of file
+        return ShareScraper(self.logger, self.http_client)
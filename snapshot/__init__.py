@@ -0,0 +1,5 @@
+# Make this directory a Python package
+from .snapshot_store import SnapshotStore, SNAPSHOTS
+from .api_server import SnapshotServer
+
+__all__ = ['SnapshotStore', 'SNAPSHOTS', 'SnapshotServer']
@@ -0,0 +1,89 @@
+import os
+import json
+import threading
+from urllib.parse import unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from .snapshot_store import SNAPSHOTS
+
+DEFAULT_PORT = 9109
+
+
+class _SnapshotHandler(BaseHTTPRequestHandler):
+    store = SNAPSHOTS
+    
+    def do_GET(self):
+        # Every resource changes only when the store version does
+        etag = f'"{self.store.info()["version"]}"'
+        parts = [unquote(part) for part in self.path.split('?')[0].strip('/').split('/') if part]
+        if parts == ['snapshot'] or not parts:
+            body = self.store.info()
+        elif len(parts) == 2 and parts[0] == 'symbols':
+            body = self.store.symbol(parts[1].upper())
+        elif parts == ['sectors']:
+            body = self.store.sectors()
+        elif len(parts) == 2 and parts[0] == 'sectors':
+            body = self.store.sector(parts[1])
+        else:
+            body = None
+        
+        if body is None:
+            self._send_json(404, {"error": "not found"})
+        elif self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+        else:
+            self._send_json(200, body, etag)
+    
+    def _send_json(self, status, body, etag=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        # Downstream services poll thousands of times a day
+        pass
+
+
+class SnapshotServer:
+    """Serves the latest snapshot as JSON from a background thread
+    
+    GET /snapshot            version, refresh time and row count of every dataset
+    GET /symbols/<symbol>    company, sector, share structure and PE of a symbol
+    GET /sectors             all sectors with their member counts
+    GET /sectors/<code>      one sector with its member symbols
+    
+    Responses carry the store version as ETag; If-None-Match returns 304.
+    """
+    
+    def __init__(self, store=SNAPSHOTS, host='127.0.0.1', port=None):
+        self.store = store
+        self.host = host
+        self.port = int(port if port is not None else os.getenv("SNAPSHOT_API_PORT", DEFAULT_PORT))
+        self._server = None
+    
+    def start(self):
+        """Start serving; returns False if the port cannot be bound"""
+        # Warm start from the snapshot file before the first request arrives
+        self.store.load()
+        handler = type('SnapshotHandler', (_SnapshotHandler,), {'store': self.store})
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError:
+            return False
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return True
+    
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
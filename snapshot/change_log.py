@@ -0,0 +1,132 @@
+import os
+import json
+import math
+import threading
+from datetime import datetime
+
+from .snapshot_store import application_path
+
+# Shareholding moves smaller than this many percentage points are not reported
+DEFAULT_SHARE_THRESHOLD = 0.5
+# PE ratio and price moves smaller than this fraction of the old value are not reported
+DEFAULT_PE_THRESHOLD = 0.05
+
+SHARE_FIELDS = ("sponsor", "govt", "institute", "foreign", "public")
+PE_FIELDS = ("close_price", "pe_1_basic", "pe_2_diluted", "pe_3_basic", "pe_4_diluted", "pe_5", "pe_6")
+
+
+def _value(table, name, position):
+    value = table.columns[name][position]
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def diff_tables(dataset, previous, current):
+    """Compare two snapshots of a dataset and return the changes as (change, key, field, old, new)
+    
+    Only symbols present in both snapshots are compared for value moves, so a
+    partial or adaptive run never reports the symbols it skipped as removed.
+    Listings and delistings come from the full company list.
+    """
+    share_threshold = float(os.getenv("CDC_SHARE_THRESHOLD", DEFAULT_SHARE_THRESHOLD))
+    pe_threshold = float(os.getenv("CDC_PE_THRESHOLD", DEFAULT_PE_THRESHOLD))
+    changes = []
+    
+    if dataset == "company":
+        for key in current.index.keys() - previous.index.keys():
+            changes.append(("listed", key, None, None, _value(current, "company_name", current.index[key])))
+        for key in previous.index.keys() - current.index.keys():
+            changes.append(("delisted", key, None, _value(previous, "company_name", previous.index[key]), None))
+        return sorted(changes, key=lambda change: change[1])
+    
+    if dataset == "sector":
+        for key in current.index.keys() - previous.index.keys():
+            changes.append(("sector_added", key, None, None, _value(current, "sector_name", current.index[key])))
+        for key in previous.index.keys() - current.index.keys():
+            changes.append(("sector_removed", key, None, _value(previous, "sector_name", previous.index[key]), None))
+    
+    for key, position in current.index.items():
+        old_position = previous.index.get(key)
+        if old_position is None:
+            continue
+        if dataset == "sector":
+            old, new = _value(previous, "sector_name", old_position), _value(current, "sector_name", position)
+            if old != new:
+                changes.append(("sector_renamed", key, "sector_name", old, new))
+        elif dataset == "sector_symbol":
+            old, new = _value(previous, "sector_code", old_position), _value(current, "sector_code", position)
+            if old != new:
+                changes.append(("sector_reassigned", key, "sector_code", old, new))
+        elif dataset == "share":
+            old, new = _value(previous, "total_share", old_position), _value(current, "total_share", position)
+            if old != new:
+                changes.append(("shares_outstanding_changed", key, "total_share", old, new))
+            for field in SHARE_FIELDS:
+                old, new = _value(previous, field, old_position), _value(current, field, position)
+                if (old is None) != (new is None) or (old is not None and abs(new - old) >= share_threshold):
+                    changes.append(("shareholding_changed", key, field, old, new))
+        elif dataset == "pe":
+            for field in PE_FIELDS:
+                old, new = _value(previous, field, old_position), _value(current, field, position)
+                if (old is None) != (new is None) or (
+                    old is not None and abs(new - old) >= pe_threshold * max(abs(old), 1e-9)
+                ):
+                    changes.append(("pe_changed", key, field, old, new))
+    return sorted(changes, key=lambda change: (change[1], change[0]))
+
+
+class ChangeLog:
+    """Append-only JSON Lines file of snapshot changes
+    
+    Every line is one change. Consumers tail the file from the byte offset
+    they stopped at, instead of re-reading the tables.
+    """
+    
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.Lock()
+    
+    @property
+    def path(self):
+        # Read at first use so CHANGE_LOG_PATH can be set by the benchmark or a service wrapper
+        if self._path is None:
+            self._path = os.getenv("CHANGE_LOG_PATH") or os.path.join(application_path, 'state', 'change_log.jsonl')
+        return self._path
+    
+    def append(self, events):
+        """Append events (dicts) to the file, flushed to disk before returning"""
+        if not events:
+            return
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in events)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with self._lock:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def build_events(run_stats, dataset, changes):
+    """Turn diff_tables output into change-log events of one run"""
+    detected_at = datetime.now().isoformat(" ", timespec="seconds")
+    return [
+        {
+            "run_id": run_stats.run_id,
+            "module": run_stats.module,
+            "dataset": dataset,
+            "change": change,
+            "key": key,
+            "field": field,
+            "old": old,
+            "new": new,
+            "detected_at": detected_at,
+        }
+        for change, key, field, old, new in changes
+    ]
+
+
+# Process-wide change log shared by all engines
+CHANGE_LOG = ChangeLog()
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Commits to these snapshot datasets change the sector aggregates
+SECTOR_SUMMARY_INPUTS = ("pe", "share", "sector_symbol")
+
+HOLDING_COLUMNS = ("sponsor", "govt", "institute", "foreign", "public")
+
+INSERT_QUERY = """
+    INSERT INTO Sector_Summary
+    (sector_code, sector_name, company_count, priced_count, market_cap, pe_median, pe_weighted,
+     sponsor, govt, institute, foreign_share, public_share, computed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _frame(table, columns):
+    """Return the given columns of a ColumnarTable as a DataFrame without copying row by row"""
+    return pd.DataFrame({name: np.asarray(table.columns[name]) for name in columns})
+
+
+def sector_summary_rows(store):
+    """Compute per-sector aggregates from the snapshot store
+    
+    For every sector in Sector_Symbol: company count, count of companies with a
+    price, market capitalisation (close price x shares outstanding), median and
+    market-cap weighted PE (total market cap / total earnings, positive basic
+    P/E 1 only) and shares-outstanding weighted average holdings.
+    
+    Returns:
+        list: Row tuples in Sector_Summary column order; empty without sector membership
+    """
+    membership = store.table("sector_symbol")
+    if membership is None or not len(membership):
+        return []
+    frame = _frame(membership, ("sector_code", "company")).rename(columns={"company": "symbol"})
+    
+    share = store.table("share")
+    if share is not None:
+        shares = _frame(share, ("company", "total_share") + HOLDING_COLUMNS).rename(columns={"company": "symbol"})
+        frame = frame.merge(shares.drop_duplicates("symbol", keep="last"), on="symbol", how="left")
+    else:
+        frame = frame.assign(total_share=np.nan, **{column: np.nan for column in HOLDING_COLUMNS})
+    
+    pe = store.table("pe")
+    if pe is not None:
+        ratios = _frame(pe, ("trade_code", "close_price", "pe_1_basic")).rename(columns={"trade_code": "symbol"})
+        frame = frame.merge(ratios.drop_duplicates("symbol", keep="last"), on="symbol", how="left")
+    else:
+        frame = frame.assign(close_price=np.nan, pe_1_basic=np.nan)
+    
+    total_share = frame["total_share"].astype(float).where(frame["total_share"] > 0)
+    frame["market_cap"] = frame["close_price"] * total_share
+    valid_pe = frame["pe_1_basic"].where(frame["pe_1_basic"] > 0)
+    frame["pe"] = valid_pe
+    # Weighted PE = sum(market cap) / sum(earnings), with earnings = market cap / PE
+    frame["pe_cap"] = frame["market_cap"].where(valid_pe.notna())
+    frame["earnings"] = frame["pe_cap"] / valid_pe
+    for column in HOLDING_COLUMNS:
+        frame[f"{column}_weighted"] = frame[column] * total_share
+        frame[f"{column}_weight"] = total_share.where(frame[column].notna())
+    
+    grouped = frame.groupby("sector_code", sort=True)
+    summary = pd.DataFrame({
+        "company_count": grouped["symbol"].nunique(),
+        "priced_count": grouped["close_price"].count(),
+        "market_cap": grouped["market_cap"].sum(min_count=1),
+        "pe_median": grouped["pe"].median(),
+        "pe_weighted": grouped["pe_cap"].sum(min_count=1) / grouped["earnings"].sum(min_count=1),
+    })
+    for column in HOLDING_COLUMNS:
+        summary[column] = grouped[f"{column}_weighted"].sum(min_count=1) / grouped[f"{column}_weight"].sum(min_count=1)
+    
+    sector = store.table("sector")
+    names = {code: (sector.lookup(code) or {}).get("sector_name") for code in summary.index} if sector is not None else {}
+    
+    computed_at = datetime.now()
+    # NaN (no data for a sector) is stored as NULL
+    summary = summary.astype(object).where(summary.notna(), None)
+    return [
+        (
+            code, names.get(code), int(row["company_count"]), int(row["priced_count"]),
+            row["market_cap"], row["pe_median"], row["pe_weighted"],
+            *(row[column] for column in HOLDING_COLUMNS),
+            computed_at
+        )
+        for code, row in summary.iterrows()
+    ]
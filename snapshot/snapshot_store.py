@@ -0,0 +1,289 @@
+import os
+import sys
+import math
+import pickle
+import threading
+from array import array
+from datetime import datetime
+
+# Get application path for executable support
+if getattr(sys, 'frozen', False):
+    # If the application is run as a bundle
+    application_path = os.path.dirname(sys.executable)
+else:
+    # If run as a normal Python script
+    application_path = os.path.dirname(os.path.abspath(__file__))
+
+# Header of the binary snapshot file; bump the version when the layout changes
+SNAPSHOT_MAGIC = b"DSESNAP1"
+
+# Column kinds: "f" float, "i" integer, "s" text, "t" timestamp (stored as ISO text)
+NUMERIC_TYPECODES = {"f": "d", "i": "q"}
+
+# Tables the engines write, mapped to (dataset, key column, [(column, kind), ...]) in INSERT order
+DATASETS = {
+    "Symbol_Share": ("share", "company", [
+        ("company", "s"), ("total_share", "i"), ("sponsor", "f"), ("govt", "f"), ("institute", "f"),
+        ("foreign", "f"), ("public", "f"), ("scraping_date", "t"),
+    ]),
+    "pe_data": ("pe", "trade_code", [
+        ("sl", "s"), ("trade_code", "s"), ("close_price", "f"), ("ycp", "f"), ("pe_1_basic", "f"),
+        ("pe_2_diluted", "f"), ("pe_3_basic", "f"), ("pe_4_diluted", "f"), ("pe_5", "f"), ("pe_6", "f"),
+        ("updated_at", "t"),
+    ]),
+    "Company_Information": ("company", "company_symbol", [
+        ("company_symbol", "s"), ("company_name", "s"), ("is_active", "i"), ("last_updated", "t"),
+    ]),
+    "Sector_Information": ("sector", "sector_code", [
+        ("sector_code", "s"), ("sector_name", "s"), ("is_active", "i"), ("last_updated", "t"),
+    ]),
+    "Sector_Symbol": ("sector_symbol", "company", [
+        ("sector_code", "s"), ("company", "s"), ("last_updated", "t"),
+    ]),
+    "Sector_Summary": ("sector_summary", "sector_code", [
+        ("sector_code", "s"), ("sector_name", "s"), ("company_count", "i"), ("priced_count", "i"),
+        ("market_cap", "f"), ("pe_median", "f"), ("pe_weighted", "f"), ("sponsor", "f"), ("govt", "f"),
+        ("institute", "f"), ("foreign", "f"), ("public", "f"), ("computed_at", "t"),
+    ]),
+}
+
+
+class ColumnarTable:
+    """Immutable column-oriented copy of one table with a hash index on its key column
+    
+    Numeric columns are packed into typed arrays (NaN / 0 stand in for NULL
+    floats / integers), text columns are lists of interned strings, so a few
+    thousand rows take a fraction of the memory of a list of dicts.
+    """
+    
+    def __init__(self, columns, key, rows):
+        self.names = [name for name, _ in columns]
+        self.kinds = [kind for _, kind in columns]
+        self.key = key
+        self.columns = {}
+        # A RecordBatch hands over its columns; plain rows are transposed
+        batch_column = getattr(rows, "column", None)
+        for position, (name, kind) in enumerate(columns):
+            values = batch_column(position) if batch_column else [row[position] for row in rows]
+            if kind in NUMERIC_TYPECODES:
+                self.columns[name] = array(NUMERIC_TYPECODES[kind], (self._number(value, kind) for value in values))
+            elif kind == "t":
+                # Rows of one run share a timestamp, so each distinct value is formatted once
+                formatted = {}
+                self.columns[name] = [self._timestamp(value, formatted) for value in values]
+            else:
+                self.columns[name] = [sys.intern(str(value)) if value is not None else None for value in values]
+        # Later rows win, like the last INSERT of a symbol in the table
+        self.index = {value: position for position, value in enumerate(self.columns[key])}
+    
+    @staticmethod
+    def _number(value, kind):
+        if value is None or value == "":
+            return math.nan if kind == "f" else 0
+        try:
+            return float(value) if kind == "f" else int(value)
+        except (TypeError, ValueError):
+            return math.nan if kind == "f" else 0
+    
+    @staticmethod
+    def _timestamp(value, formatted):
+        if not isinstance(value, datetime):
+            return value
+        text = formatted.get(value)
+        if text is None:
+            text = formatted[value] = value.isoformat(" ")
+        return text
+    
+    def __len__(self):
+        return len(self.columns[self.key])
+    
+    def row(self, position):
+        """Return one row as a dict, with NULL floats as None"""
+        record = {}
+        for name, kind in zip(self.names, self.kinds):
+            value = self.columns[name][position]
+            if kind == "f" and math.isnan(value):
+                value = None
+            record[name] = value
+        return record
+    
+    def lookup(self, key):
+        """Return the row of a key in O(1), or None"""
+        position = self.index.get(key)
+        return None if position is None else self.row(position)
+
+
+class SnapshotStore:
+    """Latest committed state of every engine table, held in memory
+    
+    Engines call refresh() after each successful commit. A refresh builds new
+    ColumnarTables and swaps them in under a lock, so readers never see a half
+    built snapshot. Every refresh bumps the version (used as the API ETag) and
+    persists the store to a binary file that is loaded on the next start.
+    """
+    
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+        self._persisted_version = 0
+        self._loaded = False
+        self.version = 0
+        self.tables = {}
+        self.refreshed_at = {}
+        self.sector_members = {}
+        self.symbol_sector = {}
+    
+    @property
+    def path(self):
+        # Read at first use so SNAPSHOT_PATH can be set by the benchmark or a service wrapper
+        if self._path is None:
+            self._path = os.getenv("SNAPSHOT_PATH") or os.path.join(application_path, 'state', 'latest.snapshot')
+        return self._path
+    
+    def load(self):
+        """Load the snapshot file once; a missing or unreadable file starts an empty store"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, 'rb') as f:
+                    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                        return
+                    state = pickle.load(f)
+                self.version = state["version"]
+                self.tables = state["tables"]
+                self.refreshed_at = state["refreshed_at"]
+                self._rebuild_sector_index()
+            except Exception:
+                # A corrupt snapshot is rebuilt by the next engine commits
+                self.version, self.tables, self.refreshed_at = 0, {}, {}
+    
+    def refresh(self, table_name, rows):
+        """Replace the snapshot of a table with the rows just committed to it
+        
+        Returns:
+            tuple: (dataset, previous ColumnarTable or None, new ColumnarTable),
+                or None if the table is not part of the snapshot
+        """
+        spec = DATASETS.get(table_name.strip("[]").split(".")[-1])
+        if spec is None:
+            return None
+        self.load()
+        dataset, key, columns = spec
+        table = ColumnarTable(columns, key, rows)
+        with self._lock:
+            previous = self.tables.get(dataset)
+            # Copy on write: readers keep working on the tables they already hold
+            self.tables = {**self.tables, dataset: table}
+            self.refreshed_at[dataset] = datetime.now().isoformat(" ", timespec="seconds")
+            self.version += 1
+            if dataset in ("sector", "sector_symbol"):
+                self._rebuild_sector_index()
+            state = {"version": self.version, "tables": self.tables, "refreshed_at": dict(self.refreshed_at)}
+        self._persist(state)
+        return dataset, previous, table
+    
+    def _rebuild_sector_index(self):
+        """Rebuild sector membership from Sector_Symbol; called with the lock held"""
+        members = {}
+        symbol_sector = {}
+        table = self.tables.get("sector_symbol")
+        if table is not None:
+            for sector_code, symbol in zip(table.columns["sector_code"], table.columns["company"]):
+                members.setdefault(sector_code, []).append(symbol)
+                symbol_sector[symbol] = sector_code
+        self.sector_members = {code: tuple(symbols) for code, symbols in members.items()}
+        self.symbol_sector = symbol_sector
+    
+    def _persist(self, state):
+        """Write the snapshot file atomically, never replacing it with an older state"""
+        with self._persist_lock:
+            if state["version"] <= self._persisted_version:
+                return
+            self._write_file(state)
+            self._persisted_version = state["version"]
+    
+    def _write_file(self, state):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+    
+    def table(self, dataset):
+        """Return the current ColumnarTable of a dataset, or None"""
+        self.load()
+        with self._lock:
+            return self.tables.get(dataset)
+    
+    def symbol(self, symbol):
+        """Return everything known about a symbol, or None if no table has it"""
+        self.load()
+        with self._lock:
+            tables = self.tables
+            sector_code = self.symbol_sector.get(symbol)
+        record = {"symbol": symbol}
+        for dataset in ("company", "share", "pe"):
+            table = tables.get(dataset)
+            record[dataset] = table.lookup(symbol) if table is not None else None
+        record["sector"] = None
+        if sector_code is not None:
+            sector = tables.get("sector")
+            record["sector"] = (sector.lookup(sector_code) if sector is not None else None) or {"sector_code": sector_code}
+        if not any(record[dataset] for dataset in ("company", "share", "pe", "sector")):
+            return None
+        return record
+    
+    def sectors(self):
+        """Return every sector with its member count"""
+        self.load()
+        with self._lock:
+            sector = self.tables.get("sector")
+            members = self.sector_members
+        codes = list(sector.columns["sector_code"]) if sector is not None else sorted(members)
+        result = []
+        for code in codes:
+            row = sector.lookup(code) if sector is not None else {"sector_code": code}
+            row["members"] = len(members.get(code, ()))
+            result.append(row)
+        return result
+    
+    def sector(self, sector_code):
+        """Return a sector with its member symbols and aggregates, or None"""
+        self.load()
+        with self._lock:
+            sector = self.tables.get("sector")
+            summary = self.tables.get("sector_summary")
+            symbols = self.sector_members.get(sector_code)
+        row = sector.lookup(sector_code) if sector is not None else None
+        if row is None and symbols is None:
+            return None
+        row = row or {"sector_code": sector_code}
+        row["symbols"] = list(symbols or ())
+        row["summary"] = summary.lookup(sector_code) if summary is not None else None
+        return row
+    
+    def info(self):
+        """Return the version, refresh times and row counts of the snapshot"""
+        self.load()
+        with self._lock:
+            return {
+                "version": self.version,
+                "datasets": {
+                    dataset: {"rows": len(table), "refreshed_at": self.refreshed_at.get(dataset)}
+                    for dataset, table in self.tables.items()
+                },
+            }
+
+
+# Process-wide store shared by all engines and the query API
+SNAPSHOTS = SnapshotStore()
@@ -0,0 +1,7 @@
+# Make this directory a Python package
+from .scraper_spec import ScraperSpec, FieldSpec
+from .spec_scraper import SpecScraper
+from .spec_engine import SpecEngine
+from .specs import SPECS
+
+__all__ = ["ScraperSpec", "FieldSpec", "SpecScraper", "SpecEngine", "SPECS"]
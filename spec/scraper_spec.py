@@ -0,0 +1,153 @@
+from datetime import datetime
+from typing import NamedTuple
+
+# Placeholders the DSE pages use for missing numbers
+BLANK_VALUES = ('', '-', '--', 'N/A', 'NA', 'n/a')
+
+# Parse modes: one record per matched link, per table row, or per page
+PARSE_MODES = ("links", "table", "page")
+
+
+def _text(value):
+    value = value.strip()
+    return None if value in BLANK_VALUES else value
+
+
+def _float(value):
+    value = value.replace(',', '').replace('%', '').strip()
+    if value in BLANK_VALUES:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _int(value):
+    number = _float(value)
+    return None if number is None else int(number)
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+# Type coercions of extracted text; unparseable values become None
+COERCIONS = {
+    "str": _text,
+    "float": _float,
+    "int": _int,
+    "date": _date,
+}
+
+
+class FieldSpec(NamedTuple):
+    """Where one record field comes from and how its text is converted
+    
+    Sources:
+        item: the fan-out item of the page (e.g. the sector code)
+        text: text of the matched link
+        href:<param>: query parameter of the matched link's href
+        const:<value>: a fixed value
+        column:<header>: cell of a table row under that header (case-insensitive)
+        label:<label>: last line of the page cell reading '<label>:'
+        th:<header>: cell next to the page's <th> containing the header
+    """
+    name: str
+    source: str
+    kind: str = "str"
+
+
+class ScraperSpec:
+    """Declarative description of one DSE page and the table it fills
+    
+    Args:
+        name (str): Module name, used as the logger and metrics label
+        url (str): Page path relative to DSE_BASE_URL; {item} is replaced by the fan-out item
+        record_type (type): Record NamedTuple; its last field is the run timestamp
+        fields (list): FieldSpec of every other record field, in record order
+        insert_query (str): INSERT statement of the target table
+        table (str): Target table; replaced as a whole on each run unless replace is False
+        mode (str): "links", "table" or "page" (see PARSE_MODES)
+        selector (str): CSS selector of the links, the table, or the page's label cells
+        header (str): For tables without a usable selector, a header the table must have
+        fan_out (str): DatabaseManager method returning the items to fetch a page for
+        required (tuple): Sources that must be present, or a row is skipped
+        timeout (int): Request timeout in seconds
+        hedged (bool): Hedge slow requests past the p95 latency
+        max_workers (int): Concurrent page downloads of a fan-out
+        replace (bool): Replace the whole table (False appends, e.g. for history tables)
+        replace_column (str): For a history table loaded in ranges, the field whose range
+            each load replaces; the fan-out item is then the (first, last) range
+        tab (str): Title of a generic application tab for the spec; the built-in pages
+            have modules of their own and leave it unset
+        extractors (tuple): Further specs of the same page, each filling its own table from
+            the page fetched and parsed for this spec (see SpecScraper.scrape_datasets)
+        ensure_table (str): DatabaseManager method creating the target table if it is missing
+    """
+    
+    def __init__(self, name, url, record_type, fields, insert_query, table, mode="links", selector=None,
+                 header=None, fan_out=None, required=(), timeout=30, hedged=False, max_workers=10, replace=True,
+                 replace_column=None, tab=None, extractors=(), ensure_table=None):
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode {mode!r} in spec {name}")
+        names = tuple(field.name for field in fields)
+        if names != record_type._fields[:-1]:
+            raise ValueError(f"Fields of spec {name} do not match {record_type.__name__}: {names}")
+        for field in fields:
+            if field.kind not in COERCIONS:
+                raise ValueError(f"Unknown type {field.kind!r} of field {field.name} in spec {name}")
+        for extractor in extractors:
+            if extractor.url != url:
+                raise ValueError(f"Extractor {extractor.name} of spec {name} reads another page: {extractor.url}")
+        self.name = name
+        self.url = url
+        self.record_type = record_type
+        self.fields = tuple(fields)
+        self.insert_query = insert_query
+        self.table = table
+        self.mode = mode
+        self.selector = selector
+        self.header = header
+        self.fan_out = fan_out
+        self.required = tuple(required)
+        self.timeout = timeout
+        self.hedged = hedged
+        self.max_workers = max_workers
+        self.replace = replace
+        self.replace_column = replace_column
+        self.tab = tab
+        self.extractors = tuple(extractors)
+        self.ensure_table = ensure_table
+    
+    def item_range(self, item):
+        """Return the (first, last) range of a range fan-out item, given as a pair or as archived ("first,last")"""
+        if isinstance(item, str):
+            kind = next(field.kind for field in self.fields if field.name == self.replace_column)
+            return tuple(COERCIONS[kind](part) for part in item.split(","))
+        first, last = item
+        return first, last
+    
+    @property
+    def datasets(self):
+        """This spec followed by its extractors, in the order scrape_datasets returns their records"""
+        return (self,) + self.extractors
+    
+    @property
+    def anchor(self):
+        """Layout feature the records hang off: the spec's table or selector, None for a whole page"""
+        if self.mode == "table":
+            return f"table:{self.selector or self.header}"
+        return f"select:{self.selector}" if self.selector else None
+    
+    @property
+    def page_sources(self):
+        """Sources read from the page itself, i.e. neither the fan-out item nor a constant"""
+        sources = dict.fromkeys([*(field.source for field in self.fields), *self.required])
+        return tuple(source for source in sources if source != "item" and not source.startswith("const:"))
+    
+    def __repr__(self):
+        return f"ScraperSpec({self.name!r}, {self.url!r} -> {self.table})"
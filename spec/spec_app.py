@@ -0,0 +1,26 @@
+from BaseScraperApp import BaseScraperApp
+from .spec_engine import SpecEngine
+from .spec_scraper import SpecScraper
+
+
+class SpecScraperApp(BaseScraperApp):
+    """Application tab for a spec that has no module of its own"""
+    
+    def __init__(self, parent, spec, context=None):
+        self.spec = spec
+        super().__init__(parent, title=f"{spec.tab} Module", module_name=spec.name, context=context)
+        
+        # Set up the scraper components
+        self.setup_scraper()
+        
+        # Complete initialization
+        self.complete_initialization()
+    
+    def setup_scraper(self):
+        """Set up the spec scraper and engine"""
+        self.scraper = self.create_scraper()
+        self.scraper_engine = SpecEngine(self.logger, self.db_manager, self.scraper, context=self.context)
+    
+    def create_scraper(self):
+        """Create and return the scraper instance"""
+        return SpecScraper(self.logger, self.spec, self.http_client)
@@ -0,0 +1,68 @@
+from BaseScraperEngine import BaseScraperEngine
+from records.record_batch import RecordBatch
+
+
+class SpecEngine(BaseScraperEngine):
+    """Runs the ScraperSpec of its SpecScraper
+    
+    Fetches the spec's page, or one page per fan-out item in parallel, merges
+    the parsed records into a single RecordBatch stamped with the run's start
+    time and writes it to the spec's table in one transaction. The records of
+    the spec's extractors, taken from the same pages, go to their own tables.
+    """
+    
+    def fan_out_items(self):
+        """Return the items to fetch a page for; [None] for a single-page spec"""
+        spec = self.scraper.spec
+        if spec.fan_out is None:
+            return [None]
+        return getattr(self.db_manager, spec.fan_out)()
+    
+    def _execute_scraping(self):
+        """Scrape every page of the spec and store the records"""
+        spec = self.scraper.spec
+        self.logger.info(f"Starting {spec.name} scraping process")
+        
+        items = self.fan_out_items()
+        if not items:
+            self.logger.error(f"No items to scrape from {spec.fan_out}")
+            self.run_failed = True
+            return
+        if spec.fan_out:
+            self.logger.info(f"Found {len(items)} pages to scrape")
+        
+        # One batch per table: the spec's own, then one per extractor of the same page
+        batches = [RecordBatch(dataset.record_type, timestamp=self.run_stats.started_at) for dataset in spec.datasets]
+        completed = 0
+        
+        def collect(item, datasets):
+            nonlocal completed
+            if datasets is None or datasets[0] is None:
+                self.run_stats.failures += 1
+            elif datasets[0]:
+                self.run_stats.rows_fetched += len(datasets[0])
+                self.run_stats.rows_parsed += len(datasets[0])
+            if datasets is not None:
+                for batch, records in zip(batches, datasets):
+                    if records:
+                        batch.extend(records)
+            
+            completed += 1
+            self.update_progress(completed, len(items))
+        
+        scrape = self.scraper.scrape_datasets if spec.extractors else lambda item: [self.scraper.scrape(item)]
+        self.begin_layout_check(len(items))
+        with self.stage("fetch"):
+            self.run_tasks(scrape, items, collect, max_workers=spec.max_workers)
+        if not self.should_store_results():
+            return
+        
+        if not batches[0]:
+            self.logger.warning(f"No {spec.table} rows scraped")
+            return
+        
+        for dataset, batch in zip(spec.datasets, batches):
+            if batch:
+                self.write_spec_rows(dataset, batch)
+        
+        self.logger.info(f"Scraping process completed successfully. Stored {len(batches[0])} {spec.table} rows.")
@@ -0,0 +1,274 @@
+import time
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from fetcher.http_client import HttpClient, RequestCancelled, dse_url
+from fetcher.page_archive import PageArchive
+from metrics.instruments import PARSE_SECONDS
+from records.record_batch import RecordBatch
+from .scraper_spec import COERCIONS
+
+# Only these elements are built into the tree in the list and table parse modes
+PARSE_ONLY = {"links": SoupStrainer("a"), "table": SoupStrainer("table")}
+
+
+class SpecScraper:
+    """Fetches and parses the pages described by a ScraperSpec"""
+    
+    def __init__(self, logger, spec, http_client=None):
+        self.logger = logger
+        self.spec = spec
+        self.http_client = http_client or HttpClient()
+        # Set by the engine so a stop request aborts in-flight downloads
+        self.cancel_event = None
+        # Set by the engine to check the layout of the first pages of a run (see LayoutCheck)
+        self.layout_check = None
+    
+    def url(self, item=None):
+        """Return the absolute URL of the page of a fan-out item"""
+        return dse_url(self.spec.url.format(item=item))
+    
+    def fetch(self, item=None):
+        """Download the page of one fan-out item
+        
+        Returns:
+            str: The page HTML, or None if it could not be fetched
+        """
+        label = f" for {item}" if item is not None else ""
+        try:
+            fetch = self.http_client.get_hedged if self.spec.hedged else self.http_client.get
+            response = fetch(self.url(item), timeout=self.spec.timeout, cancel_event=self.cancel_event)
+            
+            if response.status_code != 200:
+                self.logger.warning(f"Failed to fetch {self.spec.name} page{label}: HTTP {response.status_code}")
+                return None
+            
+            self._archive_page(item, response.text)
+            return response.text
+        except RequestCancelled:
+            # Stop was requested while downloading; the engine ignores this result
+            return None
+        except Exception as e:
+            self.logger.error(f"Error scraping {self.spec.name} page{label}: {str(e)}")
+            return None
+    
+    def _archive_page(self, item, html):
+        """Keep the raw page in RAW_PAGE_ARCHIVE_DIR, if set, for later re-parsing"""
+        archive = PageArchive.from_env()
+        if archive is None:
+            return
+        try:
+            archive.save(self.spec.name, item, html)
+        except Exception as e:
+            # A full disk must not cost the scraped data
+            self.logger.error(f"Error archiving {self.spec.name} page: {str(e)}")
+    
+    def scrape(self, item=None):
+        """Fetch and parse the page of one fan-out item
+        
+        Returns:
+            RecordBatch: Records of the page, or None if it could not be fetched or parsed
+        """
+        html = self.fetch(item)
+        if html is None:
+            return None
+        try:
+            return self.parse(html, item)
+        except Exception as e:
+            self.logger.error(f"Error parsing {self.spec.name} page{f' for {item}' if item is not None else ''}: {str(e)}")
+            return None
+    
+    def scrape_datasets(self, item=None):
+        """Fetch the page of one item once and extract the records of the spec and of each extractor
+        
+        The page is parsed into a single tree shared by all of them.
+        
+        Returns:
+            list: RecordBatch (None where a table is missing) per spec in spec.datasets order,
+                or None if the page could not be fetched or parsed
+        """
+        html = self.fetch(item)
+        if html is None:
+            return None
+        try:
+            return self.parse_datasets(html, item)
+        except Exception as e:
+            self.logger.error(f"Error parsing {self.spec.name} page{f' for {item}' if item is not None else ''}: {str(e)}")
+            return None
+    
+    def parse_datasets(self, html, item=None, timestamp=None):
+        """Parse a page into one RecordBatch (None where a table is missing) per spec in spec.datasets
+        
+        timestamp stamps the records instead of the current time, e.g. the download
+        time of an archived page.
+        """
+        specs = self.spec.datasets
+        parse_started = time.perf_counter()
+        modes = {spec.mode for spec in specs}
+        # Restrict the tree only when every extractor reads the same kind of element
+        parse_only = PARSE_ONLY.get(modes.pop()) if len(modes) == 1 else None
+        soup = BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+        self._check_layout(soup, item)
+        datasets = [self.extract(soup, item, spec, timestamp) for spec in specs]
+        PARSE_SECONDS.labels(self.spec.name).observe(time.perf_counter() - parse_started)
+        return datasets
+    
+    def parse(self, html, item=None):
+        """Parse a page into a RecordBatch, or None if its table is missing"""
+        parse_started = time.perf_counter()
+        soup = BeautifulSoup(html, 'html.parser', parse_only=PARSE_ONLY.get(self.spec.mode))
+        self._check_layout(soup, item)
+        batch = self.extract(soup, item)
+        PARSE_SECONDS.labels(self.spec.name).observe(time.perf_counter() - parse_started)
+        return batch
+    
+    def in_range(self, rows, first, last):
+        """Keep the rows whose spec.replace_column lies from first to last
+        
+        A load then replaces exactly its range. Of the rows with the same values in
+        the required fields (e.g. a date and trading code), the last one wins.
+        """
+        fields = self.spec.record_type._fields
+        position = fields.index(self.spec.replace_column)
+        keys = [fields.index(field.name) for field in self.spec.fields if field.source in self.spec.required]
+        positions = {}
+        for index, record in enumerate(zip(*(rows.column(key) for key in [position] + keys))):
+            if record[0] is not None and first <= record[0] <= last:
+                positions[record] = index
+        return rows.take(sorted(positions.values()))
+    
+    def _check_layout(self, soup, item):
+        """Report the layout of the page to the run's layout check while it is probing"""
+        check = self.layout_check
+        if check is not None and check.probing:
+            check.observe(item, self.layout_features(soup))
+    
+    def layout_features(self, soup):
+        """Return the layout features of a parsed page that the spec and its extractors read
+        
+        The anchor of a spec (its table or selector) is a feature when it matches,
+        and each of its page sources when it is found, whatever its value.
+        """
+        features = set()
+        for spec in self.spec.datasets:
+            sources = spec.page_sources
+            if spec.mode == "links":
+                links = soup.select(spec.selector)
+                if links:
+                    features.add(spec.anchor)
+                features.update(source for source in sources if any(self._link_value(link, source) for link in links))
+            elif spec.mode == "table":
+                table = self._find_table(spec, soup)
+                if table is None:
+                    continue
+                features.add(spec.anchor)
+                header_row = table.find('tr')
+                headers = {th.text.strip().upper() for th in header_row.find_all('th')} if header_row else set()
+                features.update(source for source in sources if source[len("column:"):].upper() in headers)
+            else:
+                labels = [cell.text.strip() for cell in soup.select(spec.selector)] if spec.selector else []
+                if labels:
+                    features.add(spec.anchor)
+                features.update(source for source in sources if self._page_value(soup, labels, source) is not None)
+        return features
+    
+    def extract(self, soup, item=None, spec=None, timestamp=None):
+        """Build the RecordBatch of a spec (this scraper's by default) from a parsed page"""
+        spec = spec or self.spec
+        batch = RecordBatch(spec.record_type, timestamp=timestamp or datetime.now())
+        
+        if spec.mode == "links":
+            for link in soup.select(spec.selector):
+                self._add(spec, batch, lambda source: self._link_value(link, source), item)
+        elif spec.mode == "table":
+            table = self._find_table(spec, soup)
+            if table is None:
+                self.logger.warning(f"{spec.name} table not found{f' for {item}' if item is not None else ''}")
+                return None
+            rows = table.find_all('tr')
+            headers = [th.text.strip().upper() for th in rows[0].find_all('th')] if rows else []
+            for tr in rows[1:]:
+                cells = [td.text.strip() for td in tr.find_all('td')]
+                # Rows with a different cell count are spacers or footers
+                if len(cells) != len(headers):
+                    continue
+                row = dict(zip(headers, cells))
+                self._add(spec, batch, lambda source: self._column_value(row, source), item)
+        else:
+            labels = [cell.text.strip() for cell in soup.select(spec.selector)] if spec.selector else []
+            self._add(spec, batch, lambda source: self._page_value(soup, labels, source), item)
+        
+        return batch
+    
+    def _add(self, spec, batch, extract, item):
+        """Append one record built with extract(source); skip it if a required source is missing"""
+        raw = {}
+        for source in spec.required:
+            raw[source] = value = self._source_value(source, extract, item)
+            if value is None or not str(value).strip():
+                return
+        values = []
+        for field in spec.fields:
+            value = raw[field.source] if field.source in raw else self._source_value(field.source, extract, item)
+            if isinstance(value, str):
+                value = COERCIONS[field.kind](value)
+                if value is None and field.source in raw:
+                    return
+            values.append(value)
+        batch.append(*values)
+    
+    @staticmethod
+    def _source_value(source, extract, item):
+        if source == "item":
+            return item
+        if source.startswith("const:"):
+            return source[len("const:"):]
+        return extract(source)
+    
+    @staticmethod
+    def _find_table(spec, soup):
+        if spec.selector:
+            return soup.select_one(spec.selector)
+        header = spec.header.upper()
+        for table in soup.find_all('table'):
+            header_row = table.find('tr')
+            if header_row and any(th.text.strip().upper() == header for th in header_row.find_all('th')):
+                return table
+        return None
+    
+    @staticmethod
+    def _link_value(link, source):
+        if source == "text":
+            return link.text.strip()
+        if source.startswith("href:"):
+            values = parse_qs(urlsplit(link.get('href', '')).query).get(source[len("href:"):])
+            return values[0] if values else None
+        raise ValueError(f"Source {source} is not available in links mode")
+    
+    @staticmethod
+    def _column_value(row, source):
+        if source.startswith("column:"):
+            return row.get(source[len("column:"):].upper())
+        raise ValueError(f"Source {source} is not available in table mode")
+    
+    @staticmethod
+    def _page_value(soup, labels, source):
+        if source.startswith("label:"):
+            marker = f"{source[len('label:'):]}:"
+            value = None
+            for text in labels:
+                if marker in text:
+                    value = text.split("\n")[-1].strip()
+            return value
+        if source.startswith("th:"):
+            header = source[len("th:"):]
+            value = None
+            for th in soup.find_all('th'):
+                if header in th.text:
+                    td = th.find_next_sibling("td")
+                    if td:
+                        value = td.text.strip()
+            return value
+        raise ValueError(f"Source {source} is not available in page mode")
@@ -0,0 +1,200 @@
+from records import (
+    CompanyRecord, SectorRecord, SectorSymbolRecord, ShareRecord, CompanyFundamentalsRecord,
+    CompanyFinancialsRecord, PERecord, ArchiveRecord
+)
+from .scraper_spec import ScraperSpec, FieldSpec as F
+
+# Every DSE page the application scrapes. A new page needs a record type
+# and an entry here; SpecScraper and SpecEngine do the rest.
+
+COMPANY_SPEC = ScraperSpec(
+    name="company_scraper",
+    url="company_listing.php",
+    record_type=CompanyRecord,
+    fields=[F("company_symbol", "href:name"), F("company_name", "text"), F("is_active", "const:1", "int")],
+    required=("href:name", "text"),
+    selector="a.ab1",
+    table="Company_Information",
+    insert_query="""
+        INSERT INTO Company_Information (company_symbol, company_name, isActive, last_updated)
+        VALUES (?, ?, ?, ?)
+    """,
+)
+
+SECTOR_SPEC = ScraperSpec(
+    name="sector_scraper",
+    url="by_industrylisting.php",
+    record_type=SectorRecord,
+    fields=[F("sector_code", "href:industryno"), F("sector_name", "text"), F("is_active", "const:1", "int")],
+    required=("href:industryno", "text"),
+    selector="a.ab1",
+    table="Sector_Information",
+    insert_query="""
+        INSERT INTO Sector_Information (sector_code, sector_name, isActive, last_updated)
+        VALUES (?, ?, ?, ?)
+    """,
+)
+
+SECTOR_COMPANY_SPEC = ScraperSpec(
+    name="sector_wise_company_scraper",
+    url="companylistbyindustry.php?industryno={item}",
+    fan_out="fetch_sector_code_list",
+    record_type=SectorSymbolRecord,
+    fields=[F("sector_code", "item"), F("company", "href:name")],
+    required=("href:name", "text"),
+    selector="a.ab1",
+    timeout=10,
+    table="Sector_Symbol",
+    insert_query="""
+        INSERT INTO Sector_Symbol (sector_code, company, last_updated)
+        VALUES (?, ?, ?)
+    """,
+)
+
+# The company page also carries the fundamentals below; they are extracted from
+# the page the share ratio scraper already fetches instead of a second download
+COMPANY_PAGE_URL = "displayCompany.php?name={item}"
+
+FUNDAMENTALS_SPEC = ScraperSpec(
+    name="company_fundamentals",
+    url=COMPANY_PAGE_URL,
+    record_type=CompanyFundamentalsRecord,
+    mode="page",
+    fields=[
+        F("company", "item"),
+        F("authorized_capital", "th:Authorized Capital", "float"),
+        F("paid_up_capital", "th:Paid-up Capital", "float"),
+        F("face_value", "th:Face/par Value", "float"),
+        F("market_lot", "th:Market Lot", "int"),
+        F("market_cap", "th:Market Capitalization", "float"),
+        F("listing_year", "th:Listing Year", "int"),
+        F("market_category", "th:Market Category"),
+        F("sector", "th:Sector"),
+    ],
+    table="Company_Fundamentals",
+    ensure_table="ensure_company_fundamentals_table",
+    insert_query="""
+        INSERT INTO Company_Fundamentals
+        (company, authorized_capital, paid_up_capital, face_value, market_lot, market_cap,
+         listing_year, market_category, sector, scraped_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+)
+
+FINANCIALS_SPEC = ScraperSpec(
+    name="company_financials",
+    url=COMPANY_PAGE_URL,
+    record_type=CompanyFinancialsRecord,
+    mode="page",
+    fields=[
+        F("company", "item"),
+        F("year_end", "th:Year End"),
+        F("eps", "th:EPS", "float"),
+        F("nav_per_share", "th:NAV Per Share", "float"),
+        F("cash_dividend", "th:Cash Dividend"),
+        F("stock_dividend", "th:Bonus Issue"),
+        F("last_agm", "th:Last AGM held on"),
+    ],
+    table="Company_Financials",
+    ensure_table="ensure_company_financials_table",
+    insert_query="""
+        INSERT INTO Company_Financials
+        (company, year_end, eps, nav_per_share, cash_dividend, stock_dividend, last_agm, scraped_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+)
+
+SHARE_SPEC = ScraperSpec(
+    name="share_ratio_scraper",
+    url=COMPANY_PAGE_URL,
+    fan_out="fetch_company_list",
+    record_type=ShareRecord,
+    mode="page",
+    # Holdings that are missing stay None so the validation stage can reject them
+    fields=[
+        F("company", "item"),
+        F("total_share", "th:Total No. of Outstanding Securities", "int"),
+        F("sponsor", "label:Sponsor/Director", "float"),
+        F("govt", "label:Govt", "float"),
+        F("institute", "label:Institute", "float"),
+        F("foreign", "label:Foreign", "float"),
+        F("public", "label:Public", "float"),
+    ],
+    selector='td[style="border:hidden;"]',
+    timeout=60,
+    # A few company pages stall for tens of seconds
+    hedged=True,
+    table="Symbol_Share",
+    extractors=(FUNDAMENTALS_SPEC, FINANCIALS_SPEC),
+    insert_query="""
+        INSERT INTO Symbol_Share
+        (company, total_share, Sponsor, Govt, Institute, Foreign_share, public_share, scraping_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+)
+
+PE_SPEC = ScraperSpec(
+    name="pe_scraper",
+    url="latest_PE.php",
+    record_type=PERecord,
+    mode="table",
+    fields=[
+        F("sl", "column:#"),
+        F("trade_code", "column:Trade Code"),
+        F("close_price", "column:Close Price", "float"),
+        F("ycp", "column:YCP", "float"),
+        F("pe_1_basic", "column:P/E 1*(Basic)", "float"),
+        F("pe_2_diluted", "column:P/E 2*(Diluted)", "float"),
+        F("pe_3_basic", "column:P/E 3*(Basic)", "float"),
+        F("pe_4_diluted", "column:P/E 4*(Diluted)", "float"),
+        F("pe_5", "column:P/E 5*", "float"),
+        F("pe_6", "column:P/E 6*", "float"),
+    ],
+    selector="table.shares-table",
+    timeout=10,
+    # pe_data keeps the history of every run
+    table="pe_data",
+    replace=False,
+    insert_query="""
+        INSERT INTO pe_data (SL, Trade_Price, Close_Price, YCP, PE_1_Basic, PE_2_Diluted,
+                            PE_3_Basic, PE_4_Diluted, PE_5, PE_6, DateTime)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+)
+
+ARCHIVE_SPEC = ScraperSpec(
+    name="archive_scraper",
+    # The fan-out item is a (start date, end date) shard
+    url="day_end_archive.php?startDate={item[0]}&endDate={item[1]}&inst=All%20Instrument&archive=data",
+    record_type=ArchiveRecord,
+    mode="table",
+    fields=[
+        F("trade_date", "column:DATE", "date"),
+        F("trading_code", "column:TRADING CODE"),
+        F("ltp", "column:LTP*", "float"),
+        F("high", "column:HIGH", "float"),
+        F("low", "column:LOW", "float"),
+        F("openp", "column:OPENP*", "float"),
+        F("closep", "column:CLOSEP*", "float"),
+        F("ycp", "column:YCP", "float"),
+        F("trade", "column:TRADE", "int"),
+        F("value_mn", "column:VALUE (MN)", "float"),
+        F("volume", "column:VOLUME", "int"),
+    ],
+    required=("column:DATE", "column:TRADING CODE"),
+    header="TRADING CODE",
+    timeout=60,
+    max_workers=4,
+    # Each shard replaces the rows of its trade dates
+    table="day_end_archive",
+    replace=False,
+    replace_column="trade_date",
+    insert_query="""
+        INSERT INTO day_end_archive
+        (trade_date, trading_code, ltp, high, low, openp, closep, ycp, trade, value_mn, volume, scraped_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+)
+
+# Specs by module name
+SPECS = {spec.name: spec for spec in (COMPANY_SPEC, SECTOR_SPEC, SECTOR_COMPANY_SPEC, SHARE_SPEC, PE_SPEC, ARCHIVE_SPEC)}
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from snapshot.change_log import diff_tables
+from snapshot.snapshot_store import DATASETS, ColumnarTable
+
+SCRAPED = datetime(2024, 1, 7, 10, 30)
+
+
+def table(name, rows):
+    dataset, key, columns = DATASETS[name]
+    return ColumnarTable(columns, key, rows)
+
+
+@pytest.fixture(autouse=True)
+def default_thresholds(monkeypatch):
+    monkeypatch.delenv("CDC_SHARE_THRESHOLD", raising=False)
+    monkeypatch.delenv("CDC_PE_THRESHOLD", raising=False)
+
+
+def test_company_listings_and_delistings():
+    previous = table("Company_Information", [("ACI", "ACI Limited", 1, SCRAPED), ("OLD", "Old Mills", 1, SCRAPED)])
+    current = table("Company_Information", [("ACI", "ACI Limited", 1, SCRAPED), ("NEW", "New Power", 1, SCRAPED)])
+    
+    assert diff_tables("company", previous, current) == [
+        ("listed", "NEW", None, None, "New Power"),
+        ("delisted", "OLD", None, "Old Mills", None),
+    ]
+
+
+def test_shareholding_moves_below_the_threshold_are_ignored():
+    previous = table("Symbol_Share", [("ACI", 1000, 40.0, 0.0, 20.0, 5.0, 35.0, SCRAPED)])
+    current = table("Symbol_Share", [("ACI", 1200, 41.0, 0.0, 20.2, None, 35.0, SCRAPED)])
+    
+    assert diff_tables("share", previous, current) == [
+        ("shareholding_changed", "ACI", "sponsor", 40.0, 41.0),
+        ("shareholding_changed", "ACI", "foreign", 5.0, None),
+        ("shares_outstanding_changed", "ACI", "total_share", 1000, 1200),
+    ]
+
+
+def test_symbols_missing_from_a_partial_run_are_not_reported():
+    previous = table("Symbol_Share", [
+        ("ACI", 1000, 40.0, 0.0, 20.0, 5.0, 35.0, SCRAPED),
+        ("BATBC", 500, 72.9, 0.0, 10.0, 5.0, 12.1, SCRAPED),
+    ])
+    current = table("Symbol_Share", [("ACI", 1000, 40.0, 0.0, 20.0, 5.0, 35.0, SCRAPED)])
+    
+    assert diff_tables("share", previous, current) == []
+
+
+def test_pe_moves_are_relative_to_the_old_value():
+    row = ("1", "ACI", 100.0, 99.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0, SCRAPED)
+    moved = ("1", "ACI", 104.0, 99.0, 11.0, 10.0, 10.0, 10.0, 10.0, 10.0, SCRAPED)
+    
+    assert diff_tables("pe", table("pe_data", [row]), table("pe_data", [moved])) == [
+        ("pe_changed", "ACI", "pe_1_basic", 10.0, 11.0),
+    ]
+
+
+def test_sector_renames_and_reassignments():
+    previous = table("Sector_Information", [("11", "Bank", 1, SCRAPED), ("12", "Cement", 1, SCRAPED)])
+    current = table("Sector_Information", [("11", "Banks", 1, SCRAPED), ("13", "Ceramics", 1, SCRAPED)])
+    
+    assert diff_tables("sector", previous, current) == [
+        ("sector_renamed", "11", "sector_name", "Bank", "Banks"),
+        ("sector_removed", "12", None, "Cement", None),
+        ("sector_added", "13", None, None, "Ceramics"),
+    ]
+    
+    previous = table("Sector_Symbol", [("11", "ACI", SCRAPED)])
+    current = table("Sector_Symbol", [("12", "ACI", SCRAPED)])
+    assert diff_tables("sector_symbol", previous, current) == [
+        ("sector_reassigned", "ACI", "sector_code", "11", "12"),
+    ]
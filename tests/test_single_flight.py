@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from fetcher.errors import RequestCancelled
+from fetcher.single_flight import SingleFlight
+
+URL = "http://dse.test/displayCompany.php?name=ACI"
+
+
+class Response:
+    status_code = 200
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def run_in_thread(flight, fetch):
+    """Call flight.fetch in a thread; returns the thread and a dict receiving its result or error"""
+    outcome = {}
+    
+    def call():
+        try:
+            outcome["response"] = flight.fetch(URL, fetch)
+        except BaseException as e:
+            outcome["error"] = e
+    
+    thread = threading.Thread(target=call)
+    thread.start()
+    return thread, outcome
+
+
+def lead_and_follow(flight, leader_fetch, follower_fetch):
+    """Start a leader blocked in leader_fetch, add a follower and release the leader"""
+    release = threading.Event()
+    
+    def blocked():
+        release.wait(5)
+        return leader_fetch()
+    
+    leader, leader_outcome = run_in_thread(flight, blocked)
+    wait_for(lambda: flight._calls)
+    follower, follower_outcome = run_in_thread(flight, follower_fetch)
+    wait_for(lambda: flight.coalesced == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    return leader_outcome, follower_outcome
+
+
+def test_follower_shares_the_leader_response():
+    flight = SingleFlight(memo_seconds=0)
+    response = Response()
+    
+    leader, follower = lead_and_follow(flight, lambda: response, pytest.fail)
+    
+    assert leader["response"] is response
+    assert follower["response"] is response
+    assert not flight._calls
+
+
+def test_leader_error_is_raised_to_followers():
+    flight = SingleFlight(memo_seconds=0)
+    error = ValueError("HTTP 500")
+    
+    def fail():
+        raise error
+    
+    leader, follower = lead_and_follow(flight, fail, pytest.fail)
+    
+    assert leader["error"] is error
+    assert follower["error"] is error
+    assert not flight._calls
+
+
+@pytest.mark.parametrize("interruption", [RequestCancelled("stopped"), KeyboardInterrupt()])
+def test_cancelled_leader_makes_followers_fetch_again(interruption):
+    flight = SingleFlight(memo_seconds=0)
+    response = Response()
+    
+    def cancel():
+        raise interruption
+    
+    leader, follower = lead_and_follow(flight, cancel, lambda: response)
+    
+    assert leader["error"] is interruption
+    assert follower["response"] is response
+    assert not flight._calls
+
+
+def test_successful_response_is_memoised():
+    flight = SingleFlight(memo_seconds=60)
+    response = Response()
+    
+    assert flight.fetch(URL, lambda: response) is response
+    # The memo key is the normalised URL
+    assert flight.fetch("HTTP://DSE.test/displayCompany.php?name=ACI#top", pytest.fail) is response
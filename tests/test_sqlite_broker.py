@@ -0,0 +1,66 @@
+from datetime import date, datetime
+
+import pytest
+
+from workqueue.broker import encode_result, decode_result
+from workqueue.sqlite_broker import SQLiteTaskBroker
+
+
+@pytest.fixture
+def broker(tmp_path):
+    return SQLiteTaskBroker(str(tmp_path / "queue.sqlite"))
+
+
+def test_expired_lease_is_leased_again_as_a_new_attempt(broker):
+    broker.enqueue("job", ["ACI"])
+    expired = broker.lease("worker-1", -1, 3, "job")
+    
+    task = broker.lease("worker-2", 60, 3, "job")
+    
+    assert task.task_id == expired.task_id
+    assert task.attempts == 1
+    assert task.lease_token != expired.lease_token
+
+
+def test_expired_lease_fails_once_out_of_attempts(broker):
+    broker.enqueue("job", ["ACI"])
+    broker.lease("worker-1", -1, 1, "job")
+    
+    assert broker.reclaim_expired("job", 1) == 1
+    assert broker.counts("job")[broker.FAILED] == 1
+    assert broker.failures("job") == [("ACI", "Lease expired")]
+    assert not broker.has_open_tasks("job")
+
+
+def test_reclaim_keeps_live_leases(broker):
+    broker.enqueue("job", ["ACI"])
+    broker.lease("worker-1", 60, 3, "job")
+    
+    assert broker.reclaim_expired("job", 3) == 0
+    assert broker.counts("job")[broker.LEASED] == 1
+
+
+def test_result_of_a_stale_lease_is_refused(broker):
+    broker.enqueue("job", ["ACI"])
+    stale = broker.lease("worker-1", -1, 3, "job")
+    current = broker.lease("worker-2", 60, 3, "job")
+    
+    assert not broker.complete(stale, encode_result(("ACI", 1)))
+    assert not broker.fail(stale, "late failure", 3)
+    assert broker.complete(current, encode_result(("ACI", 2)))
+    assert [(company, decode_result(result)) for company, result in broker.results("job")] == [("ACI", ("ACI", 2))]
+
+
+def test_fail_queued_leaves_leased_tasks(broker):
+    broker.enqueue("job", ["ACI", "BATBC"])
+    broker.lease("worker-1", 60, 3, "job")
+    
+    assert broker.fail_queued("job", "No live worker") == 1
+    assert broker.failures("job") == [("BATBC", "No live worker")]
+    assert broker.counts("job")[broker.LEASED] == 1
+
+
+def test_result_codec_keeps_dates():
+    result = ("ACI", 1.5, None, date(2024, 1, 7), datetime(2024, 1, 7, 10, 30))
+    
+    assert decode_result(encode_result(result)) == result
@@ -0,0 +1,5 @@
+# Make this directory a Python package
+from .batch_validator import ValidationReport, validate_batch
+from .layout_check import LayoutCheck
+
+__all__ = ['ValidationReport', 'validate_batch', 'LayoutCheck']
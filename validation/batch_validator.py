@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from records.record_batch import RecordBatch
+from snapshot.snapshot_store import DATASETS
+
+# Holdings may miss 100% by this many percentage points (rounding on the DSE page)
+DEFAULT_SUM_TOLERANCE = 1.0
+# Absolute PE values above this are treated as parse errors
+DEFAULT_PE_LIMIT = 1000.0
+# The write is aborted when more than this fraction of the rows fail validation
+DEFAULT_MAX_FAILURE_RATE = 0.05
+# The write is aborted when the batch has this fraction fewer rows than the previous run
+DEFAULT_MAX_ROW_DROP = 0.2
+
+HOLDING_COLUMNS = ["sponsor", "govt", "institute", "foreign", "public"]
+PE_COLUMNS = ["pe_1_basic", "pe_2_diluted", "pe_3_basic", "pe_4_diluted", "pe_5", "pe_6"]
+
+
+def _numeric(frame, columns):
+    return frame[columns].apply(pd.to_numeric, errors="coerce")
+
+
+def _blank(series):
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def _share_rules(frame, settings):
+    holdings = _numeric(frame, HOLDING_COLUMNS)
+    total_share = pd.to_numeric(frame["total_share"], errors="coerce")
+    return {
+        "missing holding": holdings.isna().any(axis=1),
+        "holding outside 0-100": ((holdings < 0) | (holdings > 100)).any(axis=1),
+        "holdings do not sum to 100": (holdings.sum(axis=1, min_count=1) - 100).abs() > settings["sum_tolerance"],
+        "shares outstanding missing or not positive": ~(total_share > 0),
+    }
+
+
+def _pe_rules(frame, settings):
+    close_price = pd.to_numeric(frame["close_price"], errors="coerce")
+    ratios = _numeric(frame, PE_COLUMNS)
+    return {
+        "missing trade code": _blank(frame["trade_code"]),
+        "close price missing or negative": ~(close_price >= 0),
+        # Unavailable ratios (N/A on the page) are allowed; implausible ones are not
+        "PE out of range": (ratios.abs() > settings["pe_limit"]).any(axis=1),
+    }
+
+
+def _key_rules(*columns):
+    def rules(frame, settings):
+        return {f"missing {column}": _blank(frame[column]) for column in columns}
+    return rules
+
+
+# Row checks per table; tables without rules are written unvalidated
+RULES = {
+    "Symbol_Share": _share_rules,
+    "pe_data": _pe_rules,
+    "Company_Information": _key_rules("company_symbol", "company_name"),
+    "Sector_Information": _key_rules("sector_code", "sector_name"),
+    "Sector_Symbol": _key_rules("sector_code", "company"),
+}
+
+
+class ValidationReport:
+    """Outcome of validating one batch of rows"""
+    
+    def __init__(self, table_name, total):
+        self.table_name = table_name
+        self.total = total
+        self.valid_rows = []
+        self.rejected = []
+        self.batch_errors = []
+        self.abort = False
+    
+    @property
+    def failure_rate(self):
+        return len(self.rejected) / self.total if self.total else 0.0
+    
+    def summary(self):
+        text = f"{self.table_name}: {len(self.rejected)} of {self.total} rows rejected ({self.failure_rate:.1%})"
+        if self.batch_errors:
+            text += "; " + "; ".join(self.batch_errors)
+        return text
+
+
+def _settings():
+    # Read at call time so thresholds can be tuned in .env without a restart
+    return {
+        "sum_tolerance": float(os.getenv("VALIDATION_SUM_TOLERANCE", DEFAULT_SUM_TOLERANCE)),
+        "pe_limit": float(os.getenv("VALIDATION_PE_LIMIT", DEFAULT_PE_LIMIT)),
+        "max_failure_rate": float(os.getenv("VALIDATION_MAX_FAILURE_RATE", DEFAULT_MAX_FAILURE_RATE)),
+        "max_row_drop": float(os.getenv("VALIDATION_MAX_ROW_DROP", DEFAULT_MAX_ROW_DROP)),
+    }
+
+
+def validate_batch(table_name, rows, previous_count=None):
+    """Validate a batch of rows for a table with column-wise checks
+    
+    Each rule is evaluated over the whole batch at once. Rows failing any rule
+    are rejected with the names of the rules they failed. The batch is
+    aborted when the failure rate exceeds VALIDATION_MAX_FAILURE_RATE, or when
+    it has VALIDATION_MAX_ROW_DROP fewer rows than previous_count.
+    
+    Args:
+        table_name (str): Target table of the rows
+        rows (list): Row tuples in INSERT column order, or a RecordBatch
+        previous_count (int): Row count of the previous run, or None to skip that check
+    
+    Returns:
+        ValidationReport: Valid rows (of the same type as rows), rejected (row, reason)
+            pairs and whether to abort
+    """
+    report = ValidationReport(table_name, len(rows))
+    table_key = table_name.split(".")[-1].strip("[]")
+    rules = RULES.get(table_key)
+    if rules is None or not rows:
+        report.valid_rows = rows
+        return report
+    
+    settings = _settings()
+    names = [name for name, _ in DATASETS[table_key][2]]
+    if isinstance(rows, RecordBatch):
+        # Record fields are named like the snapshot columns; the columns go to pandas as they are
+        frame = rows.to_frame()
+        frame.columns = names
+    else:
+        frame = pd.DataFrame.from_records(rows, columns=names)
+    masks = {name: mask.to_numpy(dtype=bool) for name, mask in rules(frame, settings).items()}
+    failed = np.logical_or.reduce(list(masks.values()))
+    
+    if isinstance(rows, RecordBatch):
+        report.valid_rows = rows if not failed.any() else rows.take(np.flatnonzero(~failed))
+    else:
+        report.valid_rows = [rows[index] for index in np.flatnonzero(~failed)]
+    report.rejected = [
+        (rows[index], ", ".join(name for name, mask in masks.items() if mask[index]))
+        for index in np.flatnonzero(failed)
+    ]
+    
+    if report.failure_rate > settings["max_failure_rate"]:
+        report.batch_errors.append(
+            f"failure rate {report.failure_rate:.1%} is above {settings['max_failure_rate']:.1%}"
+        )
+    if previous_count and len(rows) < previous_count * (1 - settings["max_row_drop"]):
+        report.batch_errors.append(f"{len(rows)} rows against {previous_count} in the previous run")
+    report.abort = bool(report.batch_errors)
+    return report
@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import threading
+from datetime import datetime
+
+# Get application path for executable support
+if getattr(sys, 'frozen', False):
+    # If the application is run as a bundle
+    application_path = os.path.dirname(sys.executable)
+else:
+    # If run as a normal Python script
+    application_path = os.path.dirname(os.path.abspath(__file__))
+
+# Pages at the start of a run whose layout is checked before the fan-out goes on
+DEFAULT_PROBE_PAGES = 3
+
+
+def layout_vocabulary(spec):
+    """Return every layout feature a spec and its extractors can report"""
+    features = set()
+    for dataset in spec.datasets:
+        if dataset.anchor:
+            features.add(dataset.anchor)
+        features.update(dataset.page_sources)
+    return features
+
+
+class LayoutCheck:
+    """Compares the layout of the first pages of a run with the signature of earlier runs
+    
+    A probe page is reduced to the layout features its spec reads: the table
+    or selector the records come from and every source found on it (a label,
+    a table header, a link parameter). When a feature of the stored signature
+    is on none of the probe pages, the markup changed and on_drift(diagnostic)
+    is called so the engine can abort the run. Without a signature the
+    anchor and required sources of the spec must be present.
+    
+    Passing probes extend the signature with the features all of them share.
+    Signatures are kept in LAYOUT_SIGNATURE_DIR (default validation/state), one
+    JSON file per spec. Features the spec no longer reads are ignored, so
+    fixing a spec needs no reset; delete the file to accept a page that lost
+    a feature for good.
+    """
+    
+    def __init__(self, logger, spec, on_drift, probe_pages=DEFAULT_PROBE_PAGES):
+        self.logger = logger
+        self.spec = spec
+        self.on_drift = on_drift
+        self.probe_pages = probe_pages
+        directory = os.getenv("LAYOUT_SIGNATURE_DIR") or os.path.join(application_path, 'state')
+        self.path = os.path.join(directory, f"{spec.name}.layout.json")
+        self.probes = []
+        self.drift = None
+        # Cleared once the probes are compared; scrapers stop reporting features then
+        self.probing = True
+        self._lock = threading.Lock()
+    
+    def observe(self, item, features):
+        """Record the layout features of one probe page; the last probe triggers the comparison"""
+        with self._lock:
+            if not self.probing:
+                return
+            self.probes.append((item, features))
+            if len(self.probes) < self.probe_pages:
+                return
+            self.probing = False
+            self.drift = self._compare()
+        if self.drift:
+            self.on_drift(self.drift)
+    
+    def _compare(self):
+        """Return a diagnostic if the probes lack an expected feature, else store the signature"""
+        vocabulary = layout_vocabulary(self.spec)
+        seen = set().union(*(features for _, features in self.probes))
+        signature = self._load()
+        if signature is None:
+            expected = ({self.spec.anchor} - {None}) | (set(self.spec.required) & set(self.spec.page_sources))
+            basis = "the spec (no stored signature yet)"
+        else:
+            expected = set(signature["features"]) & vocabulary
+            basis = f"the signature recorded {signature['recorded_at']}"
+        missing = sorted(expected - seen)
+        if missing:
+            # A missing table or selector takes every field read from it along; name it alone
+            shown = [feature for feature in missing if feature.startswith(("table:", "select:"))] or missing
+            more = f" and {len(missing) - len(shown)} fields read from it" if len(shown) < len(missing) else ""
+            items = ", ".join(str(item) for item, _ in self.probes if item is not None)
+            if len(self.probes) == 1:
+                pages, lack = "The probe page", "lacks"
+            else:
+                pages, lack = f"All {len(self.probes)} probe pages", "lack"
+            return (
+                f"Layout of the {self.spec.name} pages changed. {pages}{f' ({items})' if items else ''} "
+                f"{lack} {', '.join(shown)}{more}, compared with {basis}. "
+                f"Update the spec in spec/specs.py, or delete {self.path} to accept the new layout."
+            )
+        
+        shared = set.intersection(*(features for _, features in self.probes))
+        known = expected if signature is not None else set()
+        if signature is None or not shared <= known:
+            self._save(sorted(known | shared))
+        self.logger.info(f"Layout of the {self.spec.name} pages matches {basis}")
+        return None
+    
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as signature_file:
+                return json.load(signature_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Error reading layout signature {self.path}: {str(e)}")
+            return None
+    
+    def _save(self, features):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as signature_file:
+                json.dump({"spec": self.spec.name, "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                           "features": features}, signature_file, indent=2)
+            os.replace(temporary, self.path)
+        except Exception as e:
+            # The check still protected this run; the next one compares with the old signature
+            self.logger.error(f"Error saving layout signature {self.path}: {str(e)}")
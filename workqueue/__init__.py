@@ -0,0 +1,5 @@
+# Make this directory a Python package
+from .broker import Task, TaskBroker, encode_result, decode_result
+from .sqlite_broker import SQLiteTaskBroker
+
+__all__ = ['Task', 'TaskBroker', 'encode_result', 'decode_result', 'SQLiteTaskBroker']
@@ -0,0 +1,94 @@
+import json
+from collections import namedtuple
+from datetime import date, datetime
+
+# A leased unit of work; lease_token proves ownership when reporting the result
+Task = namedtuple('Task', ['task_id', 'job_id', 'payload', 'lease_token', 'attempts'])
+
+
+def encode_result(result):
+    """Serialise a result tuple for TaskBroker.complete, keeping dates and datetimes intact"""
+    return json.dumps([
+        {"__datetime__": value.isoformat()} if isinstance(value, datetime)
+        else {"__date__": value.isoformat()} if isinstance(value, date)
+        else value
+        for value in result
+    ])
+
+
+def decode_result(payload):
+    """Rebuild a result tuple serialised by encode_result"""
+    values = []
+    for value in json.loads(payload):
+        if isinstance(value, dict) and "__datetime__" in value:
+            value = datetime.fromisoformat(value["__datetime__"])
+        elif isinstance(value, dict) and "__date__" in value:
+            value = date.fromisoformat(value["__date__"])
+        values.append(value)
+    return tuple(values)
+
+
+class TaskBroker:
+    """Interface of the work queue shared by a coordinator and its workers
+    
+    Tasks move from queued to leased to done or failed. A lease expires after
+    lease_seconds and the task becomes available again, so a crashed worker
+    never loses work; a task whose leases keep expiring fails after max_attempts. Results are only accepted from the current lease holder,
+    which makes every task count exactly once even if an expired worker reports late.
+    """
+    
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    
+    def enqueue(self, job_id, payloads):
+        """Add one task per payload to a job"""
+        raise NotImplementedError("Brokers must implement enqueue")
+    
+    def lease(self, worker_id, lease_seconds, max_attempts, job_id=None):
+        """Lease the next available task (of job_id only, if given), or return None if there is none
+        
+        An expired lease counts as a failed attempt; the task fails once max_attempts are used up.
+        """
+        raise NotImplementedError("Brokers must implement lease")
+    
+    def reclaim_expired(self, job_id, max_attempts):
+        """Requeue the tasks of a job whose lease expired, failing those out of attempts; returns their number
+        
+        lease() does this too; a coordinator calls it so a job moves on while no worker is leasing.
+        """
+        raise NotImplementedError("Brokers must implement reclaim_expired")
+    
+    def fail_queued(self, job_id, error):
+        """Fail every queued task of a job, e.g. when no worker is left to run them; returns their number"""
+        raise NotImplementedError("Brokers must implement fail_queued")
+    
+    def complete(self, task, result):
+        """Store the result of a leased task; return False if the lease was lost"""
+        raise NotImplementedError("Brokers must implement complete")
+    
+    def fail(self, task, error, max_attempts):
+        """Report a failed attempt; the task is requeued until max_attempts is reached"""
+        raise NotImplementedError("Brokers must implement fail")
+    
+    def cancel(self, job_id):
+        """Cancel every task of a job that is not finished yet"""
+        raise NotImplementedError("Brokers must implement cancel")
+    
+    def counts(self, job_id):
+        """Return a dict of task counts per status for a job"""
+        raise NotImplementedError("Brokers must implement counts")
+    
+    def results(self, job_id):
+        """Return (payload, result) pairs of every completed task of a job"""
+        raise NotImplementedError("Brokers must implement results")
+    
+    def failures(self, job_id):
+        """Return (payload, error) pairs of every failed task of a job"""
+        raise NotImplementedError("Brokers must implement failures")
+    
+    def has_open_tasks(self, job_id=None):
+        """Check whether any task is still queued or leased"""
+        raise NotImplementedError("Brokers must implement has_open_tasks")
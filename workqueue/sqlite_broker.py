@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from .broker import Task, TaskBroker
+
+
+# Journal mode of the queue file; WAL needs shared memory and therefore a single host
+DEFAULT_JOURNAL_MODE = "WAL"
+
+
+class SQLiteTaskBroker(TaskBroker):
+    """File-backed task broker
+    
+    Works for any number of worker processes on one host. Every state change
+    runs in an IMMEDIATE transaction so concurrent workers never lease the
+    same task. WAL mode keeps its index in shared memory, which processes on
+    other hosts cannot see; a queue file shared over a network drive must use
+    a rollback journal (journal_mode "DELETE", or WORK_QUEUE_JOURNAL_MODE=DELETE
+    in every process), and is then only as safe as the drive's file locking.
+    """
+    
+    def __init__(self, db_path, journal_mode=None):
+        self.db_path = db_path
+        self.journal_mode = journal_mode or os.getenv("WORK_QUEUE_JOURNAL_MODE", DEFAULT_JOURNAL_MODE)
+        directory = os.path.dirname(os.path.abspath(db_path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    lease_token TEXT,
+                    lease_expires REAL,
+                    worker_id TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_tasks_status ON tasks (status, lease_expires)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_tasks_job ON tasks (job_id, status)")
+    
+    def _connection(self):
+        """Return the connection owned by the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one IMMEDIATE transaction"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def enqueue(self, job_id, payloads):
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO tasks (job_id, payload, status) VALUES (?, ?, ?)",
+                [(job_id, payload, self.QUEUED) for payload in payloads]
+            )
+    
+    def _reclaim_expired(self, conn, now, max_attempts, job_id=None):
+        """Requeue expired leases, or fail them once out of attempts; runs inside a transaction"""
+        job_filter, job_params = ("AND job_id = ?", (job_id,)) if job_id is not None else ("", ())
+        # An expired lease is an attempt lost with a dead worker
+        return conn.execute(
+            f"""UPDATE tasks SET status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END,
+               attempts = attempts + 1, error = ?, lease_token = NULL, lease_expires = NULL
+               WHERE status = ? AND lease_expires < ? {job_filter}""",
+            (max_attempts, self.FAILED, self.QUEUED, "Lease expired", self.LEASED, now) + job_params
+        ).rowcount
+    
+    def lease(self, worker_id, lease_seconds, max_attempts, job_id=None):
+        now = time.time()
+        token = uuid.uuid4().hex
+        job_filter, job_params = ("AND job_id = ?", (job_id,)) if job_id is not None else ("", ())
+        with self._transaction() as conn:
+            self._reclaim_expired(conn, now, max_attempts, job_id)
+            row = conn.execute(
+                f"""SELECT task_id, job_id, payload, attempts FROM tasks
+                   WHERE status = ? {job_filter} ORDER BY task_id LIMIT 1""",
+                (self.QUEUED,) + job_params
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, job_id, payload, attempts = row
+            conn.execute(
+                "UPDATE tasks SET status = ?, lease_token = ?, lease_expires = ?, worker_id = ? WHERE task_id = ?",
+                (self.LEASED, token, now + lease_seconds, worker_id, task_id)
+            )
+        return Task(task_id, job_id, payload, token, attempts)
+    
+    def reclaim_expired(self, job_id, max_attempts):
+        with self._transaction() as conn:
+            return self._reclaim_expired(conn, time.time(), max_attempts, job_id)
+    
+    def fail_queued(self, job_id, error):
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE tasks SET status = ?, error = ? WHERE job_id = ? AND status = ?",
+                (self.FAILED, error, job_id, self.QUEUED)
+            ).rowcount
+    
+    def complete(self, task, result):
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE tasks SET status = ?, result = ?, attempts = attempts + 1, lease_expires = NULL
+                   WHERE task_id = ? AND status = ? AND lease_token = ?""",
+                (self.DONE, result, task.task_id, self.LEASED, task.lease_token)
+            )
+            return cursor.rowcount == 1
+    
+    def fail(self, task, error, max_attempts):
+        with self._transaction() as conn:
+            status = self.FAILED if task.attempts + 1 >= max_attempts else self.QUEUED
+            cursor = conn.execute(
+                """UPDATE tasks SET status = ?, error = ?, attempts = attempts + 1, lease_token = NULL,
+                   lease_expires = NULL WHERE task_id = ? AND status = ? AND lease_token = ?""",
+                (status, error, task.task_id, self.LEASED, task.lease_token)
+            )
+            return cursor.rowcount == 1
+    
+    def cancel(self, job_id):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, lease_token = NULL WHERE job_id = ? AND status IN (?, ?)",
+                (self.CANCELLED, job_id, self.QUEUED, self.LEASED)
+            )
+    
+    def counts(self, job_id):
+        counts = {status: 0 for status in (self.QUEUED, self.LEASED, self.DONE, self.FAILED, self.CANCELLED)}
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall()
+        counts.update(dict(rows))
+        return counts
+    
+    def results(self, job_id):
+        return self._connection().execute(
+            "SELECT payload, result FROM tasks WHERE job_id = ? AND status = ? ORDER BY task_id",
+            (job_id, self.DONE)
+        ).fetchall()
+    
+    def failures(self, job_id):
+        return self._connection().execute(
+            "SELECT payload, error FROM tasks WHERE job_id = ? AND status = ? ORDER BY task_id",
+            (job_id, self.FAILED)
+        ).fetchall()
+    
+    def has_open_tasks(self, job_id=None):
+        query = "SELECT 1 FROM tasks WHERE status IN (?, ?)"
+        params = [self.QUEUED, self.LEASED]
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        return self._connection().execute(query + " LIMIT 1", params).fetchone() is not None
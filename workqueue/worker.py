@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+import time
+import socket
+import argparse
+
+# Import from parent directory so the worker can run as a standalone process
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from workqueue.broker import encode_result
+from workqueue.sqlite_broker import SQLiteTaskBroker
+
+# Leases must outlive a hedged 60 second request
+DEFAULT_LEASE_SECONDS = 180
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def default_worker_id():
+    """Return the name of a worker started without one: host and process id"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class QueueWorker:
+    """Leases symbol tasks from a broker, scrapes them and reports the results"""
+    
+    def __init__(self, logger, broker, scrape_func, worker_id=None,
+                 lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS, job_id=None):
+        self.logger = logger
+        self.broker = broker
+        self.scrape_func = scrape_func
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Only tasks of this job are leased; None serves every job in the queue
+        self.job_id = job_id
+        self.processed = 0
+    
+    def process(self, task):
+        """Scrape one leased task and report its outcome to the broker"""
+        try:
+            result = self.scrape_func(task.payload)
+        except Exception as e:
+            result = None
+            self.logger.error(f"Worker {self.worker_id} failed on {task.payload}: {str(e)}")
+        
+        if result:
+            accepted = self.broker.complete(task, encode_result(result))
+        else:
+            accepted = self.broker.fail(task, "No data returned", self.max_attempts)
+        if not accepted:
+            # The lease expired and another worker owns the task now
+            self.logger.warning(f"Worker {self.worker_id} lost the lease on {task.payload}; result dropped")
+        self.processed += 1
+    
+    def run(self, idle_exit=None, poll_interval=1.0):
+        """Process tasks until the queue stays empty for idle_exit seconds (forever if None)"""
+        self.logger.info(f"Worker {self.worker_id} started")
+        idle_since = time.monotonic()
+        while True:
+            task = self.broker.lease(self.worker_id, self.lease_seconds, self.max_attempts, self.job_id)
+            if task is not None:
+                self.process(task)
+                idle_since = time.monotonic()
+                continue
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit \
+                    and not self.broker.has_open_tasks(self.job_id):
+                break
+            time.sleep(poll_interval)
+        self.logger.info(f"Worker {self.worker_id} finished after {self.processed} tasks")
+
+
+def run_worker(queue_path, worker_id=None, idle_exit=None, job_id=None):
+    """Entry point of a worker process scraping share ratios from a queue file"""
+    from log.scraper_log import LoggerSetup
+    from share_ratio_scraper.share_ratio_scraper import ShareScraper
+    
+    worker_id = worker_id or default_worker_id()
+    # A log file per worker: processes rotating one shared file would overwrite each other's records
+    log_name = re.sub(r"[^\w.-]", "_", worker_id)
+    logger = LoggerSetup.setup_file_logger(f"queue_worker_{log_name}")
+    scraper = ShareScraper(logger)
+    worker = QueueWorker(logger, SQLiteTaskBroker(queue_path), scraper.scrape_company_data,
+                         worker_id=worker_id, job_id=job_id)
+    worker.run(idle_exit=idle_exit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share ratio work-queue worker")
+    parser.add_argument("--queue", required=True, help="Path to the shared queue file")
+    parser.add_argument("--worker-id", default=None, help="Worker name shown in the queue and used for its log file (default: host-pid)")
+    parser.add_argument("--idle-exit", type=float, default=None,
+                        help="Exit after the queue has been empty this many seconds (default: run forever)")
+    parser.add_argument("--job", default=None, help="Only work on this job (default: every job in the queue)")
+    args = parser.parse_args()
+    run_worker(args.queue, args.worker_id, args.idle_exit, args.job)